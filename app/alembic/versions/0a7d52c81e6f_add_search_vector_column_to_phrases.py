@@ -0,0 +1,37 @@
+"""Add search_vector column to phrases
+
+Revision ID: 0a7d52c81e6f
+Revises: e3b1f0c4a9d2
+Create Date: 2024-07-09 19:03:27.915034
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "0a7d52c81e6f"
+down_revision: Union[str, None] = "e3b1f0c4a9d2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "phrases",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('english', normalized_text)", persisted=True),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_phrases_search_vector", "phrases", ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_phrases_search_vector", table_name="phrases", postgresql_using="gin")
+    op.drop_column("phrases", "search_vector")
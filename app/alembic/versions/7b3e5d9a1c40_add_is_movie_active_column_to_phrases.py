@@ -0,0 +1,143 @@
+"""Add is_movie_active column to phrases
+
+Revision ID: 7b3e5d9a1c40
+Revises: f2a9c7e4b1d8
+Create Date: 2024-07-17 11:40:12.318462
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7b3e5d9a1c40"
+down_revision: Union[str, None] = "f2a9c7e4b1d8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PUBLIC_PHRASES_CONDITION = "is_active AND is_movie_active"
+
+
+def upgrade() -> None:
+    op.add_column(
+        "phrases",
+        sa.Column("is_movie_active", sa.Boolean(), server_default=sa.false(), nullable=False),
+    )
+    op.execute(
+        """
+        UPDATE phrases SET is_movie_active = movies.is_active
+        FROM movies
+        WHERE movies.id = phrases.movie_id AND movies.is_active
+        """,
+    )
+
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION phrases_set_is_movie_active() RETURNS trigger AS $$
+        BEGIN
+            NEW.is_movie_active := COALESCE((SELECT is_active FROM movies WHERE id = NEW.movie_id), FALSE);
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+    )
+    op.execute(
+        """
+        CREATE TRIGGER phrases_set_is_movie_active
+        BEFORE INSERT OR UPDATE OF movie_id ON phrases
+        FOR EACH ROW EXECUTE FUNCTION phrases_set_is_movie_active()
+        """,
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION movies_sync_phrases_is_movie_active() RETURNS trigger AS $$
+        BEGIN
+            UPDATE phrases SET is_movie_active = NEW.is_active WHERE movie_id = NEW.id;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """,
+    )
+    op.execute(
+        """
+        CREATE TRIGGER movies_sync_phrases_is_movie_active
+        AFTER UPDATE OF is_active ON movies
+        FOR EACH ROW WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active)
+        EXECUTE FUNCTION movies_sync_phrases_is_movie_active()
+        """,
+    )
+
+    # Search is public only, so the full indexes are replaced with the partial ones
+    op.drop_index(
+        "ix_phrases_normalized_text_trgm_active",
+        table_name="phrases",
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        postgresql_where=sa.text("is_active"),
+    )
+    op.drop_index(
+        "ix_phrases_normalized_text_trgm",
+        table_name="phrases",
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+    )
+    op.drop_index("ix_phrases_search_vector", table_name="phrases", postgresql_using="gin")
+    op.create_index(
+        "ix_phrases_normalized_text_trgm_public",
+        "phrases",
+        ["normalized_text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        postgresql_where=sa.text(PUBLIC_PHRASES_CONDITION),
+    )
+    op.create_index(
+        "ix_phrases_search_vector_public",
+        "phrases",
+        ["search_vector"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_where=sa.text(PUBLIC_PHRASES_CONDITION),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_phrases_search_vector_public",
+        table_name="phrases",
+        postgresql_using="gin",
+        postgresql_where=sa.text(PUBLIC_PHRASES_CONDITION),
+    )
+    op.drop_index(
+        "ix_phrases_normalized_text_trgm_public",
+        table_name="phrases",
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        postgresql_where=sa.text(PUBLIC_PHRASES_CONDITION),
+    )
+    op.create_index("ix_phrases_search_vector", "phrases", ["search_vector"], unique=False, postgresql_using="gin")
+    op.create_index(
+        "ix_phrases_normalized_text_trgm",
+        "phrases",
+        ["normalized_text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_phrases_normalized_text_trgm_active",
+        "phrases",
+        ["normalized_text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        postgresql_where=sa.text("is_active"),
+    )
+
+    op.execute("DROP TRIGGER movies_sync_phrases_is_movie_active ON movies")
+    op.execute("DROP FUNCTION movies_sync_phrases_is_movie_active()")
+    op.execute("DROP TRIGGER phrases_set_is_movie_active ON phrases")
+    op.execute("DROP FUNCTION phrases_set_is_movie_active()")
+    op.drop_column("phrases", "is_movie_active")
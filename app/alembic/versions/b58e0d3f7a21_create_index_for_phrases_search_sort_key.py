@@ -0,0 +1,30 @@
+"""Create index for phrases search sort key
+
+Revision ID: b58e0d3f7a21
+Revises: 0a7d52c81e6f
+Create Date: 2024-07-11 21:47:02.631858
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b58e0d3f7a21"
+down_revision: Union[str, None] = "0a7d52c81e6f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_phrases_movie_id_start_in_movie_id",
+        "phrases",
+        ["movie_id", "start_in_movie", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_phrases_movie_id_start_in_movie_id", table_name="phrases")
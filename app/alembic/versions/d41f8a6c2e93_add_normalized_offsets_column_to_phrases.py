@@ -0,0 +1,27 @@
+"""Add normalized_offsets column to phrases
+
+Revision ID: d41f8a6c2e93
+Revises: b58e0d3f7a21
+Create Date: 2024-07-13 14:05:37.108254
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = "d41f8a6c2e93"
+down_revision: Union[str, None] = "b58e0d3f7a21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("phrases", sa.Column("normalized_offsets", postgresql.ARRAY(sa.Integer()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("phrases", "normalized_offsets")
@@ -0,0 +1,41 @@
+"""Create trigram index for column normalized_text
+
+Revision ID: e3b1f0c4a9d2
+Revises: 57e34e451984
+Create Date: 2024-07-08 10:12:41.204517
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e3b1f0c4a9d2"
+down_revision: Union[str, None] = "57e34e451984"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    # B-tree index can't serve `ILIKE '%...%'`, so it's replaced with the trigram one
+    op.drop_index("ix_phrases_normalized_text", table_name="phrases")
+    op.create_index(
+        "ix_phrases_normalized_text_trgm",
+        "phrases",
+        ["normalized_text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_phrases_normalized_text_trgm",
+        table_name="phrases",
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+    )
+    op.create_index("ix_phrases_normalized_text", "phrases", ["normalized_text"], unique=False)
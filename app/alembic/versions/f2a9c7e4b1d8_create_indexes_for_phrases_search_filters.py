@@ -0,0 +1,42 @@
+"""Create indexes for phrases search filters
+
+Revision ID: f2a9c7e4b1d8
+Revises: d41f8a6c2e93
+Create Date: 2024-07-15 18:22:49.530176
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f2a9c7e4b1d8"
+down_revision: Union[str, None] = "d41f8a6c2e93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_phrases_normalized_text_trgm_active",
+        "phrases",
+        ["normalized_text"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        postgresql_where=sa.text("is_active"),
+    )
+    op.create_index("ix_movies_language_year", "movies", ["language", "year"], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_movies_language_year", table_name="movies")
+    op.drop_index(
+        "ix_phrases_normalized_text_trgm_active",
+        table_name="phrases",
+        postgresql_using="gin",
+        postgresql_ops={"normalized_text": "gin_trgm_ops"},
+        postgresql_where=sa.text("is_active"),
+    )
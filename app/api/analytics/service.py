@@ -15,7 +15,7 @@ class AnalyticsService:
         """
         TODO: rewrite, optimize and add tests
         """
-        phrases = await self.phrases_service.get_by_movie_id(movie_id=movie_id, presign_urls=False)
+        phrases = await self.phrases_service.get_by_movie_id(movie_id=movie_id)
         phrases_duration = functools.reduce(operator.add, [phrase.duration for phrase in phrases])
         phrases_count = len(phrases)
         unique_subphrases = set()
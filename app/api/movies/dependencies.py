@@ -5,7 +5,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.movies.repository import MoviesRepository
 from app.api.movies.service import MoviesService
-from app.core.dependencies import get_db_session
+from app.api.phrases.repository import PhrasesRepository
+from app.api.phrases.search_index import PhrasesSearchIndex
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
+from app.core.cache import TwoTierCacheBackend
+from app.core.dependencies import (
+    get_cache_backend,
+    get_db_session,
+    get_phrases_search_index,
+    get_phrases_suggest_index,
+)
 from app.s3.dependencies import get_s3_service
 from app.s3.s3_service import S3Service
 
@@ -19,8 +28,19 @@ async def get_movies_repository(
 async def get_movies_service(
     movies_repository: MoviesRepository = Depends(get_movies_repository),
     s3_service: S3Service = Depends(get_s3_service),
+    cache_backend: TwoTierCacheBackend | None = Depends(get_cache_backend),
+    session: AsyncSession = Depends(get_db_session),
+    search_index: PhrasesSearchIndex | None = Depends(get_phrases_search_index),
+    suggest_index: PhrasesSuggestIndex | None = Depends(get_phrases_suggest_index),
 ) -> MoviesService:
-    return MoviesService(movies_repository, s3_service)
+    return MoviesService(
+        movies_repository,
+        s3_service,
+        cache_backend=cache_backend,
+        phrases_repository=PhrasesRepository(session),
+        search_index=search_index,
+        suggest_index=suggest_index,
+    )
 
 
 async def movie_exists(movie_id: uuid.UUID, movies_service: MoviesService = Depends(get_movies_service)) -> None:
@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import SmallInteger, String
+from sqlalchemy import Index, SmallInteger, String
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.constants import Languages, MovieStatus
@@ -9,6 +9,10 @@ from app.core.models import CoreModel, DateTimeModelMixin, IDModelMixin
 
 class MovieModel(CoreModel, IDModelMixin, DateTimeModelMixin):
     __tablename__ = "movies"
+    __table_args__ = (
+        # Serves the phrases search filtered by language and year
+        Index("ix_movies_language_year", "language", "year"),
+    )
 
     title: Mapped[str] = mapped_column(String(100))
     year: Mapped[int] = mapped_column(SmallInteger)
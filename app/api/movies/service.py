@@ -7,15 +7,35 @@ from fastapi import BackgroundTasks
 from app.api.movies.models import MovieModel
 from app.api.movies.repository import MoviesRepository
 from app.api.movies.schemas import MovieCreateSchema, MovieUpdateSchema
+from app.api.phrases.repository import PhrasesRepository
+from app.api.phrases.search_index import (
+    PHRASES_SEARCH_INDEX_CHANGES_MESSAGE,
+    PhrasesSearchIndex,
+    PhrasesSearchIndexChange,
+)
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
+from app.core.cache import PHRASES_SEARCH_CACHE_NAMESPACE, TwoTierCacheBackend
 from app.core.config import settings
 from app.core.constants import MovieStatus
 from app.s3.s3_service import S3Service
 
 
 class MoviesService:
-    def __init__(self, movies_repository: MoviesRepository, s3_service: S3Service) -> None:
+    def __init__(
+        self,
+        movies_repository: MoviesRepository,
+        s3_service: S3Service,
+        cache_backend: TwoTierCacheBackend | None = None,
+        phrases_repository: PhrasesRepository | None = None,
+        search_index: PhrasesSearchIndex | None = None,
+        suggest_index: PhrasesSuggestIndex | None = None,
+    ) -> None:
         self.repository = movies_repository
         self.s3_service = s3_service
+        self.cache_backend = cache_backend
+        self.phrases_repository = phrases_repository
+        self.search_index = search_index
+        self.suggest_index = suggest_index
 
     async def create(self, data: MovieCreateSchema) -> MovieModel:
         return await self.repository.create(data)
@@ -24,13 +44,27 @@ class MoviesService:
         return await self.repository.get_all()
 
     async def update(self, movie_id: uuid.UUID, data: MovieUpdateSchema) -> MovieModel:
-        return await self.repository.update(movie_id, data)
+        indexed_phrases = await self._get_public_phrases(movie_id)
+        movie = await self.repository.update(movie_id, data)
+        search_index_changes = self._update_phrases_indexes(
+            movie_id,
+            indexed_phrases,
+            await self._get_public_phrases(movie_id),
+        )
+
+        # Cached search results show the movie title and year, and its phrases are added or dropped with its status
+        await self._invalidate_search_cache(search_index_changes)
+
+        return movie
 
     async def get_by_id(self, movie_id: uuid.UUID) -> MovieModel:
         return await self.repository.get_by_id(movie_id)
 
     async def delete(self, movie_id: uuid.UUID, background_tasks: BackgroundTasks) -> None:
+        indexed_phrases = await self._get_public_phrases(movie_id)
         await self.repository.delete(movie_id)
+        search_index_changes = self._update_phrases_indexes(movie_id, indexed_phrases, [])
+        await self._invalidate_search_cache(search_index_changes)
 
         movie_s3_folder_path = os.path.join(settings.movies_s3_path, str(movie_id))
         background_tasks.add_task(self.s3_service.delete_folder, movie_s3_folder_path)
@@ -40,3 +74,51 @@ class MoviesService:
 
     async def update_status(self, movie_id: uuid.UUID, status: MovieStatus) -> None:
         await self.repository.update_status(movie_id, status)
+
+    async def _get_public_phrases(self, movie_id: uuid.UUID) -> Sequence[tuple[uuid.UUID, uuid.UUID, str]]:
+        """
+        Returns the phrases of the movie kept by the phrases indexes
+        """
+        if self.phrases_repository is None or (self.search_index is None and self.suggest_index is None):
+            return []
+
+        return await self.phrases_repository.get_all_for_search_index(movie_id=movie_id)
+
+    def _update_phrases_indexes(
+        self,
+        movie_id: uuid.UUID,
+        indexed_phrases: Sequence[tuple[uuid.UUID, uuid.UUID, str]],
+        public_phrases: Sequence[tuple[uuid.UUID, uuid.UUID, str]],
+    ) -> Sequence[PhrasesSearchIndexChange]:
+        """
+        Phrases become public or hidden with their movie. Returns the changes of the search index.
+        """
+        search_index_changes: list[PhrasesSearchIndexChange] = []
+
+        if {phrase_id for phrase_id, _, _ in indexed_phrases} == {phrase_id for phrase_id, _, _ in public_phrases}:
+            return search_index_changes
+
+        if self.search_index is not None:
+            with self.search_index.record_changes() as search_index_changes:
+                self.search_index.remove_by_movie_id(movie_id)
+
+                for phrase_id, phrase_movie_id, normalized_text in public_phrases:
+                    self.search_index.add(phrase_id, phrase_movie_id, normalized_text)
+
+        if self.suggest_index is not None:
+            self.suggest_index.remove(normalized_text for _, _, normalized_text in indexed_phrases)
+            self.suggest_index.add(normalized_text for _, _, normalized_text in public_phrases)
+
+        return search_index_changes
+
+    async def _invalidate_search_cache(self, search_index_changes: Sequence[PhrasesSearchIndexChange]) -> None:
+        """
+        Same as `PhrasesService._invalidate_search_cache`
+        """
+        if self.cache_backend is None:
+            return
+
+        if search_index_changes:
+            await self.cache_backend.publish(PHRASES_SEARCH_INDEX_CHANGES_MESSAGE, search_index_changes)
+
+        await self.cache_backend.clear_namespace(PHRASES_SEARCH_CACHE_NAMESPACE)
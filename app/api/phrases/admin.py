@@ -1,7 +1,10 @@
+from typing import Any
+
 from sqladmin import ModelView
+from starlette.requests import Request
 
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
-from app.api.phrases.utils import format_duration
+from app.api.phrases.utils import format_duration, get_phrase_text_offsets, normalize_phrase_text
 
 
 class PhraseAdmin(ModelView, model=PhraseModel):
@@ -36,6 +39,24 @@ class PhraseAdmin(ModelView, model=PhraseModel):
         "start_in_movie": lambda m, _: format_duration(m.start_in_movie),  # type: ignore
         "end_in_movie": lambda m, _: format_duration(m.start_in_movie),  # type: ignore
     }
+    form_excluded_columns = (
+        "search_vector",
+        "normalized_text",
+        "normalized_offsets",
+        "headline",
+    )
+
+    async def on_model_change(
+        self,
+        data: dict[str, Any],
+        model: PhraseModel,
+        is_created: bool,  # noqa: ARG002
+        request: Request,  # noqa: ARG002
+    ) -> None:
+        # The normalized text and its offsets are computed from the text together, they can't be edited
+        full_text = data.get("full_text", model.full_text)
+        data["normalized_text"] = normalize_phrase_text(full_text)
+        data["normalized_offsets"] = get_phrase_text_offsets(full_text)
 
 
 class PhraseIssueAdmin(ModelView, model=PhraseIssueModel):
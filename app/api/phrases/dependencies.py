@@ -1,16 +1,24 @@
 import uuid
 
-from fastapi import Depends, HTTPException
+from fastapi import Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.movies.dependencies import get_movies_service
 from app.api.movies.service import MoviesService
 from app.api.phrases.repository import PhrasesRepository
 from app.api.phrases.scenes_upload_service import ScenesUploadService
+from app.api.phrases.search_index import PhrasesSearchIndex
 from app.api.phrases.service import PhrasesService
-from app.core.dependencies import get_db_session
-from app.s3.dependencies import get_presigned_url_service, get_s3_service
-from app.s3.presigned_url_service import PresignedURLService
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
+from app.api.phrases.utils import decode_search_cursor
+from app.core.cache import TwoTierCacheBackend
+from app.core.dependencies import (
+    get_cache_backend,
+    get_db_session,
+    get_phrases_search_index,
+    get_phrases_suggest_index,
+)
+from app.s3.dependencies import get_s3_service
 from app.s3.s3_service import S3Service
 
 
@@ -23,12 +31,16 @@ async def get_phrases_repository(
 async def get_phrases_service(
     phrases_repository: PhrasesRepository = Depends(get_phrases_repository),
     s3_service: S3Service = Depends(get_s3_service),
-    presigned_url_service: PresignedURLService = Depends(get_presigned_url_service),
+    search_index: PhrasesSearchIndex | None = Depends(get_phrases_search_index),
+    cache_backend: TwoTierCacheBackend | None = Depends(get_cache_backend),
+    suggest_index: PhrasesSuggestIndex | None = Depends(get_phrases_suggest_index),
 ) -> PhrasesService:
     return PhrasesService(
         phrases_repository,
         s3_service=s3_service,
-        presigned_url_service=presigned_url_service,
+        search_index=search_index,
+        cache_backend=cache_backend,
+        suggest_index=suggest_index,
     )
 
 
@@ -54,3 +66,13 @@ async def phrase_issue_exists(
 ) -> None:
     if not await phrases_service.issue_exists(issue_id):
         raise HTTPException(status_code=404, detail="Phrase Issue not found")
+
+
+async def search_cursor_is_valid(cursor: str | None = Query(None)) -> None:
+    if cursor is None:
+        return
+
+    try:
+        decode_search_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from e
@@ -0,0 +1,84 @@
+import uuid
+from collections import OrderedDict
+from typing import Iterable
+
+import orjson
+
+from app.api.phrases.schemas import (
+    CursorPaginatedPhrasesBySearchTextSchema,
+    PaginatedPhrasesBySearchTextSchema,
+    PhraseBySearchTextSchema,
+)
+from app.core.config import settings
+
+
+class PhrasesSearchFragments:
+    """
+    Renders the phrases search results to the same JSON as `PaginatedPhrasesBySearchTextSchema`
+    (or `CursorPaginatedPhrasesBySearchTextSchema`) rendered by the response model,
+    without validating and serializing every item again.
+
+    The fields that are the same for every search (`id`, `full_text`, `scene_s3_key`, `start_in_movie`, `movie`)
+    are serialized once per phrase version and kept in the bounded LRU. The version is the content of these
+    fields, so the phrases updated through any worker get the new fragments without invalidation.
+    Only the matches are serialized per item.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        self.max_size = max_size
+        # (phrase id, version) -> (fields before `matched_phrase`, fields after `headline`)
+        self._fragments: OrderedDict[tuple[uuid.UUID, tuple[object, ...]], tuple[bytes, bytes]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._fragments)
+
+    def render_pages(self, pages: Iterable[PaginatedPhrasesBySearchTextSchema]) -> bytes:
+        return b"[" + b",".join(self.render_page(page) for page in pages) + b"]"
+
+    def render_page(
+        self,
+        page: PaginatedPhrasesBySearchTextSchema | CursorPaginatedPhrasesBySearchTextSchema,
+    ) -> bytes:
+        items = b",".join(self.render_item(item) for item in page.items)
+        pagination = orjson.dumps(page.model_dump(mode="json", exclude={"items"}))
+
+        return b'{"items":[' + items + b"]," + pagination[1:]
+
+    def render_item(self, item: PhraseBySearchTextSchema) -> bytes:
+        head, tail = self._get_fragments(item)
+        search_fields = orjson.dumps(
+            {
+                "matched_phrase": item.matched_phrase,
+                "matched_phrase_span": item.matched_phrase_span,
+                "headline": item.headline,
+            },
+        )
+
+        return head + b"," + search_fields[1:-1] + b"," + tail
+
+    def _get_fragments(self, item: PhraseBySearchTextSchema) -> tuple[bytes, bytes]:
+        key = (
+            item.id,
+            (item.full_text, item.scene_s3_key, item.start_in_movie, item.movie.id, item.movie.title, item.movie.year),
+        )
+        fragments = self._fragments.get(key)
+
+        if fragments is not None:
+            self._fragments.move_to_end(key)
+            return fragments
+
+        fragments = (
+            orjson.dumps(item.model_dump(mode="json", include={"id", "full_text", "scene_s3_key"}))[:-1],
+            orjson.dumps(item.model_dump(mode="json", include={"start_in_movie", "movie"}))[1:],
+        )
+
+        if self.max_size > 0:
+            self._fragments[key] = fragments
+
+            while len(self._fragments) > self.max_size:
+                self._fragments.popitem(last=False)
+
+        return fragments
+
+
+phrases_search_fragments = PhrasesSearchFragments(settings.phrases_search_fragments_cache_size)
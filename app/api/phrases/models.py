@@ -2,26 +2,62 @@ import datetime
 import typing
 import uuid
 
-from sqlalchemy import ForeignKey, String
-from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import Computed, ForeignKey, Index, Integer, String, event, false, text
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy.orm import Mapped, mapped_column, query_expression, relationship
 
 from app.api.movies.models import MovieModel
-from app.core.models import CoreModel, DateTimeModelMixin, IDModelMixin
+from app.core.constants import PHRASES_TEXT_SEARCH_CONFIG
+from app.core.models import CoreModel, DateTimeModelMixin, IDModelMixin, create_ddl
+
+# Phrases visible in the public search, see `PhrasesRepository._get_public_condition`
+PUBLIC_PHRASES_CONDITION = "is_active AND is_movie_active"
 
 
 class PhraseModel(CoreModel, IDModelMixin, DateTimeModelMixin):
     __tablename__ = "phrases"
+    __table_args__ = (
+        # Trigram index serves the substring (ILIKE '%...%') and the fuzzy (%>) search by normalized text.
+        # Search is public only, so the hidden phrases are left out of the search indexes.
+        Index(
+            "ix_phrases_normalized_text_trgm_public",
+            "normalized_text",
+            postgresql_using="gin",
+            postgresql_ops={"normalized_text": "gin_trgm_ops"},
+            postgresql_where=text(PUBLIC_PHRASES_CONDITION),
+        ),
+        Index(
+            "ix_phrases_search_vector_public",
+            "search_vector",
+            postgresql_using="gin",
+            postgresql_where=text(PUBLIC_PHRASES_CONDITION),
+        ),
+        # Sort key of the search with keyset pagination
+        Index("ix_phrases_movie_id_start_in_movie_id", "movie_id", "start_in_movie", "id"),
+    )
 
     movie_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("movies.id", ondelete="CASCADE"),
     )
     full_text: Mapped[str]
-    normalized_text: Mapped[str] = mapped_column(index=True)
+    normalized_text: Mapped[str]
+    # Offsets of the `normalized_text` tokens in `full_text` (see `get_phrase_text_offsets`)
+    normalized_offsets: Mapped[list[int] | None] = mapped_column(ARRAY(Integer), nullable=True)
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(f"to_tsvector('{PHRASES_TEXT_SEARCH_CONFIG}', normalized_text)", persisted=True),
+        deferred=True,
+    )
 
     start_in_movie: Mapped[datetime.timedelta]
     end_in_movie: Mapped[datetime.timedelta]
     scene_s3_key: Mapped[str] = mapped_column(String(100), nullable=True)
     is_active: Mapped[bool] = mapped_column(default=True)
+    # Copy of `MovieModel.is_active`, so the public search doesn't join movies. Kept in sync by the triggers below.
+    is_movie_active: Mapped[bool] = mapped_column(default=False, server_default=false())
+
+    # Highlighted `full_text`, loaded only by the full-text search
+    headline: Mapped[str | None] = query_expression()
 
     movie: Mapped[MovieModel] = relationship(back_populates="phrases")
     issues: Mapped[typing.List["PhraseIssueModel"]] = relationship(
@@ -36,6 +72,42 @@ class PhraseModel(CoreModel, IDModelMixin, DateTimeModelMixin):
         return self.end_in_movie - self.start_in_movie
 
 
+# `is_movie_active` is set from the movie on insert and updated with `MovieModel.is_active`,
+# so it's kept in sync for the writes made by the admin and bulk inserts too
+PHRASES_IS_MOVIE_ACTIVE_TRIGGERS_DDL = (
+    """
+    CREATE OR REPLACE FUNCTION phrases_set_is_movie_active() RETURNS trigger AS $$
+    BEGIN
+        NEW.is_movie_active := COALESCE((SELECT is_active FROM movies WHERE id = NEW.movie_id), FALSE);
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER phrases_set_is_movie_active
+    BEFORE INSERT OR UPDATE OF movie_id ON phrases
+    FOR EACH ROW EXECUTE FUNCTION phrases_set_is_movie_active()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION movies_sync_phrases_is_movie_active() RETURNS trigger AS $$
+    BEGIN
+        UPDATE phrases SET is_movie_active = NEW.is_active WHERE movie_id = NEW.id;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER movies_sync_phrases_is_movie_active
+    AFTER UPDATE OF is_active ON movies
+    FOR EACH ROW WHEN (OLD.is_active IS DISTINCT FROM NEW.is_active)
+    EXECUTE FUNCTION movies_sync_phrases_is_movie_active()
+    """,
+)
+
+for statement in PHRASES_IS_MOVIE_ACTIVE_TRIGGERS_DDL:
+    event.listen(PhraseModel.__table__, "after_create", create_ddl(statement))
+
+
 class PhraseIssueModel(CoreModel, IDModelMixin, DateTimeModelMixin):
     __tablename__ = "phrases_issues"
 
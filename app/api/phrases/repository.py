@@ -1,21 +1,25 @@
+import datetime
 import uuid
 from typing import Sequence
 
 from fastapi_pagination import Page, Params
 from fastapi_pagination.ext.sqlalchemy import paginate
-from sqlalchemy import delete, exists, insert, select
+from sqlalchemy import ColumnElement, Select, and_, case, cast, delete, exists, func, insert, literal, select, tuple_
+from sqlalchemy.dialects.postgresql import REGCONFIG
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, with_expression
 
 from app.api.movies.models import MovieModel
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
 from app.api.phrases.schemas import (
     PhraseCreateSchema,
     PhraseIssueCreateSchema,
+    PhraseSearchFiltersSchema,
     PhraseTransferSchema,
     PhraseUpdateSchema,
 )
 from app.core.config import settings
+from app.core.constants import PHRASES_TEXT_SEARCH_CONFIG, PhraseSearchCount
 from app.core.exceptions import RepositoryNotFoundError
 
 
@@ -33,14 +37,22 @@ class PhrasesRepository:
 
             return phrase
 
-    async def delete(self, phrase_id: uuid.UUID) -> str | None:
+    async def delete(self, phrase_id: uuid.UUID) -> tuple[uuid.UUID, str | None, str | None]:
+        """
+        Returns the movie id, the scene S3 key and the normalized text of the deleted phrase.
+        The text is returned only if the phrase was public, see `get_all_for_search_index`.
+        """
         if not await self.exists(phrase_id):
             raise RepositoryNotFoundError(f"Phrase not found: id={phrase_id}")
 
         async with self.session as session:
-            query = delete(PhraseModel).where(PhraseModel.id == phrase_id).returning(PhraseModel.scene_s3_key)
+            query = (
+                delete(PhraseModel)
+                .where(PhraseModel.id == phrase_id)
+                .returning(PhraseModel.movie_id, PhraseModel.scene_s3_key, self._get_public_normalized_text())
+            )
 
-            result = await session.scalar(query)
+            result = (await session.execute(query)).tuples().one()
             await session.commit()
 
             return result
@@ -73,7 +85,10 @@ class PhrasesRepository:
         self,
         phrase_id: uuid.UUID,
         data: PhraseUpdateSchema,
-    ) -> PhraseModel:
+    ) -> tuple[PhraseModel, str | None]:
+        """
+        Returns the updated phrase and its normalized text before the update if the phrase was public
+        """
         async with self.session as session:
             query = select(PhraseModel).where(PhraseModel.id == phrase_id)
             phrase = await session.scalar(query)
@@ -81,13 +96,15 @@ class PhrasesRepository:
             if not phrase:
                 raise RepositoryNotFoundError(f"Phrase not found: id={phrase_id}")
 
+            indexed_text = phrase.normalized_text if phrase.is_active and phrase.is_movie_active else None
+
             for field, value in data.model_dump().items():
                 setattr(phrase, field, value)
 
             await session.commit()
             await session.refresh(phrase)
 
-        return phrase
+        return phrase, indexed_text
 
     async def get_by_movie_id(self, movie_id: uuid.UUID) -> Sequence[PhraseModel]:
         async with self.session as session:
@@ -140,40 +157,298 @@ class PhrasesRepository:
 
         return phrases
 
-    async def get_by_search_text(self, search_text: str, page: int = 1) -> Page[PhraseModel]:
+    async def get_by_search_text(
+        self,
+        search_text: str,
+        page: int = 1,
+        count: PhraseSearchCount = PhraseSearchCount.EXACT,
+        filters: PhraseSearchFiltersSchema | None = None,
+    ) -> Page[PhraseModel]:
+        query = (
+            select(PhraseModel)
+            .where(
+                # Served by the trigram index `ix_phrases_normalized_text_trgm_public`
+                PhraseModel.normalized_text.icontains(search_text, autoescape=True),
+                self._get_public_condition(),
+            )
+            .options(
+                joinedload(PhraseModel.movie).load_only(MovieModel.id, MovieModel.title, MovieModel.year),
+            )
+        )
+
+        return await self._paginate_search(self._filter_search(query, filters), page, count)
+
+    async def get_by_search_text_after(
+        self,
+        search_text: str,
+        after: tuple[uuid.UUID, datetime.timedelta, uuid.UUID] | None,
+        limit: int,
+        filters: PhraseSearchFiltersSchema | None = None,
+    ) -> Sequence[PhraseModel]:
+        """
+        Returns phrases ordered by (movie_id, start_in_movie, id) that go after the `after` key
+        """
+        sort_key = (PhraseModel.movie_id, PhraseModel.start_in_movie, PhraseModel.id)
+        query = (
+            select(PhraseModel)
+            .where(
+                PhraseModel.normalized_text.icontains(search_text, autoescape=True),
+                self._get_public_condition(),
+            )
+            .order_by(*sort_key)
+            .limit(limit)
+            .options(
+                joinedload(PhraseModel.movie).load_only(MovieModel.id, MovieModel.title, MovieModel.year),
+            )
+        )
+
+        if after is not None:
+            after_key = (literal(value, column.type) for column, value in zip(sort_key, after, strict=True))
+            query = query.where(tuple_(*sort_key) > tuple_(*after_key))
+
+        query = self._filter_search(query, filters)
+
         async with self.session as session:
-            result: Page[PhraseModel] = await paginate(
-                session,
-                select(PhraseModel)
-                .where(
-                    PhraseModel.normalized_text.icontains(search_text),
+            phrases = await session.scalars(query)
+
+            return phrases.all()
+
+    async def get_by_full_text_search(
+        self,
+        search_text: str,
+        page: int = 1,
+        count: PhraseSearchCount = PhraseSearchCount.EXACT,
+        filters: PhraseSearchFiltersSchema | None = None,
+    ) -> Page[PhraseModel]:
+        """
+        `search_text` is passed as is, so it supports the web search syntax: "quoted phrases", `or`, `-word`
+        """
+        text_search_config = cast(PHRASES_TEXT_SEARCH_CONFIG, REGCONFIG)
+        ts_query = func.websearch_to_tsquery(text_search_config, search_text)
+        query = (
+            select(PhraseModel)
+            .where(
+                # Served by the GIN index `ix_phrases_search_vector_public`
+                PhraseModel.search_vector.bool_op("@@")(ts_query),
+                self._get_public_condition(),
+            )
+            .order_by(
+                func.ts_rank_cd(PhraseModel.search_vector, ts_query).desc(),
+                PhraseModel.id,
+            )
+            .options(
+                joinedload(PhraseModel.movie).load_only(MovieModel.id, MovieModel.title, MovieModel.year),
+                with_expression(
+                    PhraseModel.headline,
+                    func.ts_headline(text_search_config, PhraseModel.full_text, ts_query, "HighlightAll=true"),
+                ),
+            )
+        )
+
+        return await self._paginate_search(self._filter_search(query, filters), page, count)
+
+    async def get_by_fuzzy_search(
+        self,
+        search_text: str,
+        page: int = 1,
+        count: PhraseSearchCount = PhraseSearchCount.EXACT,
+        filters: PhraseSearchFiltersSchema | None = None,
+    ) -> Page[PhraseModel]:
+        """
+        Typo tolerant search: phrases containing words similar to `search_text` (pg_trgm `word_similarity`
+        above `phrases_search_fuzzy_threshold`), the most similar first
+        """
+        similarity = func.word_similarity(search_text, PhraseModel.normalized_text)
+        query = (
+            select(PhraseModel)
+            .where(
+                # Unlike `word_similarity() > threshold`, the operator is served by the trigram index
+                # `ix_phrases_normalized_text_trgm_public`. It compares with `pg_trgm.word_similarity_threshold`.
+                PhraseModel.normalized_text.bool_op("%>")(search_text),
+                self._get_public_condition(),
+            )
+            .order_by(similarity.desc(), PhraseModel.id)
+            .options(
+                joinedload(PhraseModel.movie).load_only(MovieModel.id, MovieModel.title, MovieModel.year),
+            )
+        )
+
+        return await self._paginate_search(
+            self._filter_search(query, filters),
+            page,
+            count,
+            word_similarity_threshold=settings.phrases_search_fuzzy_threshold,
+        )
+
+    @staticmethod
+    def _get_public_condition() -> ColumnElement[bool]:
+        """
+        Hidden phrases and phrases of hidden movies are never returned by the search.
+        Must match `PUBLIC_PHRASES_CONDITION`, so the partial search indexes are used.
+        """
+        return and_(PhraseModel.is_active, PhraseModel.is_movie_active)
+
+    @classmethod
+    def _get_public_normalized_text(cls) -> ColumnElement[str | None]:
+        """
+        Returns the normalized text of the public phrases and NULL of the other ones
+        """
+        return case((cls._get_public_condition(), PhraseModel.normalized_text))
+
+    @staticmethod
+    def _filter_search(
+        query: Select[tuple[PhraseModel]],
+        filters: PhraseSearchFiltersSchema | None,
+    ) -> Select[tuple[PhraseModel]]:
+        """
+        Phrases of one movie are served by `ix_phrases_movie_id_start_in_movie_id`
+        and movie filters by `ix_movies_language_year`
+        """
+        if filters is None:
+            return query
+
+        if filters.movie_id is not None:
+            query = query.where(PhraseModel.movie_id == filters.movie_id)
+
+        movie_conditions = []
+
+        if filters.year is not None:
+            movie_conditions.append(MovieModel.year == filters.year)
+
+        if filters.language is not None:
+            movie_conditions.append(MovieModel.language == filters.language)
+
+        if movie_conditions:
+            # Semi-join instead of a join, so `joinedload(PhraseModel.movie)` isn't affected
+            query = query.where(PhraseModel.movie_id.in_(select(MovieModel.id).where(*movie_conditions)))
+
+        return query
+
+    async def _paginate_search(
+        self,
+        query: Select[tuple[PhraseModel]],
+        page: int,
+        count: PhraseSearchCount,
+        word_similarity_threshold: float | None = None,
+    ) -> Page[PhraseModel]:
+        """
+        `count=exact` counts all matches. The other modes don't, so `total` is only a lower bound:
+        - `estimate` stops counting after `phrases_search_count_cap` (or the end of the page) + 1 matches
+        - `none` fetches one extra phrase instead of counting, so `total` only shows if there is the next page
+
+        `word_similarity_threshold` is set for the transaction of the search queries, see `get_by_fuzzy_search`
+        """
+        params = Params(page=page, size=settings.phrases_page_size)
+
+        async with self.session as session:
+            if word_similarity_threshold is not None:
+                await session.execute(
+                    select(func.set_config("pg_trgm.word_similarity_threshold", str(word_similarity_threshold), True)),
                 )
+
+            if count == PhraseSearchCount.EXACT:
+                result: Page[PhraseModel] = await paginate(session, query, params=params)
+
+                return result
+
+            offset = (page - 1) * params.size
+            phrases = (await session.scalars(query.offset(offset).limit(params.size + 1))).all()
+            total = offset + len(phrases)
+
+            # Matches are already counted if the page ends before the extra phrase, unless it's past the last page
+            if count == PhraseSearchCount.ESTIMATE and (len(phrases) > params.size or (not phrases and offset)):
+                count_limit = max(settings.phrases_search_count_cap, offset + params.size) + 1
+                count_query = query.with_only_columns(PhraseModel.id).order_by(None).limit(count_limit)
+                total = await session.scalar(select(func.count()).select_from(count_query.subquery())) or 0
+
+            return Page.create(phrases[: params.size], params, total=total)
+
+    async def get_by_ids(self, phrase_ids: Sequence[uuid.UUID]) -> Sequence[PhraseModel]:
+        """
+        Returns public phrases in the same order as `phrase_ids`
+        """
+        async with self.session as session:
+            query = (
+                select(PhraseModel)
+                .where(PhraseModel.id.in_(phrase_ids), self._get_public_condition())
                 .options(
                     joinedload(PhraseModel.movie).load_only(MovieModel.id, MovieModel.title, MovieModel.year),
-                ),
-                params=Params(page=page, size=settings.phrases_page_size),
+                )
             )
+            phrases = {phrase.id: phrase for phrase in await session.scalars(query)}
 
-            return result
+            return [phrases[phrase_id] for phrase_id in phrase_ids if phrase_id in phrases]
 
-    async def delete_by_movie_id(self, movie_id: uuid.UUID) -> None:
+    async def get_all_for_search_index(
+        self,
+        movie_id: uuid.UUID | None = None,
+        phrase_ids: Sequence[uuid.UUID] | None = None,
+    ) -> Sequence[tuple[uuid.UUID, uuid.UUID, str]]:
+        """
+        Returns `(phrase_id, movie_id, normalized_text)` of the public phrases, optionally of the movie or by ids
+        """
         async with self.session as session:
-            query = delete(PhraseModel).where(PhraseModel.movie_id == movie_id)
+            query = select(PhraseModel.id, PhraseModel.movie_id, PhraseModel.normalized_text).where(
+                self._get_public_condition(),
+            )
+
+            if movie_id is not None:
+                query = query.where(PhraseModel.movie_id == movie_id)
+
+            if phrase_ids is not None:
+                query = query.where(PhraseModel.id.in_(phrase_ids))
+
+            result = await session.execute(query)
 
-            await session.execute(query)
+            return result.tuples().all()
+
+    async def get_all_for_suggest_index(self) -> Sequence[str]:
+        async with self.session as session:
+            query = select(PhraseModel.normalized_text).where(self._get_public_condition())
+            result = await session.scalars(query)
+
+            return result.all()
+
+    async def delete_by_movie_id(self, movie_id: uuid.UUID) -> Sequence[str]:
+        """
+        Returns the normalized texts of the deleted public phrases
+        """
+        async with self.session as session:
+            query = (
+                delete(PhraseModel)
+                .where(PhraseModel.movie_id == movie_id)
+                .returning(self._get_public_normalized_text())
+            )
+
+            normalized_texts = (await session.scalars(query)).all()
             await session.commit()
 
-    async def import_from_json(self, movie_id: uuid.UUID, data: Sequence[PhraseTransferSchema]) -> None:
+            return [normalized_text for normalized_text in normalized_texts if normalized_text is not None]
+
+    async def import_from_json(
+        self,
+        movie_id: uuid.UUID,
+        data: Sequence[PhraseTransferSchema],
+    ) -> Sequence[PhraseModel]:
         phrases_data = [{"movie_id": movie_id, **phrase.model_dump()} for phrase in data]
 
         async with self.session as session:
-            await session.scalars(
-                insert(PhraseModel).returning(PhraseModel.id),
+            result = await session.scalars(
+                insert(PhraseModel).returning(PhraseModel),
                 phrases_data,
             )
+            phrases = []
+
+            # The returned phrases are expired on commit, they are copied with the inserted values
+            for phrase_model in result.all():
+                phrase_obj = phrase_model.__dict__.copy()
+                phrase_obj.pop("_sa_instance_state", None)
+                phrases.append(PhraseModel(**phrase_obj))
 
             await session.commit()
 
+        return phrases
+
     async def create_issue(self, phrase_issue_data: PhraseIssueCreateSchema) -> None:
         async with self.session as session:
             issue_exists_stmt = select(
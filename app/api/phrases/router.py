@@ -1,9 +1,12 @@
+import asyncio
+import logging
 import uuid
 from typing import Sequence
 
-from fastapi import BackgroundTasks, Depends, Form, Query, Request, status
-from fastapi.responses import Response
+from fastapi import BackgroundTasks, Depends, Form, HTTPException, Query, Request, status
+from fastapi.responses import RedirectResponse, Response
 from fastapi.routing import APIRouter
+from fastapi_cache import FastAPICache
 from fastapi_cache.decorator import cache
 from typing_extensions import Annotated
 
@@ -13,25 +16,44 @@ from app.api.phrases.dependencies import (
     get_scenes_upload_service,
     phrase_exists,
     phrase_issue_exists,
+    search_cursor_is_valid,
 )
+from app.api.phrases.fragments import phrases_search_fragments
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
+from app.api.phrases.repository import PhrasesRepository
 from app.api.phrases.scenes_upload_service import ScenesUploadService
 from app.api.phrases.schemas import (
+    CursorPaginatedPhrasesBySearchTextSchema,
     PaginatedPhrasesBySearchTextSchema,
     PhraseCreateFromMovieFilesSchema,
     PhraseCreateSchema,
     PhraseIssueCreateSchema,
     PhraseIssueSchema,
     PhraseSchema,
+    PhraseSearchFiltersSchema,
+    PhrasesSearchBatchSchema,
+    PhrasesSearchQuerySchema,
     PhraseTransferSchema,
     PhraseUpdateSchema,
 )
 from app.api.phrases.service import PhrasesService
+from app.api.phrases.utils import decode_scene_token
 from app.api.users.permissions import current_superuser
+from app.core.cache import PHRASES_SEARCH_CACHE_NAMESPACE, RawJSONCoder, TwoTierCacheBackend, get_json_response
 from app.core.cache_key_builder import key_builder_phrase_search_by_text
+from app.core.config import settings
+from app.core.constants import PhraseSearchCount, PhraseSearchMode
+from app.core.database import sessionmanager
+from app.s3.dependencies import get_presigned_url_service
+from app.s3.presigned_url_service import PresignedURLService
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/phrases", tags=["phrases"])
 
+# Limits the next page prefetches running in this worker
+_prefetch_semaphore = asyncio.Semaphore(settings.phrases_search_prefetch_concurrency)
+
 
 @router.get(
     "/",
@@ -51,17 +73,257 @@ async def get_all_phrases(
     response_model=PaginatedPhrasesBySearchTextSchema,
     status_code=status.HTTP_200_OK,
 )
-@cache(expire=1800, key_builder=key_builder_phrase_search_by_text)
+@cache(
+    expire=settings.phrases_search_cache_ttl,
+    namespace=PHRASES_SEARCH_CACHE_NAMESPACE,
+    key_builder=key_builder_phrase_search_by_text,
+    coder=RawJSONCoder,
+)
 async def get_phrases_by_search_text(
     search_text: Annotated[str, Query(min_length=1)],
     page: Annotated[int, Query(ge=1)],
+    background_tasks: BackgroundTasks,
+    mode: Annotated[PhraseSearchMode, Query()] = PhraseSearchMode.SUBSTRING,
+    count: Annotated[PhraseSearchCount, Query()] = PhraseSearchCount.EXACT,
+    filters: PhraseSearchFiltersSchema = Depends(),
     phrases_service: PhrasesService = Depends(get_phrases_service),
-) -> PaginatedPhrasesBySearchTextSchema:
+) -> Response:
     """
     If dependencies are changed, make sure `key_builder_phrase_search_by_text`
     workds correctly. It had to be created because of issue: https://github.com/long2ice/fastapi-cache/issues/279
+
+    `mode=full_text` ranks results by relevance and fills `headline` with highlighted matches.
+    `mode=fuzzy` tolerates typos: phrases with words similar to `search_text` go first,
+    `matched_phrase` is empty if the text isn't found as is.
+
+    Counting all matches of a common word costs much more than fetching the page:
+    - `count=estimate` stops counting after `phrases_search_count_cap` matches, `is_total_exact` is false then
+    - `count=none` doesn't count at all, only `has_more` is returned
+
+    `movie_id`, `year` and `language` narrow the search down. Hidden phrases and movies are never returned.
+
+    The next page is cached in the background after the response, so paging through results hits the cache.
+
+    The response is rendered by `PhrasesSearchFragments` and cached as JSON, so the cache hits are returned
+    without going through the response model.
+    """
+    phrases = await phrases_service.get_by_search_text(search_text, page, mode, count, filters)
+
+    if phrases.has_more and FastAPICache.get_enable() and not _prefetch_semaphore.locked():
+        next_page_query = PhrasesSearchQuerySchema(
+            search_text=search_text,
+            page=page + 1,
+            mode=mode,
+            count=count,
+            filters=filters,
+        )
+        background_tasks.add_task(_prefetch_phrases_by_search_text, next_page_query, phrases_service)
+
+    return get_json_response(phrases_search_fragments.render_page(phrases))
+
+
+@router.post(
+    "/get-by-search-texts",
+    name="phrases:get-phrases-by-search-texts",
+    response_model=Sequence[PaginatedPhrasesBySearchTextSchema],
+    status_code=status.HTTP_200_OK,
+)
+async def get_phrases_by_search_texts(
+    payload: PhrasesSearchBatchSchema,
+    phrases_service: PhrasesService = Depends(get_phrases_service),
+) -> Response:
+    """
+    Runs many `get_phrases_by_search_text` searches in one request, results go in the same order as `queries`.
+    The searches share the cache entries with `get_phrases_by_search_text`, the missing ones are run concurrently.
+    """
+    if not FastAPICache.get_enable():
+        return get_json_response(
+            phrases_search_fragments.render_pages(await phrases_service.get_by_search_texts(payload.queries)),
+        )
+
+    # Repeated queries must be looked up once: the cache backend makes the second lookup wait for the first one
+    cache_keys = {query: _get_phrases_by_search_text_cache_key(query) for query in payload.queries}
+    cached_results = await asyncio.gather(*(_get_cached_phrases(cache_key) for cache_key in cache_keys.values()))
+    results = {query: body for query, body in zip(cache_keys, cached_results) if body is not None}
+    missing_queries = [query for query in cache_keys if query not in results]
+
+    if missing_queries:
+        try:
+            for query, phrases in zip(missing_queries, await phrases_service.get_by_search_texts(missing_queries)):
+                results[query] = phrases_search_fragments.render_page(phrases)
+                await _set_cached_phrases(cache_keys[query], results[query])
+        finally:
+            # The requests waiting for the failed searches recompute them at once
+            for query in missing_queries:
+                if query not in results:
+                    await _release_cached_phrases(cache_keys[query])
+
+    # The cached pages are the same JSON as the rendered ones, so they are joined without decoding
+    return get_json_response(b"[" + b",".join(results[query] for query in payload.queries) + b"]")
+
+
+@router.get(
+    "/get-by-search-text-cursor",
+    name="phrases:get-phrases-by-search-text-cursor",
+    response_model=CursorPaginatedPhrasesBySearchTextSchema,
+    status_code=status.HTTP_200_OK,
+    dependencies=[Depends(search_cursor_is_valid)],
+)
+@cache(
+    expire=settings.phrases_search_cache_ttl,
+    namespace=PHRASES_SEARCH_CACHE_NAMESPACE,
+    key_builder=key_builder_phrase_search_by_text,
+    coder=RawJSONCoder,
+)
+async def get_phrases_by_search_text_cursor(
+    search_text: Annotated[str, Query(min_length=1)],
+    cursor: Annotated[str | None, Query()] = None,
+    filters: PhraseSearchFiltersSchema = Depends(),
+    phrases_service: PhrasesService = Depends(get_phrases_service),
+) -> Response:
+    """
+    Same search as `get_phrases_by_search_text` but with keyset pagination:
+    pass `next_cursor` of the previous page to get the next one. The filters must stay the same.
+    """
+    phrases = await phrases_service.get_by_search_text_cursor(search_text, cursor, filters)
+
+    return get_json_response(phrases_search_fragments.render_page(phrases))
+
+
+@router.get(
+    "/suggest",
+    name="phrases:suggest-phrases",
+    response_model=Sequence[str],
+    status_code=status.HTTP_200_OK,
+)
+async def suggest_phrases(
+    prefix: Annotated[str, Query(min_length=1, max_length=100)],
+    limit: Annotated[int, Query(ge=1, le=settings.phrases_suggest_max_limit)] = 10,
+    phrases_service: PhrasesService = Depends(get_phrases_service),
+) -> Sequence[str]:
+    """
+    Autocomplete for the search input: the most frequent word n-grams of phrases starting with `prefix`.
+    Served from memory, so it's cheap enough to call on every keystroke.
+    """
+    return await phrases_service.suggest(prefix, limit)
+
+
+@router.get(
+    "/scenes/{token}",
+    name="phrases:get-scene",
+    status_code=status.HTTP_302_FOUND,
+    response_class=RedirectResponse,
+)
+async def get_scene(
+    token: str,
+    presigned_url_service: PresignedURLService = Depends(get_presigned_url_service),
+) -> RedirectResponse:
+    """
+    `scene_s3_key` of the phrases in the responses is the URL of this endpoint, it never changes for the scene.
+    The scene is presigned only when it's played, the presigned URLs are cached by `PresignedURLService`.
+    """
+    try:
+        scene_s3_key = decode_scene_token(token)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Scene not found") from e
+
+    return RedirectResponse(
+        await presigned_url_service.get_presigned_url(scene_s3_key),
+        status_code=status.HTTP_302_FOUND,
+        headers={"Cache-Control": f"private, max-age={settings.s3_scene_redirect_cache_ttl}"},
+    )
+
+
+def _get_phrases_by_search_text_cache_key(query: PhrasesSearchQuerySchema) -> str:
+    """
+    The key `@cache` builds for `get_phrases_by_search_text` called with the same parameters
+    """
+    return key_builder_phrase_search_by_text(
+        get_phrases_by_search_text,
+        PHRASES_SEARCH_CACHE_NAMESPACE,
+        args=(),
+        kwargs=dict(query),
+    )
+
+
+async def _get_cached_phrases(cache_key: str) -> bytes | None:
+    """
+    Returns the JSON cached by `get_phrases_by_search_text`
+    """
+    try:
+        _, cached = await FastAPICache.get_backend().get_with_ttl(cache_key)
+    except Exception:
+        logger.warning("Error retrieving cache key '%s' from backend", cache_key, exc_info=True)
+        return None
+
+    if cached is None:
+        return None
+
+    return bytes(RawJSONCoder.decode(cached).body)
+
+
+async def _set_cached_phrases(cache_key: str, body: bytes) -> None:
+    try:
+        await FastAPICache.get_backend().set(
+            cache_key,
+            RawJSONCoder.encode(get_json_response(body)),
+            settings.phrases_search_cache_ttl,
+        )
+    except Exception:
+        logger.warning("Error setting cache key '%s' in backend", cache_key, exc_info=True)
+
+
+async def _release_cached_phrases(cache_key: str) -> None:
+    """
+    Gives up computing the value `_get_cached_phrases` returned None for
+    """
+    cache_backend = FastAPICache.get_backend()
+
+    if not isinstance(cache_backend, TwoTierCacheBackend):
+        return
+
+    try:
+        await cache_backend.release(cache_key)
+    except Exception:
+        logger.warning("Error releasing cache key '%s' in backend", cache_key, exc_info=True)
+
+
+async def _prefetch_phrases_by_search_text(query: PhrasesSearchQuerySchema, phrases_service: PhrasesService) -> None:
+    """
+    Caches the search results like `get_phrases_by_search_text` does, if they aren't cached yet.
+    Skipped when `phrases_search_prefetch_concurrency` prefetches are already running: it's only an optimization.
+
+    Runs after the response, when the DB session of the request is closed, so the search opens its own session.
     """
-    return await phrases_service.get_by_search_text(search_text, page)
+    if _prefetch_semaphore.locked():
+        return
+
+    async with _prefetch_semaphore:
+        cache_key = _get_phrases_by_search_text_cache_key(query)
+
+        if await _get_cached_phrases(cache_key) is not None:
+            return
+
+        is_cached = False
+
+        try:
+            async with sessionmanager.session() as session:
+                phrases = await phrases_service.with_repository(PhrasesRepository(session)).get_by_search_text(
+                    query.search_text,
+                    query.page,
+                    query.mode,
+                    query.count,
+                    query.filters,
+                )
+
+            await _set_cached_phrases(cache_key, phrases_search_fragments.render_page(phrases))
+            is_cached = True
+        except Exception:
+            logger.warning("Failed to prefetch phrases search page: %s", query, exc_info=True)
+        finally:
+            # The requests waiting for the failed prefetch run the search themselves at once
+            if not is_cached:
+                await _release_cached_phrases(cache_key)
 
 
 @router.get(
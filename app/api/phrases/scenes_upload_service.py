@@ -1,6 +1,5 @@
 import asyncio
 import datetime
-import io
 import logging
 import os
 import shutil
@@ -20,7 +19,7 @@ from app.api.phrases.schemas import (
     SubtitleItem,
 )
 from app.api.phrases.service import PhrasesService
-from app.api.phrases.utils import get_ffmpeg_trim_cmd_for_phrase, normalize_phrase_text
+from app.api.phrases.utils import get_ffmpeg_trim_cmd_for_phrase, get_phrase_text_offsets, normalize_many
 from app.core.config import settings
 from app.core.constants import MovieStatus
 from app.core.exceptions import SceneUploadError
@@ -89,11 +88,10 @@ class ScenesUploadService:
         """
         Parses subtitles file and returns list of SubtitleItems
         """
-        subtitle_items = []
-
         contents = await subtitles_file.read()
+        subtitles = list(srt.parse(contents.decode("utf-8")))
 
-        for sub in srt.parse(contents.decode("utf-8")):
+        for sub in subtitles:
             if start_in_movie_shift != 0:
                 delta = datetime.timedelta(seconds=abs(start_in_movie_shift))
                 if start_in_movie_shift > 0:
@@ -108,16 +106,18 @@ class ScenesUploadService:
                 else:
                     sub.end -= delta
 
-            subtitle_items.append(
-                SubtitleItem(
-                    start_time=sub.start,
-                    end_time=sub.end,
-                    text=sub.content,
-                    normalized_text=normalize_phrase_text(sub.content),
-                ),
-            )
+        normalized_texts = normalize_many([sub.content for sub in subtitles])
 
-        return subtitle_items
+        return [
+            SubtitleItem(
+                start_time=sub.start,
+                end_time=sub.end,
+                text=sub.content,
+                normalized_text=normalized_text,
+                normalized_offsets=get_phrase_text_offsets(sub.content),
+            )
+            for sub, normalized_text in zip(subtitles, normalized_texts)
+        ]
 
     async def _create_phrases(
         self,
@@ -132,6 +132,7 @@ class ScenesUploadService:
                 movie_id=movie_id,
                 full_text=item.text,
                 normalized_text=item.normalized_text,
+                normalized_offsets=item.normalized_offsets,
                 start_in_movie=item.start_time,
                 end_in_movie=item.end_time,
                 is_active=False,
@@ -166,37 +167,48 @@ class ScenesUploadService:
             tmp_output_dir,
         )
 
-        for phrase in phrases:
-            try:
-                scene_filename = f"{phrase.id}{movie_extension}"
-                scene_file = await self._get_scene_file(tmp_output_dir, scene_filename)
-                scene_s3_key = Path("movies", str(movie_id), scene_filename).as_posix()
-
-                await self.s3_service.upload_fileobj(scene_file, scene_s3_key)
+        scenes_filenames = [f"{phrase.id}{movie_extension}" for phrase in phrases]
+        scenes_s3_keys = [
+            Path("movies", str(movie_id), scene_filename).as_posix() for scene_filename in scenes_filenames
+        ]
 
-                new_phrase_data = {
-                    **phrase.__dict__,
-                    "scene_s3_key": scene_s3_key,
-                    "is_active": True,
-                }
+        try:
+            await self._upload_scenes_files(
+                [Path(tmp_output_dir, scene_filename) for scene_filename in scenes_filenames],
+                scenes_s3_keys,
+            )
 
-                await self.phrases_service.update(
-                    phrase.id,
-                    PhraseUpdateSchema(**new_phrase_data),
-                )
+            # The cached search results are invalidated once for the whole movie
+            await self.phrases_service.bulk_update(
+                {
+                    phrase.id: PhraseUpdateSchema(
+                        **{
+                            **phrase.__dict__,
+                            "scene_s3_key": scene_s3_key,
+                            "is_active": True,
+                        },
+                    )
+                    for phrase, scene_s3_key in zip(phrases, scenes_s3_keys)
+                },
+            )
+        except Exception as e:
+            raise SceneUploadError() from e
 
-            except Exception as e:
-                raise SceneUploadError() from e
+    async def _upload_scenes_files(self, scenes_paths: Sequence[Path], scenes_s3_keys: Sequence[str]) -> None:
+        """
+        Uploads `s3_scenes_upload_concurrency` scenes at the same time, a scene is a few requests to S3
+        so they are mostly waiting for the network. If an upload fails, the other ones are cancelled
+        before the scenes files are removed.
+        """
+        semaphore = asyncio.Semaphore(settings.s3_scenes_upload_concurrency)
 
-    async def _get_scene_file(
-        self,
-        tmp_output_dir: Path,
-        scene_filename: str,
-    ) -> io.BytesIO:
-        phrase_file_path = Path(tmp_output_dir, scene_filename)
+        async def upload_scene_file(scene_path: Path, scene_s3_key: str) -> None:
+            async with semaphore:
+                await self.s3_service.upload_file(scene_path, scene_s3_key)
 
-        async with aiofiles.open(phrase_file_path, "rb") as f:
-            return io.BytesIO(await f.read())
+        async with asyncio.TaskGroup() as task_group:
+            for scene_path, scene_s3_key in zip(scenes_paths, scenes_s3_keys):
+                task_group.create_task(upload_scene_file(scene_path, scene_s3_key))
 
     async def _create_scenes_files(
         self,
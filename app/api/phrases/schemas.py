@@ -4,12 +4,18 @@ import uuid
 from typing import Sequence
 
 from fastapi import UploadFile
-from pydantic import BaseModel, ConfigDict, field_serializer, field_validator, model_validator
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator, model_validator
 
 from app.api.movies.schemas import MovieInSearchByPhraseTextSchema
-from app.api.phrases.utils import format_duration
+from app.api.phrases.utils import format_duration, get_scene_url
 from app.core.config import settings
-from app.core.constants import SUPPORTED_SUBTITLES_EXTENSIONS, SUPPORTED_VIDEO_EXTENSIONS
+from app.core.constants import (
+    SUPPORTED_SUBTITLES_EXTENSIONS,
+    SUPPORTED_VIDEO_EXTENSIONS,
+    Languages,
+    PhraseSearchCount,
+    PhraseSearchMode,
+)
 from app.core.validators import FileValidator
 
 
@@ -28,6 +34,10 @@ class PhraseSchema(BaseModel):
     def serialize_duration(self, value: datetime.timedelta) -> str:
         return format_duration(value)
 
+    @field_serializer("scene_s3_key", when_used="json")
+    def serialize_scene_s3_key(self, value: str | None) -> str | None:
+        return get_scene_url(value)
+
 
 class PhraseBySearchTextSchema(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -36,6 +46,8 @@ class PhraseBySearchTextSchema(BaseModel):
     full_text: str
     scene_s3_key: str | None
     matched_phrase: str
+    matched_phrase_span: tuple[int, int] | None = None
+    headline: str | None = None
     start_in_movie: datetime.timedelta
     movie: MovieInSearchByPhraseTextSchema
 
@@ -43,19 +55,62 @@ class PhraseBySearchTextSchema(BaseModel):
     def serialize_duration(self, value: datetime.timedelta) -> str:
         return format_duration(value)
 
+    @field_serializer("scene_s3_key", when_used="json")
+    def serialize_scene_s3_key(self, value: str | None) -> str | None:
+        return get_scene_url(value)
+
 
 class PaginatedPhrasesBySearchTextSchema(BaseModel):
     items: Sequence[PhraseBySearchTextSchema]
-    total: int
+    total: int | None
     page: int
     size: int
-    pages: int
+    pages: int | None
+    has_more: bool
+    is_total_exact: bool
+
+
+class CursorPaginatedPhrasesBySearchTextSchema(BaseModel):
+    items: Sequence[PhraseBySearchTextSchema]
+    size: int
+    next_cursor: str | None
+
+
+class PhraseSearchFiltersSchema(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    movie_id: uuid.UUID | None = None
+    year: int | None = None
+    language: Languages | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        return self == PhraseSearchFiltersSchema()
+
+
+class PhrasesSearchQuerySchema(BaseModel):
+    """
+    Same parameters as `get_phrases_by_search_text`
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    search_text: str = Field(min_length=1)
+    page: int = Field(1, ge=1)
+    mode: PhraseSearchMode = PhraseSearchMode.SUBSTRING
+    count: PhraseSearchCount = PhraseSearchCount.EXACT
+    filters: PhraseSearchFiltersSchema = PhraseSearchFiltersSchema()
+
+
+class PhrasesSearchBatchSchema(BaseModel):
+    queries: list[PhrasesSearchQuerySchema] = Field(min_length=1, max_length=settings.phrases_search_batch_max_size)
 
 
 class PhraseCreateUpdateSchema(BaseModel, abc.ABC):
     movie_id: uuid.UUID
     full_text: str
     normalized_text: str
+    normalized_offsets: list[int] | None = None
     start_in_movie: datetime.timedelta
     end_in_movie: datetime.timedelta
     is_active: bool = True
@@ -116,6 +171,7 @@ class SubtitleItem(BaseModel):
     end_time: datetime.timedelta
     text: str
     normalized_text: str
+    normalized_offsets: list[int]
 
     @model_validator(mode="after")
     def validate_start_time_less_than_end(self) -> "SubtitleItem":
@@ -129,6 +185,7 @@ class PhraseTransferSchema(BaseModel):
     id: uuid.UUID
     full_text: str
     normalized_text: str
+    normalized_offsets: list[int] | None = None
     start_in_movie: datetime.timedelta
     end_in_movie: datetime.timedelta
     scene_s3_key: str
@@ -0,0 +1,275 @@
+import array
+import asyncio
+import bisect
+import contextlib
+import logging
+import uuid
+from typing import Iterable, Iterator, Sequence
+
+from app.api.phrases.repository import PhrasesRepository
+from app.core.database import sessionmanager
+
+logger = logging.getLogger(__name__)
+
+# Sentence separator produced by `normalize_phrase_text`, it's too common to be indexed
+SENTENCE_SEPARATOR_TOKEN = "."  # noqa: S105
+
+# The index isn't compacted until it has this many documents
+MIN_DOCUMENTS_TO_COMPACT = 1024
+
+# Name of the messages with the index changes sent to the other workers, see `TwoTierCacheBackend.publish`
+PHRASES_SEARCH_INDEX_CHANGES_MESSAGE = "phrases-search-index-changes"
+
+# ["add", phrase_id, movie_id, normalized_text], ["remove", phrase_id] or ["remove_by_movie_id", movie_id].
+# The ids are strings, so the changes can be sent to the other workers as JSON.
+PhrasesSearchIndexChange = Sequence[str]
+
+
+class PhrasesSearchIndex:
+    """
+    In-memory inverted index of `PhraseModel.normalized_text` used by the substring search.
+
+    Every phrase gets an internal document number, tokens are mapped to posting lists of
+    these numbers. Numbers only grow, so posting lists stay sorted by appending to them.
+    Removed or updated phrases are tombstoned and dropped on the next compaction.
+
+    The index is kept per worker: the changes recorded by `record_changes` are sent to the other workers,
+    they `apply` them. The periodic reload (see `refresh_phrases_search_index`) picks up the changes
+    made outside of the API or lost by the workers.
+    """
+
+    def __init__(self) -> None:
+        self.is_loaded = False
+        self._phrase_ids: list[uuid.UUID | None] = []
+        self._movie_ids: list[uuid.UUID | None] = []
+        self._texts: list[str | None] = []
+        self._doc_numbers: dict[uuid.UUID, int] = {}
+        self._postings: dict[str, array.array[int]] = {}
+        # Lists of `record_changes` blocks that are running
+        self._recorded_changes: list[list[PhrasesSearchIndexChange]] = []
+
+    def __len__(self) -> int:
+        return len(self._doc_numbers)
+
+    def load(self, phrases: Iterable[tuple[uuid.UUID, uuid.UUID, str]]) -> None:
+        """
+        Replaces the index content with `(phrase_id, movie_id, normalized_text)` rows
+        """
+        self.replace(self.build(phrases))
+
+    @staticmethod
+    def build(phrases: Iterable[tuple[uuid.UUID, uuid.UUID, str]]) -> "PhrasesSearchIndex":
+        """
+        Returns a new index of `(phrase_id, movie_id, normalized_text)` rows. It can be built in a thread
+        while the current index serves the searches.
+        """
+        index = PhrasesSearchIndex()
+
+        for phrase_id, movie_id, normalized_text in phrases:
+            index.add(phrase_id, movie_id, normalized_text)
+
+        return index
+
+    def replace(self, index: "PhrasesSearchIndex") -> None:
+        """
+        Replaces the index content with the content of the built `index`
+        """
+        self._swap(index)
+        self.is_loaded = True
+
+    @contextlib.contextmanager
+    def record_changes(self) -> Iterator[list[PhrasesSearchIndexChange]]:
+        """
+        Collects the changes made until the block exits, e.g. to `apply` them to the other indexes
+        """
+        changes: list[PhrasesSearchIndexChange] = []
+        self._recorded_changes.append(changes)
+
+        try:
+            yield changes
+        finally:
+            self._recorded_changes.remove(changes)
+
+    def apply(self, changes: Iterable[PhrasesSearchIndexChange]) -> None:
+        for action, *args in changes:
+            if action == "add":
+                phrase_id, movie_id, normalized_text = args
+                self.add(uuid.UUID(phrase_id), uuid.UUID(movie_id), normalized_text)
+            elif action == "remove":
+                self.remove(uuid.UUID(args[0]))
+            elif action == "remove_by_movie_id":
+                self.remove_by_movie_id(uuid.UUID(args[0]))
+            else:
+                raise ValueError(f"Unknown phrases search index change: {action}")
+
+    def _swap(self, index: "PhrasesSearchIndex") -> None:
+        self._phrase_ids = index._phrase_ids
+        self._movie_ids = index._movie_ids
+        self._texts = index._texts
+        self._doc_numbers = index._doc_numbers
+        self._postings = index._postings
+
+    def add(self, phrase_id: uuid.UUID, movie_id: uuid.UUID, normalized_text: str) -> None:
+        """
+        Adds the phrase or replaces it if it's already indexed
+        """
+        self._record_change("add", str(phrase_id), str(movie_id), normalized_text)
+        self._remove(phrase_id)
+
+        doc_number = len(self._phrase_ids)
+        text = normalized_text.lower()
+
+        self._phrase_ids.append(phrase_id)
+        self._movie_ids.append(movie_id)
+        self._texts.append(text)
+        self._doc_numbers[phrase_id] = doc_number
+
+        for token in set(text.split()):
+            if token == SENTENCE_SEPARATOR_TOKEN:
+                continue
+
+            posting_list = self._postings.get(token)
+
+            if posting_list is None:
+                posting_list = self._postings[token] = array.array("I")
+
+            posting_list.append(doc_number)
+
+    def remove(self, phrase_id: uuid.UUID) -> None:
+        self._record_change("remove", str(phrase_id))
+        self._remove(phrase_id)
+
+    def _remove(self, phrase_id: uuid.UUID) -> None:
+        doc_number = self._doc_numbers.pop(phrase_id, None)
+
+        if doc_number is None:
+            return
+
+        self._phrase_ids[doc_number] = None
+        self._movie_ids[doc_number] = None
+        self._texts[doc_number] = None
+
+        self._compact_if_needed()
+
+    def remove_by_movie_id(self, movie_id: uuid.UUID) -> None:
+        self._record_change("remove_by_movie_id", str(movie_id))
+        phrase_ids = [
+            phrase_id
+            for phrase_id, phrase_movie_id in zip(self._phrase_ids, self._movie_ids)
+            if phrase_id is not None and phrase_movie_id == movie_id
+        ]
+
+        for phrase_id in phrase_ids:
+            self._remove(phrase_id)
+
+    def _record_change(self, *change: str) -> None:
+        for changes in self._recorded_changes:
+            changes.append(change)
+
+    def search(self, normalized_search_text: str, page: int, size: int) -> tuple[Sequence[uuid.UUID], int] | None:
+        """
+        Returns ids of the phrases on the page and the total number of matches.
+        Returns None if the search text can't be served by the index (e.g. it has only punctuation).
+        """
+        tokens = {token for token in normalized_search_text.split() if token != SENTENCE_SEPARATOR_TOKEN}
+
+        if not tokens:
+            return None
+
+        posting_lists = []
+
+        for token in tokens:
+            posting_list = self._postings.get(token)
+
+            if not posting_list:
+                return [], 0
+
+            posting_lists.append(posting_list)
+
+        posting_lists.sort(key=len)
+        search_text = normalized_search_text.lower()
+
+        # Position check: tokens must go one after another as in the search text
+        matches = [
+            doc_number
+            for doc_number in self._intersect(posting_lists)
+            if (text := self._texts[doc_number]) is not None and search_text in text
+        ]
+
+        offset = (page - 1) * size
+        phrase_ids = [self._phrase_ids[doc_number] for doc_number in matches[offset : offset + size]]
+
+        return [phrase_id for phrase_id in phrase_ids if phrase_id is not None], len(matches)
+
+    @staticmethod
+    def _intersect(posting_lists: Sequence[Sequence[int]]) -> list[int]:
+        """
+        Intersects sorted posting lists, the shortest one must go first
+        """
+        result = list(posting_lists[0])
+
+        for posting_list in posting_lists[1:]:
+            intersection = []
+            low = 0
+            high = len(posting_list)
+
+            for doc_number in result:
+                low = bisect.bisect_left(posting_list, doc_number, low, high)
+
+                if low == high:
+                    break
+
+                if posting_list[low] == doc_number:
+                    intersection.append(doc_number)
+
+            result = intersection
+
+            if not result:
+                break
+
+        return result
+
+    def _compact_if_needed(self) -> None:
+        """
+        Rebuilds the index when most of the documents are tombstones
+        """
+        if len(self._phrase_ids) < MIN_DOCUMENTS_TO_COMPACT or len(self._doc_numbers) * 2 > len(self._phrase_ids):
+            return
+
+        self._swap(
+            self.build(
+                (phrase_id, movie_id, text)
+                for phrase_id, movie_id, text in zip(self._phrase_ids, self._movie_ids, self._texts)
+                if phrase_id is not None and movie_id is not None and text is not None
+            ),
+        )
+
+
+async def load_phrases_search_index(search_index: PhrasesSearchIndex) -> None:
+    # The rows can be read before the changes made while the new index is built, so they are applied to it
+    with search_index.record_changes() as changes:
+        async with sessionmanager.session() as session:
+            phrases = await PhrasesRepository(session).get_all_for_search_index()
+
+        # Searches are served by the current index until the new one is built off the event loop
+        index = await asyncio.to_thread(PhrasesSearchIndex.build, phrases)
+        index.apply(changes)
+        search_index.replace(index)
+
+    logger.info("Phrases search index is loaded: %s phrases", len(search_index))
+
+
+async def refresh_phrases_search_index(search_index: PhrasesSearchIndex, interval: int) -> None:
+    """
+    Reloads the index every `interval` seconds, so changes made by the other workers become visible
+    """
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            await load_phrases_search_index(search_index)
+        except Exception:
+            logger.exception("Failed to reload phrases search index")
+
+
+phrases_search_index = PhrasesSearchIndex()
@@ -1,22 +1,41 @@
+import asyncio
+import math
 import os
 import uuid
-from typing import Sequence
+from typing import Mapping, Sequence
 
 import srt
+from fastapi_pagination import Page, Params
 
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
 from app.api.phrases.repository import PhrasesRepository
 from app.api.phrases.schemas import (
+    CursorPaginatedPhrasesBySearchTextSchema,
     PaginatedPhrasesBySearchTextSchema,
     PhraseBySearchTextSchema,
     PhraseCreateSchema,
     PhraseIssueCreateSchema,
+    PhraseSearchFiltersSchema,
+    PhrasesSearchQuerySchema,
     PhraseTransferSchema,
     PhraseUpdateSchema,
 )
-from app.api.phrases.utils import get_matched_phrase, normalize_phrase_text
+from app.api.phrases.search_index import (
+    PHRASES_SEARCH_INDEX_CHANGES_MESSAGE,
+    PhrasesSearchIndex,
+    PhrasesSearchIndexChange,
+)
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
+from app.api.phrases.utils import (
+    decode_search_cursor,
+    encode_search_cursor,
+    find_matched_phrase,
+    normalize_search_text,
+)
+from app.core.cache import PHRASES_SEARCH_CACHE_NAMESPACE, TwoTierCacheBackend
 from app.core.config import settings
-from app.s3.presigned_url_service import PresignedURLService
+from app.core.constants import PhraseSearchCount, PhraseSearchMode
+from app.core.database import sessionmanager
 from app.s3.s3_service import S3Service
 
 
@@ -25,26 +44,46 @@ class PhrasesService:
         self,
         repository: PhrasesRepository,
         s3_service: S3Service,
-        presigned_url_service: PresignedURLService,
+        search_index: PhrasesSearchIndex | None = None,
+        cache_backend: TwoTierCacheBackend | None = None,
+        suggest_index: PhrasesSuggestIndex | None = None,
     ) -> None:
         self.repository = repository
         self.s3_service = s3_service
-        self.presigned_url_service = presigned_url_service
+        self.search_index = search_index
+        self.cache_backend = cache_backend
+        self.suggest_index = suggest_index
+
+    def with_repository(self, repository: PhrasesRepository) -> "PhrasesService":
+        """
+        Returns the same service using `repository`, e.g. of a DB session that outlives the request
+        """
+        return PhrasesService(
+            repository,
+            self.s3_service,
+            search_index=self.search_index,
+            cache_backend=self.cache_backend,
+            suggest_index=self.suggest_index,
+        )
 
     async def get_all(self) -> Sequence[PhraseModel]:
-        phrases = await self.repository.get_all()
-        await self.presigned_url_service.update_s3_urls_for_models(phrases, "scene_s3_key")
-
-        return phrases
+        return await self.repository.get_all()
 
     async def get_by_id(self, phrase_id: uuid.UUID) -> PhraseModel:
-        phrase = await self.repository.get_by_id(phrase_id)
-        await self.presigned_url_service.update_s3_url_for_model(phrase, "scene_s3_key")
-
-        return phrase
+        return await self.repository.get_by_id(phrase_id)
 
     async def delete(self, phrase_id: uuid.UUID) -> None:
-        scene_s3_key = await self.repository.delete(phrase_id)
+        _, scene_s3_key, indexed_text = await self.repository.delete(phrase_id)
+        search_index_changes: list[PhrasesSearchIndexChange] = []
+
+        if self.search_index is not None:
+            with self.search_index.record_changes() as search_index_changes:
+                self.search_index.remove(phrase_id)
+
+        if self.suggest_index is not None and indexed_text is not None:
+            self.suggest_index.remove([indexed_text])
+
+        await self._invalidate_search_cache(search_index_changes)
 
         if scene_s3_key:
             await self.s3_service.delete_object(scene_s3_key)
@@ -54,53 +93,249 @@ class PhrasesService:
 
     async def create(self, data: PhraseCreateSchema) -> PhraseModel:
         phrase = await self.repository.create(data)
-        await self.presigned_url_service.update_s3_url_for_model(phrase, "scene_s3_key")
+        search_index_changes = self._update_indexes([phrase])
+
+        await self._invalidate_search_cache(search_index_changes)
 
         return phrase
 
     async def update(self, phrase_id: uuid.UUID, data: PhraseUpdateSchema) -> PhraseModel:
-        phrase = await self.repository.update(phrase_id, data)
-        await self.presigned_url_service.update_s3_url_for_model(phrase, "scene_s3_key")
+        """
+        Phrases become public by the update, e.g. the ingested ones are activated when their scenes are uploaded
+        """
+        phrases = await self.bulk_update({phrase_id: data})
 
-        return phrase
+        return phrases[0]
 
-    async def get_by_movie_id(self, movie_id: uuid.UUID, presign_urls: bool = True) -> Sequence[PhraseModel]:
-        phrases = await self.repository.get_by_movie_id(movie_id)
+    async def bulk_update(self, data: Mapping[uuid.UUID, PhraseUpdateSchema]) -> Sequence[PhraseModel]:
+        """
+        Phrases are updated one by one, the DB session can't run queries concurrently.
+        The indexes and the cached search results are updated once for all of them.
+        """
+        results = [await self.repository.update(phrase_id, phrase_data) for phrase_id, phrase_data in data.items()]
+        phrases = [phrase for phrase, _ in results]
+        indexed_texts = [indexed_text for _, indexed_text in results if indexed_text is not None]
+        search_index_changes = self._update_indexes(phrases, indexed_texts)
 
-        if presign_urls:
-            await self.presigned_url_service.update_s3_urls_for_models(phrases, "scene_s3_key")
+        await self._invalidate_search_cache(search_index_changes)
 
         return phrases
 
+    async def get_by_movie_id(self, movie_id: uuid.UUID) -> Sequence[PhraseModel]:
+        return await self.repository.get_by_movie_id(movie_id)
+
     async def bulk_create(self, data: Sequence[PhraseCreateSchema]) -> Sequence[PhraseModel]:
         phrases = await self.repository.bulk_create(data)
-        await self.presigned_url_service.update_s3_urls_for_models(phrases, "scene_s3_key")
+        search_index_changes = self._update_indexes(phrases)
+
+        await self._invalidate_search_cache(search_index_changes)
+
         return phrases
 
-    async def get_by_search_text(self, search_text: str, page: int) -> PaginatedPhrasesBySearchTextSchema:
-        normalized_search_text = normalize_phrase_text(search_text)
-        phrases_from_db = await self.repository.get_by_search_text(normalized_search_text, page)
+    async def get_by_search_text(
+        self,
+        search_text: str,
+        page: int,
+        mode: PhraseSearchMode = PhraseSearchMode.SUBSTRING,
+        count: PhraseSearchCount = PhraseSearchCount.EXACT,
+        filters: PhraseSearchFiltersSchema | None = None,
+    ) -> PaginatedPhrasesBySearchTextSchema:
+        return await self._search_by_text(search_text, page, mode, count, filters)
+
+    async def get_by_search_texts(
+        self,
+        queries: Sequence[PhrasesSearchQuerySchema],
+    ) -> list[PaginatedPhrasesBySearchTextSchema]:
+        """
+        Runs the searches concurrently, at most `phrases_search_batch_concurrency` at once. Every search gets
+        its own DB session, because a session can't run queries concurrently. Repeated queries are run once.
+        If a search fails, the other ones are cancelled.
+        """
+        semaphore = asyncio.Semaphore(settings.phrases_search_batch_concurrency)
+
+        async def search(query: PhrasesSearchQuerySchema) -> PaginatedPhrasesBySearchTextSchema:
+            async with semaphore, sessionmanager.session() as session:
+                return await self.with_repository(PhrasesRepository(session))._search_by_text(
+                    query.search_text,
+                    query.page,
+                    query.mode,
+                    query.count,
+                    query.filters,
+                )
+
+        async with asyncio.TaskGroup() as task_group:
+            tasks = {query: task_group.create_task(search(query)) for query in dict.fromkeys(queries)}
 
-        phrases = PaginatedPhrasesBySearchTextSchema(
-            items=[
-                PhraseBySearchTextSchema(
-                    **phrase.__dict__,
-                    matched_phrase=get_matched_phrase(normalized_search_text, phrase.full_text),
+        return [tasks[query].result() for query in queries]
+
+    async def _search_by_text(
+        self,
+        search_text: str,
+        page: int,
+        mode: PhraseSearchMode,
+        count: PhraseSearchCount,
+        filters: PhraseSearchFiltersSchema | None,
+    ) -> PaginatedPhrasesBySearchTextSchema:
+        normalized_search_text = normalize_search_text(search_text)
+        phrases_from_index = None
+
+        if mode == PhraseSearchMode.FULL_TEXT:
+            phrases_from_db = await self.repository.get_by_full_text_search(search_text, page, count, filters)
+        elif mode == PhraseSearchMode.FUZZY:
+            phrases_from_db = await self.repository.get_by_fuzzy_search(
+                normalized_search_text.strip(),
+                page,
+                count,
+                filters,
+            )
+        else:
+            # The search index doesn't know the filtered fields
+            if filters is None or filters.is_empty:
+                phrases_from_index = await self._get_by_search_text_from_index(normalized_search_text, page)
+
+            if phrases_from_index is not None:
+                phrases_from_db = phrases_from_index
+            else:
+                phrases_from_db = await self.repository.get_by_search_text(
+                    normalized_search_text,
+                    page,
+                    count,
+                    filters,
                 )
-                for phrase in phrases_from_db.items
-            ],
-            total=phrases_from_db.total,
-            page=phrases_from_db.page,
-            size=phrases_from_db.size,
-            pages=phrases_from_db.pages,
+
+        size = settings.phrases_page_size
+        total = phrases_from_db.total or 0
+        has_more = total > page * size
+
+        # The search index always knows the exact total, the DB counts all matches only with `count=exact`
+        is_total_exact = count == PhraseSearchCount.EXACT or phrases_from_index is not None
+
+        if not is_total_exact:
+            # The DB counts no more than `count_limit` + 1 matches, anything less is the exact total
+            count_limit = max(settings.phrases_search_count_cap, page * size)
+            is_total_exact = total <= count_limit
+            total = min(total, count_limit)
+
+        phrases = PaginatedPhrasesBySearchTextSchema(
+            items=self._get_phrases_by_search_text_items(normalized_search_text, phrases_from_db.items),
+            total=total,
+            page=page,
+            size=size,
+            pages=math.ceil(total / size),
+            has_more=has_more,
+            is_total_exact=is_total_exact,
         )
 
-        await self.presigned_url_service.update_s3_urls_for_models(phrases.items, "scene_s3_key")
+        if count == PhraseSearchCount.NONE:
+            phrases.total = phrases.pages = None
+            phrases.is_total_exact = False
+
         return phrases
 
+    async def get_by_search_text_cursor(
+        self,
+        search_text: str,
+        cursor: str | None = None,
+        filters: PhraseSearchFiltersSchema | None = None,
+    ) -> CursorPaginatedPhrasesBySearchTextSchema:
+        """
+        Keyset pagination: no OFFSET and no COUNT, so every page costs the same
+        """
+        normalized_search_text = normalize_search_text(search_text)
+        size = settings.phrases_page_size
+        after = decode_search_cursor(cursor) if cursor else None
+
+        # One extra phrase shows if there is the next page
+        phrases_from_db = await self.repository.get_by_search_text_after(
+            normalized_search_text,
+            after,
+            size + 1,
+            filters,
+        )
+        phrases_on_page = phrases_from_db[:size]
+
+        return CursorPaginatedPhrasesBySearchTextSchema(
+            items=self._get_phrases_by_search_text_items(normalized_search_text, phrases_on_page),
+            size=size,
+            next_cursor=encode_search_cursor(phrases_on_page[-1]) if len(phrases_from_db) > size else None,
+        )
+
+    async def suggest(self, prefix: str, limit: int) -> Sequence[str]:
+        """
+        Returns the most frequent word n-grams starting with `prefix`.
+        Nothing is suggested until the suggest index is loaded.
+        """
+        if self.suggest_index is None or not self.suggest_index.is_loaded:
+            return []
+
+        normalized_prefix = normalize_search_text(prefix).strip()
+
+        # The last word is complete, only the next words are suggested
+        if normalized_prefix and prefix[-1].isspace():
+            normalized_prefix += " "
+
+        return self.suggest_index.suggest(normalized_prefix, limit)
+
+    def _get_phrases_by_search_text_items(
+        self,
+        normalized_search_text: str,
+        phrases: Sequence[PhraseModel],
+    ) -> list[PhraseBySearchTextSchema]:
+        items = []
+
+        for phrase in phrases:
+            matched_phrase = find_matched_phrase(
+                normalized_search_text,
+                phrase.full_text,
+                phrase.normalized_text,
+                phrase.normalized_offsets,
+            )
+
+            items.append(
+                PhraseBySearchTextSchema(
+                    **phrase.__dict__,
+                    matched_phrase=matched_phrase.text if matched_phrase else "",
+                    matched_phrase_span=(matched_phrase.start, matched_phrase.end) if matched_phrase else None,
+                ),
+            )
+
+        return items
+
+    async def _get_by_search_text_from_index(
+        self,
+        normalized_search_text: str,
+        page: int,
+    ) -> Page[PhraseModel] | None:
+        """
+        Finds the page of phrases ids in the search index, so only these phrases are fetched from the DB.
+        Returns None if there is no index or it can't serve the search text.
+        """
+        if self.search_index is None or not self.search_index.is_loaded:
+            return None
+
+        params = Params(page=page, size=settings.phrases_page_size)
+        search_result = self.search_index.search(normalized_search_text, params.page, params.size)
+
+        if search_result is None:
+            return None
+
+        phrase_ids, total = search_result
+        phrases = await self.repository.get_by_ids(phrase_ids) if phrase_ids else []
+
+        return Page.create(phrases, params, total=total)
+
     async def delete_by_movie_id(self, movie_id: uuid.UUID) -> None:
-        await self.repository.delete_by_movie_id(movie_id)
+        indexed_texts = await self.repository.delete_by_movie_id(movie_id)
+        search_index_changes: list[PhrasesSearchIndexChange] = []
+
+        if self.search_index is not None:
+            with self.search_index.record_changes() as search_index_changes:
+                self.search_index.remove_by_movie_id(movie_id)
+
+        if self.suggest_index is not None:
+            self.suggest_index.remove(indexed_texts)
 
+        await self._invalidate_search_cache(search_index_changes)
         movie_s3_path = os.path.join(settings.movies_s3_path, str(movie_id))
 
         await self.s3_service.delete_folder(movie_s3_path)
@@ -109,7 +344,58 @@ class PhrasesService:
         return await self.repository.get_for_export(movie_id, has_issues)
 
     async def import_from_json(self, movie_id: uuid.UUID, data: Sequence[PhraseTransferSchema]) -> None:
-        await self.repository.import_from_json(movie_id, data)
+        phrases = await self.repository.import_from_json(movie_id, data)
+        search_index_changes = self._update_indexes(phrases)
+
+        await self._invalidate_search_cache(search_index_changes)
+
+    def _update_indexes(
+        self,
+        phrases: Sequence[PhraseModel],
+        indexed_texts: Sequence[str] = (),
+    ) -> Sequence[PhrasesSearchIndexChange]:
+        """
+        The indexes keep only the public phrases, like the DB search indexes.
+        The suggest index counts n-grams, not phrases: `indexed_texts` are the texts it had before the write.
+        Returns the changes of the search index.
+        """
+        search_index_changes: list[PhrasesSearchIndexChange] = []
+
+        if self.search_index is not None:
+            with self.search_index.record_changes() as search_index_changes:
+                for phrase in phrases:
+                    if self._is_public(phrase):
+                        self.search_index.add(phrase.id, phrase.movie_id, phrase.normalized_text)
+                    else:
+                        self.search_index.remove(phrase.id)
+
+        public_texts = [phrase.normalized_text for phrase in phrases if self._is_public(phrase)]
+
+        if self.suggest_index is not None and public_texts != list(indexed_texts):
+            self.suggest_index.remove(indexed_texts)
+            self.suggest_index.add(public_texts)
+
+        return search_index_changes
+
+    @staticmethod
+    def _is_public(phrase: PhraseModel) -> bool:
+        return phrase.is_active and phrase.is_movie_active
+
+    async def _invalidate_search_cache(self, search_index_changes: Sequence[PhrasesSearchIndexChange]) -> None:
+        """
+        Any write can change the results of any search: new phrases can match it
+        and deleted ones shift the following pages of the results they were in.
+
+        The other workers apply `search_index_changes` before they get the invalidation,
+        so they don't cache the results of their outdated search indexes.
+        """
+        if self.cache_backend is None:
+            return
+
+        if search_index_changes:
+            await self.cache_backend.publish(PHRASES_SEARCH_INDEX_CHANGES_MESSAGE, search_index_changes)
+
+        await self.cache_backend.clear_namespace(PHRASES_SEARCH_CACHE_NAMESPACE)
 
     async def issue_exists(self, issue_id: uuid.UUID) -> bool:
         return await self.repository.issue_exists(issue_id)
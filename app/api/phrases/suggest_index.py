@@ -0,0 +1,256 @@
+import asyncio
+import bisect
+import heapq
+import itertools
+import logging
+from typing import Iterable, Sequence
+
+from app.api.phrases.repository import PhrasesRepository
+from app.api.phrases.search_index import SENTENCE_SEPARATOR_TOKEN
+from app.core.config import settings
+from app.core.database import sessionmanager
+
+logger = logging.getLogger(__name__)
+
+# Top completions of the prefixes matching at least this many n-grams are stored,
+# the completions of the other prefixes are ranked on every call
+MIN_NGRAMS_TO_STORE_TOP = 1024
+
+
+class PhrasesSuggestIndex:
+    """
+    Word n-grams of `PhraseModel.normalized_text` ranked by the number of phrases they occur in.
+
+    N-grams are kept in a sorted list, so completions of a prefix are a contiguous range found by binary search.
+    N-grams don't cross sentence separators. Top `max_limit` completions of the broad prefixes are precomputed
+    by `build` and kept up to date by `add`, so a suggestion never ranks a large range.
+
+    The index is kept per worker like `PhrasesSearchIndex`: `add` and `remove` pick up the phrases written by
+    this worker, the periodic reload (see `refresh_phrases_suggest_index`) picks up the rest.
+    """
+
+    def __init__(self, max_ngram_size: int = 3, max_limit: int = 20) -> None:
+        self.is_loaded = False
+        self.max_ngram_size = max_ngram_size
+        self.max_limit = max_limit
+        self._ngrams: list[str] = []
+        self._counts: dict[str, int] = {}
+        # prefix -> top `max_limit` n-grams starting with it, the most frequent first
+        self._top_ngrams: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._ngrams)
+
+    def load(self, normalized_texts: Iterable[str]) -> None:
+        """
+        Replaces the index content
+        """
+        self.replace(self.build(normalized_texts))
+
+    def build(self, normalized_texts: Iterable[str]) -> "PhrasesSuggestIndex":
+        """
+        Returns a new index of `normalized_texts` with the same settings. This index isn't used,
+        so the new one can be built in a thread while this one serves the suggestions.
+        """
+        index = PhrasesSuggestIndex(self.max_ngram_size, self.max_limit)
+
+        for normalized_text in normalized_texts:
+            for ngram in index._get_ngrams(normalized_text):
+                index._counts[ngram] = index._counts.get(ngram, 0) + 1
+
+        index._ngrams = sorted(index._counts)
+        index._store_top_ngrams("", 0, len(index._ngrams))
+
+        return index
+
+    def replace(self, index: "PhrasesSuggestIndex") -> None:
+        """
+        Replaces the index content with the content of the built `index`
+        """
+        self._ngrams = index._ngrams
+        self._counts = index._counts
+        self._top_ngrams = index._top_ngrams
+        self.is_loaded = True
+
+    def add(self, normalized_texts: Iterable[str]) -> None:
+        new_ngrams = []
+        updated_ngrams = set()
+
+        for normalized_text in normalized_texts:
+            for ngram in self._get_ngrams(normalized_text):
+                count = self._counts.get(ngram)
+
+                if count is None:
+                    new_ngrams.append(ngram)
+
+                self._counts[ngram] = (count or 0) + 1
+                updated_ngrams.add(ngram)
+
+        # A write adds a few n-grams, inserting them is cheaper than sorting the whole list on the event loop
+        for ngram in new_ngrams:
+            bisect.insort(self._ngrams, ngram)
+
+        # Counts only grow, so the updated n-grams can only move up in the stored tops
+        for ngram in updated_ngrams:
+            for size in range(1, len(ngram) + 1):
+                top_ngrams = self._top_ngrams.get(ngram[:size])
+
+                if top_ngrams is not None:
+                    self._update_top_ngrams(top_ngrams, ngram)
+
+    def remove(self, normalized_texts: Iterable[str]) -> None:
+        """
+        Removes the texts added before, e.g. of the deleted or hidden phrases
+        """
+        removed_ngrams = set()
+        updated_ngrams = set()
+
+        for normalized_text in normalized_texts:
+            for ngram in self._get_ngrams(normalized_text):
+                count = self._counts.get(ngram)
+
+                # The text was added before the index was loaded
+                if count is None:
+                    continue
+
+                if count > 1:
+                    self._counts[ngram] = count - 1
+                else:
+                    del self._counts[ngram]
+                    removed_ngrams.add(ngram)
+
+                updated_ngrams.add(ngram)
+
+        for ngram in removed_ngrams:
+            del self._ngrams[bisect.bisect_left(self._ngrams, ngram)]
+
+        # The n-grams that take the place of the updated ones are unknown, these tops are recomputed by `suggest`
+        for ngram in updated_ngrams:
+            for size in range(1, len(ngram) + 1):
+                top_ngrams = self._top_ngrams.get(ngram[:size])
+
+                if top_ngrams is not None and ngram in top_ngrams:
+                    del self._top_ngrams[ngram[:size]]
+
+    def suggest(self, prefix: str, limit: int) -> Sequence[str]:
+        """
+        Returns up to `limit` n-grams starting with `prefix`, the most frequent first.
+        `prefix` must be normalized the same way as the indexed texts.
+        """
+        if not prefix:
+            return []
+
+        top_ngrams = self._top_ngrams.get(prefix)
+
+        if top_ngrams is not None and limit <= self.max_limit:
+            return top_ngrams[:limit]
+
+        low = bisect.bisect_left(self._ngrams, prefix)
+        high = bisect.bisect_left(self._ngrams, self._get_prefix_end(prefix), low)
+
+        if high - low < MIN_NGRAMS_TO_STORE_TOP or limit > self.max_limit:
+            return self._get_top_ngrams(low, high, limit)
+
+        # The prefix has become broad after `add` or its top is outdated after `remove`
+        top_ngrams = self._top_ngrams[prefix] = self._get_top_ngrams(low, high, self.max_limit)
+
+        return top_ngrams[:limit]
+
+    def _store_top_ngrams(self, prefix: str, low: int, high: int) -> list[str]:
+        """
+        Returns top n-grams of the `prefix` range. Tops of the broad prefixes are stored,
+        they are merged from the tops of the longer prefixes, so every n-gram is ranked once.
+        """
+        if high - low < MIN_NGRAMS_TO_STORE_TOP:
+            return self._get_top_ngrams(low, high, self.max_limit)
+
+        candidates = []
+
+        # The n-gram equal to the prefix goes first
+        if len(self._ngrams[low]) == len(prefix):
+            candidates.append(self._ngrams[low])
+            low += 1
+
+        while low < high:
+            longer_prefix = self._ngrams[low][: len(prefix) + 1]
+            longer_prefix_high = bisect.bisect_left(self._ngrams, self._get_prefix_end(longer_prefix), low, high)
+            candidates.extend(self._store_top_ngrams(longer_prefix, low, longer_prefix_high))
+            low = longer_prefix_high
+
+        top_ngrams = heapq.nsmallest(self.max_limit, candidates, key=self._get_rank)
+
+        if prefix:
+            self._top_ngrams[prefix] = top_ngrams
+
+        return top_ngrams
+
+    def _update_top_ngrams(self, top_ngrams: list[str], ngram: str) -> None:
+        if ngram in top_ngrams:
+            top_ngrams.remove(ngram)
+        elif len(top_ngrams) >= self.max_limit and self._get_rank(ngram) > self._get_rank(top_ngrams[-1]):
+            return
+
+        bisect.insort(top_ngrams, ngram, key=self._get_rank)
+        del top_ngrams[self.max_limit :]
+
+    def _get_top_ngrams(self, low: int, high: int, limit: int) -> list[str]:
+        return heapq.nsmallest(limit, self._ngrams[low:high], key=self._get_rank)
+
+    def _get_rank(self, ngram: str) -> tuple[int, str]:
+        return -self._counts[ngram], ngram
+
+    @staticmethod
+    def _get_prefix_end(prefix: str) -> str:
+        """
+        Returns the first string greater than all the strings starting with `prefix`
+        """
+        return prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+    def _get_ngrams(self, normalized_text: str) -> set[str]:
+        """
+        Returns distinct n-grams, so every phrase is counted once
+        """
+        ngrams = set()
+        words: list[str] = []
+
+        for token in itertools.chain(normalized_text.lower().split(), [SENTENCE_SEPARATOR_TOKEN]):
+            if token != SENTENCE_SEPARATOR_TOKEN:
+                words.append(token)
+                continue
+
+            for size in range(1, self.max_ngram_size + 1):
+                for start in range(len(words) - size + 1):
+                    ngrams.add(" ".join(words[start : start + size]))
+
+            words = []
+
+        return ngrams
+
+
+async def load_phrases_suggest_index(suggest_index: PhrasesSuggestIndex) -> None:
+    async with sessionmanager.session() as session:
+        normalized_texts = await PhrasesRepository(session).get_all_for_suggest_index()
+
+    # Building takes seconds for a large catalog, the event loop keeps serving the requests meanwhile
+    index = await asyncio.to_thread(suggest_index.build, normalized_texts)
+    suggest_index.replace(index)
+    logger.info("Phrases suggest index is loaded: %s n-grams", len(suggest_index))
+
+
+async def refresh_phrases_suggest_index(suggest_index: PhrasesSuggestIndex, interval: int) -> None:
+    """
+    Reloads the index every `interval` seconds, so changes made by the other workers become visible
+    """
+    while True:
+        await asyncio.sleep(interval)
+
+        try:
+            await load_phrases_suggest_index(suggest_index)
+        except Exception:
+            logger.exception("Failed to reload phrases suggest index")
+
+
+phrases_suggest_index = PhrasesSuggestIndex(
+    settings.phrases_suggest_max_ngram_size,
+    settings.phrases_suggest_max_limit,
+)
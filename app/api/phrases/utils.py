@@ -1,42 +1,63 @@
+import base64
 import datetime
+import functools
+import hashlib
+import hmac
 import os
 import re
+import uuid
 from pathlib import Path
+from typing import Iterable, NamedTuple, Sequence
 
 from app.api.phrases.models import PhraseModel
+from app.core.config import settings
+
+# Punctuation that splits words becomes a space, ?! become the sentence separator "." like the dot
+_NORMALIZE_TRANSLATION_TABLE = str.maketrans(
+    dict.fromkeys('#$%&()*+,/:;<=>@[]^\\_`{|}~-"', " ") | dict.fromkeys("?!", "."),
+)
+# Separators with the spaces around them (if not taken by the previous separator)
+_NORMALIZE_SEPARATOR_PATTERN = re.compile(r" ?\.+ ?")
+
+# `get_scene` path, the router is included with the "/api" prefix
+SCENES_URL_PATH = "/api/phrases/scenes/"
+# Bytes of HMAC-SHA256 kept in the scene tokens
+SCENE_SIGNATURE_SIZE = 16
+
+# `format_duration` output, printf-style formatting is faster than f-string with format specs
+_DURATION_FORMAT = "%02d:%02d:%02d.%03d"
+
+# Search texts repeat a lot, so their normalized versions are kept
+NORMALIZED_SEARCH_TEXTS_CACHE_SIZE = 4096
 
 
 def normalize_phrase_text(phrase: str) -> str:
-    # Step 1
-    # Replacing \n with space
-    phrase = phrase.replace("\\n", " ")
+    """
+    Lowercase words separated by single spaces, every run of ?!. becomes the " . " sentence separator,
+    e.g. "Hello, there! How are you?" -> " hello there . how are you . ".
+    Words are surrounded with spaces, so searching for "hat" doesn't match "that".
 
-    # Step 2
-    # Replacing with space: #$%&()*+,/:;<=>@[\\]^_`{|}~"
-    punctuations_to_replace_with_space = r'[\#\$%&()*+,/:;<=>@\[\]^\\_`{|}~\-"]'
-    phrase = re.sub(punctuations_to_replace_with_space, " ", phrase)
+    Runs in a few C-level passes: literal "\\n" and punctuation are replaced, spaces are collapsed by
+    `split`, then one regex pass surrounds the separators with spaces.
+    """
+    phrase = " ".join(phrase.replace("\\n", " ").translate(_NORMALIZE_TRANSLATION_TABLE).lower().split())
 
-    # Step 3
-    # Replace ?!. with . if they are repeated
-    phrase = re.sub(r"[?!.]+", ". ", phrase)
+    return " " + _NORMALIZE_SEPARATOR_PATTERN.sub(" . ", phrase).strip() + " "
 
-    # Step 4
-    # Remove extra spaces
-    phrase = re.sub(r"\s+", " ", phrase)
 
-    # Step 5
-    # Temporary solution (or maybe permanent):
-    # make all words surrounded with spaces. It helps to avoid
-    # results like "that" when we search for "hat" etc.
-    phrase = re.sub(r"\s*\.\s*", " . ", phrase)
+def normalize_many(phrases: Iterable[str]) -> list[str]:
+    """
+    `normalize_phrase_text` for the batch, e.g. all lines of the subtitles file
+    """
+    return [normalize_phrase_text(phrase) for phrase in phrases]
 
-    # Step 6
-    # Make sentence lowercase and strip spaces
-    phrase = phrase.lower().strip()
 
-    # Step 7
-    # Add spaces on the left and right of the whole phrase
-    return " " + phrase + " "
+@functools.lru_cache(maxsize=NORMALIZED_SEARCH_TEXTS_CACHE_SIZE)
+def normalize_search_text(search_text: str) -> str:
+    """
+    Cached `normalize_phrase_text` for the search side
+    """
+    return normalize_phrase_text(search_text)
 
 
 def get_ffmpeg_trim_cmd_for_phrase(phrase: PhraseModel, movie_path: Path, output_dir: Path) -> str:
@@ -49,31 +70,119 @@ def get_ffmpeg_trim_cmd_for_phrase(phrase: PhraseModel, movie_path: Path, output
     return f"ffmpeg {start_arg} {end_arg} -i {movie_path} {output_path_arg}"
 
 
-def get_matched_phrase(normalized_search_text: str, full_text: str) -> str:
-    search_words = normalized_search_text.replace(" . ", " ").strip().split()
-    matched_phrase = None
+# Tokens of `normalize_phrase_text`: runs of ?!. become the "." token, the other punctuation splits words
+PHRASE_TOKEN_PATTERN = re.compile(r'[?!.]+|[^\s?!.\#\$%&()*+,/:;<=>@\[\]^\\_`{|}~\-"]+')
+
+
+class MatchedPhrase(NamedTuple):
+    start: int
+    end: int
+    text: str
+
+
+def tokenize_phrase_text(phrase: str) -> list[tuple[str, int, int]]:
+    """
+    Splits the phrase into the same tokens as `normalize_phrase_text(phrase).split()`,
+    but keeps (start, end) offsets of every token in the original phrase.
+    """
+    # Same length replacement keeps the offsets
+    phrase = phrase.replace("\\n", "  ")
+
+    return [
+        ("." if match.group()[0] in "?!." else match.group().lower(), match.start(), match.end())
+        for match in PHRASE_TOKEN_PATTERN.finditer(phrase)
+    ]
+
+
+def get_phrase_text_offsets(phrase: str) -> list[int]:
+    """
+    Packed offsets of the `normalize_phrase_text(phrase)` tokens in the phrase: [start_0, end_0, start_1, end_1, ...]
+    """
+    return [offset for _, start, end in tokenize_phrase_text(phrase) for offset in (start, end)]
+
+
+def find_matched_phrase(
+    normalized_search_text: str,
+    full_text: str,
+    normalized_text: str | None = None,
+    normalized_offsets: Sequence[int] | None = None,
+) -> MatchedPhrase | None:
+    """
+    Finds the words of the search text that go one after another in `full_text` (sentence separators are skipped).
+    Runs in O(len(full_text) + len(search text)): the words are compared as tokens with the KMP algorithm.
+
+    If the phrase has offsets precomputed by `get_phrase_text_offsets`, `full_text` isn't tokenized again:
+    tokens are taken from `normalized_text` and their offsets are looked up in `normalized_offsets`.
+    """
+    search_words = [word for word in normalized_search_text.split() if word != "."]
+    phrase_tokens = [
+        token for token in _get_phrase_tokens(full_text, normalized_text, normalized_offsets) if token[0] != "."
+    ]
+
+    if not search_words:
+        return None
+
+    # Prefix function of the search words
+    prefix = [0] * len(search_words)
+    matched_count = 0
+
+    for i in range(1, len(search_words)):
+        while matched_count and search_words[i] != search_words[matched_count]:
+            matched_count = prefix[matched_count - 1]
+
+        if search_words[i] == search_words[matched_count]:
+            matched_count += 1
+
+        prefix[i] = matched_count
+
+    matched_count = 0
+
+    for i, (word, _, end) in enumerate(phrase_tokens):
+        while matched_count and word != search_words[matched_count]:
+            matched_count = prefix[matched_count - 1]
+
+        if word == search_words[matched_count]:
+            matched_count += 1
+
+        if matched_count == len(search_words):
+            start = phrase_tokens[i - matched_count + 1][1]
+
+            return MatchedPhrase(start, end, full_text[start:end])
+
+    return None
+
+
+def _get_phrase_tokens(
+    full_text: str,
+    normalized_text: str | None,
+    normalized_offsets: Sequence[int] | None,
+) -> list[tuple[str, int, int]]:
+    if normalized_text is not None and normalized_offsets:
+        normalized_tokens = normalized_text.split()
+
+        # Offsets are out of date if the text was changed without them
+        if len(normalized_offsets) == 2 * len(normalized_tokens):
+            return [
+                (token, normalized_offsets[2 * i], normalized_offsets[2 * i + 1])
+                for i, token in enumerate(normalized_tokens)
+            ]
 
-    if len(search_words) == 1:
-        pattern = f"({search_words[0]})"
-        matched_phrase = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
-    elif len(search_words) > 1:
-        pattern = rf"({search_words[0]}"
+    return tokenize_phrase_text(full_text)
 
-        for word in search_words[1:]:
-            pattern += rf"[^\b{word}\b]*{word}"
 
-        pattern += ")"
-        matched_phrase = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
+def get_matched_phrase(normalized_search_text: str, full_text: str) -> str:
+    matched_phrase = find_matched_phrase(normalized_search_text, full_text)
 
-    return matched_phrase.group(1) if matched_phrase else ""
+    return matched_phrase.text if matched_phrase else ""
 
 
 def format_duration(duration: datetime.timedelta) -> str:
-    hours, remainder = divmod(duration.seconds, 3600)
-    minutes, seconds = divmod(remainder, 60)
-    milliseconds = duration.microseconds // 1000
+    """
+    "HH:MM:SS.mmm", days are dropped. Runs for every serialized phrase, so it's kept to one formatting call.
+    """
+    seconds = duration.seconds
 
-    return f"{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+    return _DURATION_FORMAT % (seconds // 3600, seconds // 60 % 60, seconds % 60, duration.microseconds // 1000)
 
 
 def parse_duration(duration_str: str) -> datetime.timedelta:
@@ -89,3 +198,89 @@ def parse_duration(duration_str: str) -> datetime.timedelta:
         seconds=int(seconds),
         milliseconds=int(milliseconds),
     )
+
+
+def encode_search_cursor(phrase: PhraseModel) -> str:
+    """
+    Opaque cursor that points to the phrase in the search results ordered by (movie_id, start_in_movie, id)
+    """
+    start_in_movie = phrase.start_in_movie // datetime.timedelta(microseconds=1)
+    raw_cursor = f"{phrase.movie_id.hex}:{start_in_movie}:{phrase.id.hex}"
+
+    return base64.urlsafe_b64encode(raw_cursor.encode()).decode().rstrip("=")
+
+
+def decode_search_cursor(cursor: str) -> tuple[uuid.UUID, datetime.timedelta, uuid.UUID]:
+    """
+    Raises ValueError if the cursor is invalid
+    """
+    try:
+        raw_cursor = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        movie_id, start_in_movie, phrase_id = raw_cursor.split(":")
+
+        return uuid.UUID(movie_id), datetime.timedelta(microseconds=int(start_in_movie)), uuid.UUID(phrase_id)
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def encode_scene_token(scene_s3_key: str) -> str:
+    """
+    Opaque token of the scene S3 key signed with the `scene_token_key_version` key, so only the keys given
+    by the API are presigned. The version goes first, so the key can be rotated, see `decode_scene_token`.
+    """
+    key_version = settings.scene_token_key_version
+    raw_key = scene_s3_key.encode()
+
+    return f"{key_version}.{_encode_base64(raw_key)}.{_encode_base64(_sign_scene_key(key_version, raw_key))}"
+
+
+def decode_scene_token(token: str) -> str:
+    """
+    Raises ValueError if the token is invalid, isn't signed by `encode_scene_token`
+    or its key version is out of `scene_token_min_key_version`..`scene_token_key_version`
+    """
+    try:
+        encoded_version, encoded_key, encoded_signature = token.split(".")
+        key_version = int(encoded_version)
+
+        if not settings.scene_token_min_key_version <= key_version <= settings.scene_token_key_version:
+            raise ValueError("Expired key version")
+
+        raw_key = _decode_base64(encoded_key)
+
+        if not hmac.compare_digest(_decode_base64(encoded_signature), _sign_scene_key(key_version, raw_key)):
+            raise ValueError("Invalid signature")
+
+        return raw_key.decode()
+    except ValueError as e:
+        raise ValueError(f"Invalid scene token: {token}") from e
+
+
+def get_scene_url(scene_s3_key: str | None) -> str | None:
+    """
+    Stable URL of the scene that redirects to its presigned URL, see `get_scene`
+    """
+    if scene_s3_key is None:
+        return None
+
+    return f"{settings.scenes_base_url}{SCENES_URL_PATH}{encode_scene_token(scene_s3_key)}"
+
+
+def _sign_scene_key(key_version: int, raw_key: bytes) -> bytes:
+    return hmac.new(_get_scene_token_secret(key_version), raw_key, hashlib.sha256).digest()[:SCENE_SIGNATURE_SIZE]
+
+
+@functools.lru_cache
+def _get_scene_token_secret(key_version: int) -> bytes:
+    """
+    Key of the version derived from `secret`, changing `secret` invalidates the tokens of all versions
+    """
+    return hmac.new(settings.secret.encode(), f"scene-token:{key_version}".encode(), hashlib.sha256).digest()
+
+
+def _encode_base64(value: bytes) -> str:
+    return base64.urlsafe_b64encode(value).decode().rstrip("=")
+
+
+def _decode_base64(value: str) -> bytes:
+    return base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
@@ -0,0 +1,54 @@
+import functools
+import re
+import timeit
+
+import click
+
+from app.api.phrases.utils import get_matched_phrase, normalize_phrase_text
+
+
+def legacy_get_matched_phrase(normalized_search_text: str, full_text: str) -> str:
+    """
+    Regex based implementation that `get_matched_phrase` used before
+    """
+    search_words = normalized_search_text.replace(" . ", " ").strip().split()
+    matched_phrase = None
+
+    if len(search_words) == 1:
+        pattern = f"({search_words[0]})"
+        matched_phrase = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
+    elif len(search_words) > 1:
+        pattern = rf"({search_words[0]}"
+
+        for word in search_words[1:]:
+            pattern += rf"[^\b{word}\b]*{word}"
+
+        pattern += ")"
+        matched_phrase = re.search(pattern, full_text, re.IGNORECASE | re.DOTALL)
+
+    return matched_phrase.group(1) if matched_phrase else ""
+
+
+CASES = {
+    "single word": ("hagrid", "Ah, Professor, I would trust Hagrid\nwith my life."),
+    "several words": ("hagrid with my life", "Ah, Professor, I would trust Hagrid\nwith my life."),
+    "no match": ("trust me", "Ah, Professor, I would trust Hagrid\nwith my life."),
+    # The legacy regex backtracks over every "oh" here
+    "long phrase": ("oh yes", "oh " * 1000 + "no"),
+}
+
+
+@click.command(help="Compares `get_matched_phrase` with the legacy regex implementation")
+@click.option("--number", "-n", type=int, default=1000, help="Number of calls per case")
+def benchmark_matched_phrase(number: int) -> None:
+    for case, (search_text, full_text) in CASES.items():
+        normalized_search_text = normalize_phrase_text(search_text)
+        click.echo(f"{case}:")
+
+        for name, func in (("legacy", legacy_get_matched_phrase), ("current", get_matched_phrase)):
+            seconds = timeit.timeit(functools.partial(func, normalized_search_text, full_text), number=number)
+            click.echo(f"  {name:<8} {seconds / number * 1e6:10.2f} us/call")
+
+
+if __name__ == "__main__":
+    benchmark_matched_phrase()
@@ -0,0 +1,59 @@
+import functools
+import re
+import timeit
+from pathlib import Path
+
+import click
+import srt
+
+from app.api.phrases.utils import normalize_many, normalize_phrase_text
+
+
+def legacy_normalize_phrase_text(phrase: str) -> str:
+    """
+    Multi-pass implementation that `normalize_phrase_text` used before
+    """
+    phrase = phrase.replace("\\n", " ")
+    phrase = re.sub(r'[\#\$%&()*+,/:;<=>@\[\]^\\_`{|}~\-"]', " ", phrase)
+    phrase = re.sub(r"[?!.]+", ". ", phrase)
+    phrase = re.sub(r"\s+", " ", phrase)
+    phrase = re.sub(r"\s*\.\s*", " . ", phrase)
+    phrase = phrase.lower().strip()
+
+    return " " + phrase + " "
+
+
+CASES = {
+    "short line": "Hello, there! How are you doing?",
+    "subtitle line": "- They really are...\n- The only family he has.",
+    "long line": "Ah, Professor, I would trust Hagrid\nwith my life. " * 20,
+}
+
+
+@click.command(help="Compares `normalize_phrase_text` with the legacy multi-pass implementation")
+@click.option("--number", "-n", type=int, default=10000, help="Number of calls per case")
+@click.option(
+    "--subtitles",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    help="Subtitles file to normalize as the batch",
+)
+def benchmark_normalize_phrase_text(number: int, subtitles: Path | None) -> None:
+    for case, phrase in CASES.items():
+        click.echo(f"{case}:")
+
+        for name, func in (("legacy", legacy_normalize_phrase_text), ("current", normalize_phrase_text)):
+            seconds = timeit.timeit(functools.partial(func, phrase), number=number)
+            click.echo(f"  {name:<8} {seconds / number * 1e6:10.2f} us/call")
+
+    if subtitles is not None:
+        lines = [sub.content for sub in srt.parse(subtitles.read_text(encoding="utf-8"))]
+        click.echo(f"subtitles ({len(lines)} lines):")
+
+        legacy_seconds = timeit.timeit(lambda: [legacy_normalize_phrase_text(line) for line in lines], number=10)
+        seconds = timeit.timeit(functools.partial(normalize_many, lines), number=10)
+        click.echo(f"  {'legacy':<8} {legacy_seconds / 10 * 1e3:10.2f} ms/file")
+        click.echo(f"  {'current':<8} {seconds / 10 * 1e3:10.2f} ms/file")
+
+
+if __name__ == "__main__":
+    benchmark_normalize_phrase_text()
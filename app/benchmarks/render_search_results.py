@@ -0,0 +1,73 @@
+import datetime
+import timeit
+import uuid
+
+import click
+from fastapi.responses import ORJSONResponse
+from pydantic import TypeAdapter
+
+from app.api.movies.schemas import MovieInSearchByPhraseTextSchema
+from app.api.phrases.fragments import PhrasesSearchFragments
+from app.api.phrases.schemas import PaginatedPhrasesBySearchTextSchema, PhraseBySearchTextSchema
+
+PAGES_ADAPTER: TypeAdapter[list[PaginatedPhrasesBySearchTextSchema]] = TypeAdapter(
+    list[PaginatedPhrasesBySearchTextSchema],
+)
+
+
+def get_pages(count: int, size: int) -> list[PaginatedPhrasesBySearchTextSchema]:
+    movie = MovieInSearchByPhraseTextSchema(id=uuid.uuid4(), title="Harry Potter", year=2001)
+
+    return [
+        PaginatedPhrasesBySearchTextSchema(
+            items=[
+                PhraseBySearchTextSchema(
+                    id=uuid.uuid4(),
+                    full_text="Ah, Professor, I would trust Hagrid\nwith my life.",
+                    scene_s3_key=f"movies/{movie.id}/{i}.mp4",
+                    matched_phrase="trust Hagrid",
+                    matched_phrase_span=(24, 36),
+                    start_in_movie=datetime.timedelta(seconds=i * 3, milliseconds=250),
+                    movie=movie,
+                )
+                for i in range(size)
+            ],
+            total=None,
+            page=1,
+            size=size,
+            pages=None,
+            has_more=True,
+            is_total_exact=False,
+        )
+        for _ in range(count)
+    ]
+
+
+def render_pages(pages: list[PaginatedPhrasesBySearchTextSchema]) -> bytes:
+    """
+    What FastAPI does with the `get_phrases_by_search_texts` result: the models are dumped,
+    validated by `response_model`, serialized to JSON-compatible data and rendered
+    """
+    validated_pages = PAGES_ADAPTER.validate_python([page.model_dump() for page in pages])
+
+    return ORJSONResponse(PAGES_ADAPTER.dump_python(validated_pages, mode="json")).body
+
+
+@click.command(help="Compares rendering of the search results by the response model and by `PhrasesSearchFragments`")
+@click.option("--pages", "-p", "pages_count", type=int, default=50, help="Number of pages in the response")
+@click.option("--size", "-s", type=int, default=3, help="Number of phrases on the page")
+@click.option("--number", "-n", type=int, default=1000, help="Number of renders")
+def benchmark_render_search_results(pages_count: int, size: int, number: int) -> None:
+    pages = get_pages(pages_count, size)
+    fragments = PhrasesSearchFragments(max_size=pages_count * size)
+
+    legacy_seconds = timeit.timeit(lambda: render_pages(pages), number=number)
+    seconds = timeit.timeit(lambda: fragments.render_pages(pages), number=number)
+
+    click.echo(f"{pages_count} pages of {size} phrases:")
+    click.echo(f"  {'legacy':<8} {legacy_seconds / number * 1e3:10.3f} ms/response")
+    click.echo(f"  {'current':<8} {seconds / number * 1e3:10.3f} ms/response")
+
+
+if __name__ == "__main__":
+    benchmark_render_search_results()
@@ -0,0 +1,73 @@
+import datetime
+import timeit
+import uuid
+from typing import Sequence, Type
+from unittest import mock
+
+import click
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import TypeAdapter
+
+from app.api.phrases import schemas
+from app.api.phrases.models import PhraseModel
+from app.api.phrases.schemas import PhraseSchema
+
+PHRASES_ADAPTER: TypeAdapter[Sequence[PhraseSchema]] = TypeAdapter(Sequence[PhraseSchema])
+
+
+def legacy_format_duration(duration: datetime.timedelta) -> str:
+    """
+    Implementation that `format_duration` used before
+    """
+    hours, remainder = divmod(duration.seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    milliseconds = duration.microseconds // 1000
+
+    return f"{hours:02}:{minutes:02}:{seconds:02}.{milliseconds:03}"
+
+
+def get_phrases(count: int) -> list[PhraseModel]:
+    movie_id = uuid.uuid4()
+
+    return [
+        PhraseModel(
+            id=uuid.uuid4(),
+            movie_id=movie_id,
+            full_text="Ah, Professor, I would trust Hagrid\nwith my life.",
+            normalized_text=" ah professor i would trust hagrid with my life . ",
+            start_in_movie=datetime.timedelta(seconds=i * 3, milliseconds=250),
+            end_in_movie=datetime.timedelta(seconds=i * 3 + 2, milliseconds=750),
+            scene_s3_key=f"movies/{movie_id}/{i}.mp4",
+        )
+        for i in range(count)
+    ]
+
+
+def render_phrases(phrases: Sequence[PhraseModel], response_class: Type[Response]) -> bytes:
+    """
+    What FastAPI does with the `get_phrases_by_movie_id` result: validation by `response_model`,
+    serialization to JSON-compatible data and rendering by the response class
+    """
+    validated_phrases = PHRASES_ADAPTER.validate_python(phrases, from_attributes=True)
+
+    return response_class(PHRASES_ADAPTER.dump_python(validated_phrases, mode="json")).body
+
+
+@click.command(help="Compares rendering of `get_phrases_by_movie_id` response before and after orjson")
+@click.option("--phrases", "-p", "phrases_count", type=int, default=10000, help="Number of phrases in the response")
+@click.option("--number", "-n", type=int, default=10, help="Number of renders")
+def benchmark_serialize_phrases(phrases_count: int, number: int) -> None:
+    phrases = get_phrases(phrases_count)
+
+    with mock.patch.object(schemas, "format_duration", legacy_format_duration):
+        legacy_seconds = timeit.timeit(lambda: render_phrases(phrases, JSONResponse), number=number)
+
+    seconds = timeit.timeit(lambda: render_phrases(phrases, ORJSONResponse), number=number)
+
+    click.echo(f"{phrases_count} phrases:")
+    click.echo(f"  {'legacy':<8} {legacy_seconds / number * 1e3:10.2f} ms/response")
+    click.echo(f"  {'current':<8} {seconds / number * 1e3:10.2f} ms/response")
+
+
+if __name__ == "__main__":
+    benchmark_serialize_phrases()
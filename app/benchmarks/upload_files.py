@@ -0,0 +1,114 @@
+import asyncio
+import contextlib
+import io
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable
+
+import aioboto3
+import click
+from boto3.s3.transfer import TransferConfig
+from types_aiobotocore_s3 import S3Client
+
+from app.core.config import settings
+from app.s3.s3_service import S3Service
+
+MB = 1024**2
+
+
+async def legacy_upload_scenes(s3_client: S3Client, scenes_paths: list[Path]) -> None:
+    """
+    Scenes uploaded one by one, every scene is read to memory and uploaded with the default transfer settings
+    """
+    for scene_path in scenes_paths:
+        await s3_client.upload_fileobj(
+            io.BytesIO(scene_path.read_bytes()),
+            settings.s3_bucket,
+            f"benchmark/legacy/{scene_path.name}",
+        )
+
+
+async def upload_scenes(s3_service: S3Service, scenes_paths: list[Path]) -> None:
+    """
+    What `ScenesUploadService` does
+    """
+    semaphore = asyncio.Semaphore(settings.s3_scenes_upload_concurrency)
+
+    async def upload_scene(scene_path: Path) -> None:
+        async with semaphore:
+            await s3_service.upload_file(scene_path, f"benchmark/current/{scene_path.name}")
+
+    await asyncio.gather(*map(upload_scene, scenes_paths))
+
+
+async def measure(name: str, size: int, coroutine_function: Callable[..., Awaitable[object]], *args: object) -> None:
+    start = time.perf_counter()
+    await coroutine_function(*args)
+    seconds = time.perf_counter() - start
+
+    click.echo(f"  {name:<8} {seconds:8.2f} s {size / MB / seconds:10.1f} MB/s")
+
+
+def write_files(movie_path: Path, movie_size: int, scenes_paths: list[Path], scene_size: int) -> None:
+    with movie_path.open("wb") as f:
+        for _ in range(movie_size // MB):
+            f.write(bytes(range(256)) * (MB // 256))
+
+    for scene_path in scenes_paths:
+        scene_path.write_bytes(bytes(range(256)) * (scene_size // 256))
+
+
+async def benchmark(movie_path: Path, movie_size: int, scenes_paths: list[Path], scene_size: int) -> None:
+    session = aioboto3.Session(
+        region_name=settings.s3_region_name,
+        aws_access_key_id=settings.s3_access_key,
+        aws_secret_access_key=settings.s3_secret_key,
+    )
+
+    async with session.client("s3", endpoint_url=settings.s3_endpoint_url) as s3_client:
+        s3_service = S3Service(s3_client)
+
+        with contextlib.suppress(s3_client.exceptions.BucketAlreadyOwnedByYou):
+            await s3_client.create_bucket(
+                Bucket=settings.s3_bucket,
+                CreateBucketConfiguration={"LocationConstraint": settings.s3_region_name},  # type: ignore[typeddict-item]
+            )
+
+        click.echo(f"Movie of {movie_size // MB} MB:")
+        await measure(
+            "legacy",
+            movie_size,
+            s3_client.upload_file,
+            str(movie_path),
+            settings.s3_bucket,
+            "benchmark/legacy/movie.mp4",
+            None,
+            None,
+            TransferConfig(),
+        )
+        await measure("current", movie_size, s3_service.upload_file, movie_path, "benchmark/current/movie.mp4")
+
+        click.echo(f"{len(scenes_paths)} scenes of {scene_size // 1024} KB:")
+        await measure("legacy", len(scenes_paths) * scene_size, legacy_upload_scenes, s3_client, scenes_paths)
+        await measure("current", len(scenes_paths) * scene_size, upload_scenes, s3_service, scenes_paths)
+
+
+@click.command(
+    help="Compares S3 upload throughput with the default and the configured transfer settings. "
+    "Run it against the S3 of the deployment or its stand-in (S3_ENDPOINT_URL), e.g. moto server.",
+)
+@click.option("--movie-size", type=int, default=512, help="Size of the movie file in MB")
+@click.option("--scenes", "scenes_count", type=int, default=500, help="Number of scenes")
+@click.option("--scene-size", type=int, default=512, help="Size of the scene in KB")
+def benchmark_upload_files(movie_size: int, scenes_count: int, scene_size: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        movie_path = Path(tmp_dir, "movie.mp4")
+        scenes_paths = [Path(tmp_dir, f"scene-{i}.mp4") for i in range(scenes_count)]
+        write_files(movie_path, movie_size * MB, scenes_paths, scene_size * 1024)
+
+        asyncio.run(benchmark(movie_path, movie_size * MB, scenes_paths, scene_size * 1024))
+
+
+if __name__ == "__main__":
+    benchmark_upload_files()
@@ -0,0 +1,381 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi.responses import Response
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.coder import Coder
+from redis.asyncio.client import Redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = "fastapi-cache"
+
+CACHE_INVALIDATION_CHANNEL = f"{CACHE_PREFIX}:invalidation"
+
+# How often a worker checks if the value recomputed by another worker is ready
+RECOMPUTATION_POLL_INTERVAL = 0.1  # seconds
+
+# Namespace of the cached phrases search results, any phrase or movie write clears it
+PHRASES_SEARCH_CACHE_NAMESPACE = "phrases-search"
+
+
+def get_json_response(body: str | bytes) -> Response:
+    """
+    Response with the already rendered JSON `body`, it's returned as is and skips the response model.
+    Clients keep it for `phrases_search_client_cache_ttl`, then revalidate it with `ETagMiddleware`.
+    """
+    return Response(
+        body,
+        media_type="application/json",
+        headers={"Cache-Control": f"max-age={settings.phrases_search_client_cache_ttl}"},
+    )
+
+
+class RawJSONCoder(Coder):
+    """
+    Coder of the endpoints returning `get_json_response`: the body is cached as is and the cached value
+    is returned in the same response, so it isn't decoded and validated by the response model on every hit.
+    """
+
+    @classmethod
+    def encode(cls, value: Response) -> str:
+        return bytes(value.body).decode()
+
+    @classmethod
+    def decode(cls, value: str) -> Response:
+        return get_json_response(value)
+
+
+class LocalCache:
+    """
+    Bounded LRU cache with TTL for the values that are also stored in Redis.
+    """
+
+    def __init__(self, max_size: int, ttl: int) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        # key -> (local expiration time, Redis expiration time or None if the key doesn't expire, value)
+        self._entries: OrderedDict[str, tuple[float, float | None, str]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> tuple[int, str] | None:
+        """
+        Returns the remaining Redis TTL and the value
+        """
+        entry = self._entries.get(key)
+
+        if entry is None:
+            return None
+
+        expires_at, redis_expires_at, value = entry
+        now = time.monotonic()
+
+        if expires_at <= now:
+            del self._entries[key]
+            return None
+
+        self._entries.move_to_end(key)
+
+        return (int(redis_expires_at - now) if redis_expires_at is not None else -1), value
+
+    def set(self, key: str, value: str, ttl: int | None) -> None:
+        """
+        `ttl` is the remaining Redis TTL, the value isn't kept locally longer than that
+        """
+        if self.max_size <= 0:
+            return
+
+        now = time.monotonic()
+        redis_expires_at = now + ttl if ttl is not None and ttl >= 0 else None
+        expires_at = now + self.ttl if redis_expires_at is None else min(now + self.ttl, redis_expires_at)
+
+        self._entries[key] = (expires_at, redis_expires_at, value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> None:
+        """
+        Same arguments as `Backend.clear`
+        """
+        if namespace:
+            for cached_key in [cached_key for cached_key in self._entries if cached_key.startswith(f"{namespace}:")]:
+                del self._entries[cached_key]
+        elif key:
+            self._entries.pop(key, None)
+
+    def clear_all(self) -> None:
+        self._entries.clear()
+
+
+class TwoTierCacheBackend(RedisBackend):
+    """
+    Redis backend with the bounded in-process LRU in front of it, so hot keys skip the Redis round-trip.
+
+    `clear` is published to `CACHE_INVALIDATION_CHANNEL`: every worker runs `listen_for_invalidations`
+    and drops its local entries. The local TTL limits staleness if a message is lost.
+
+    Stampede protection: values are kept in Redis for `stale_ttl` seconds after they expire. When a value
+    is missing or stale, `get_with_ttl` lets only one request recompute it: the one that gets a short
+    Redis lock. Requests of the same worker wait for its result, requests of the other workers get
+    the stale value or wait until the recomputed one appears in Redis.
+
+    Writes drop the values they affect with `clear_namespace`. A value recomputed while its namespace is
+    cleared can be computed before the write, so it isn't stored: the workers drop such recomputations
+    when they get the invalidation message.
+
+    The channel also delivers the `publish` messages, e.g. the changes of the in-memory indexes,
+    so the other workers get them before the invalidations that follow them.
+    """
+
+    redis: "Redis[bytes]"
+
+    def __init__(
+        self,
+        redis: "Redis[bytes]",
+        local_max_size: int,
+        local_ttl: int,
+        stale_ttl: int = 0,
+        lock_timeout: int = 10,
+        prefix: str = "",
+    ) -> None:
+        super().__init__(redis)
+        # Same as the prefix of `FastAPICache.init`, it goes before the namespace in the keys
+        self.prefix = prefix
+        self.local_cache = LocalCache(local_max_size, local_ttl)
+        self.stale_ttl = stale_ttl
+        self.lock_timeout = lock_timeout
+        # Keys recomputed by this worker, the futures get the value passed to `set`
+        self._recomputations: dict[str, asyncio.Future[tuple[int, str] | None]] = {}
+        # Keys recomputed by this worker that were cleared in the meantime
+        self._outdated_recomputations: set[str] = set()
+        # The worker doesn't handle its own `publish` messages
+        self._worker_id = uuid.uuid4().hex
+        self._message_handlers: dict[str, Callable[[Any], None]] = {}
+
+    # `RedisBackend.get_with_ttl` is annotated as never returning None, but it does for the missing keys
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[str]]:  # type: ignore[override]
+        cached = self.local_cache.get(key)
+
+        if cached is not None:
+            return cached
+
+        ttl, value = await self._get_fresh_from_redis(key)
+
+        if value is not None and ttl != 0:
+            return ttl, value
+
+        return await self._coalesce_recomputation(key, value)
+
+    async def _coalesce_recomputation(self, key: str, value: Optional[str]) -> Tuple[int, Optional[str]]:
+        """
+        Called for the missing or stale `value`. Returns (0, None) if the caller has to recompute it.
+        """
+        recomputation = self._recomputations.get(key)
+
+        if recomputation is not None:
+            if value is not None:
+                return 0, value
+
+            result = await asyncio.shield(recomputation)
+
+            return result if result is not None else (0, None)
+
+        recomputation = self._start_recomputation(key)
+
+        if await self.redis.set(self._get_lock_key(key), 1, nx=True, ex=self.lock_timeout):
+            # The caller recomputes the value and passes it to `set`
+            return 0, None
+
+        # Another worker recomputes the value
+        result = (0, value) if value is not None else await self._wait_for_other_worker(key)
+
+        if result is None:
+            # The other worker didn't manage to do it in time
+            return 0, None
+
+        self._finish_recomputation(key, recomputation, result)
+
+        return result
+
+    async def get(self, key: str) -> Optional[str]:
+        cached = self.local_cache.get(key)
+
+        if cached is not None:
+            return cached[1]
+
+        return await super().get(key)
+
+    async def set(self, key: str, value: str, expire: Optional[int] = None) -> None:
+        # The value was cleared while it was recomputed, so it can be computed before the write
+        if key not in self._outdated_recomputations:
+            await super().set(key, value, expire + self.stale_ttl if expire else expire)
+            self.local_cache.set(key, value, expire)
+
+        recomputation = self._recomputations.get(key)
+
+        if recomputation is not None:
+            self._finish_recomputation(key, recomputation, (expire or -1, value))
+
+        await self.redis.delete(self._get_lock_key(key))
+
+    async def clear(self, namespace: Optional[str] = None, key: Optional[str] = None) -> int:
+        result = await super().clear(namespace, key)
+
+        self.local_cache.clear(namespace, key)
+        self._outdate_recomputations(namespace, key)
+        await self.redis.publish(CACHE_INVALIDATION_CHANNEL, json.dumps({"namespace": namespace, "key": key}))
+
+        return result
+
+    async def clear_namespace(self, namespace: str) -> None:
+        """
+        Deletes the values cached by the `@cache(namespace=namespace)` endpoints on every worker
+        """
+        await self.clear(namespace=f"{self.prefix}:{namespace}")
+
+    async def publish(self, name: str, data: object) -> None:
+        """
+        Sends the JSON serializable `data` to the handlers of the other workers subscribed to `name`
+        """
+        await self.redis.publish(
+            CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"name": name, "data": data, "worker_id": self._worker_id}),
+        )
+
+    def subscribe(self, name: str, handler: Callable[[Any], None]) -> None:
+        """
+        `handler` gets the data of the `name` messages published by the other workers
+        """
+        self._message_handlers[name] = handler
+
+    async def release(self, key: str) -> None:
+        """
+        Gives up recomputing the value after `get_with_ttl` returned None, e.g. when computing it failed.
+        The requests waiting for it recompute it at once instead of waiting for the lock timeout.
+        """
+        recomputation = self._recomputations.get(key)
+
+        if recomputation is not None:
+            self._finish_recomputation(key, recomputation, None)
+
+        await self.redis.delete(self._get_lock_key(key))
+
+    async def _get_fresh_from_redis(self, key: str) -> Tuple[int, Optional[str]]:
+        """
+        Returns TTL 0 for the stale value
+        """
+        ttl, value = await super().get_with_ttl(key)
+
+        if value is None:
+            return ttl, None
+
+        # Keys without expiration have negative TTL
+        fresh_ttl = max(ttl - self.stale_ttl, 0) if ttl >= 0 else ttl
+
+        if fresh_ttl != 0:
+            self.local_cache.set(key, value, fresh_ttl)
+
+        return fresh_ttl, value
+
+    async def _wait_for_other_worker(self, key: str) -> tuple[int, str] | None:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.lock_timeout
+
+        while loop.time() < deadline:
+            await asyncio.sleep(RECOMPUTATION_POLL_INTERVAL)
+            ttl, value = await self._get_fresh_from_redis(key)
+
+            if value is not None and ttl != 0:
+                return ttl, value
+
+        return None
+
+    def _start_recomputation(self, key: str) -> asyncio.Future[tuple[int, str] | None]:
+        loop = asyncio.get_running_loop()
+        recomputation: asyncio.Future[tuple[int, str] | None] = loop.create_future()
+        self._recomputations[key] = recomputation
+
+        # The recomputation can fail without calling `set`, the waiting requests recompute the value then
+        loop.call_later(self.lock_timeout, self._finish_recomputation, key, recomputation, None)
+
+        return recomputation
+
+    def _finish_recomputation(
+        self,
+        key: str,
+        recomputation: asyncio.Future[tuple[int, str] | None],
+        result: tuple[int, str] | None,
+    ) -> None:
+        if self._recomputations.get(key) is recomputation:
+            del self._recomputations[key]
+            self._outdated_recomputations.discard(key)
+
+        if not recomputation.done():
+            recomputation.set_result(result)
+
+    @staticmethod
+    def _get_lock_key(key: str) -> str:
+        return f"{key}:lock"
+
+    def _outdate_recomputations(self, namespace: Optional[str], key: Optional[str]) -> None:
+        """
+        Same arguments as `clear`
+        """
+        if namespace:
+            self._outdated_recomputations.update(
+                recomputation_key
+                for recomputation_key in self._recomputations
+                if recomputation_key.startswith(f"{namespace}:")
+            )
+        elif key and key in self._recomputations:
+            self._outdated_recomputations.add(key)
+
+    def _handle_message(self, message: dict[str, Any]) -> None:
+        handler = self._message_handlers.get(message["name"])
+
+        if handler is None or message["worker_id"] == self._worker_id:
+            return
+
+        try:
+            handler(message["data"])
+        except Exception:
+            logger.exception("Failed to handle cache channel message: %s", message["name"])
+
+    async def listen_for_invalidations(self, reconnect_interval: int = 5) -> None:
+        """
+        Drops local entries cleared by the other workers. Runs until cancelled.
+        """
+        while True:
+            try:
+                async with self.redis.pubsub() as pubsub:
+                    await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+
+                    # Invalidations could be missed while (re)connecting
+                    self.local_cache.clear_all()
+
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+
+                        data = json.loads(message["data"])
+
+                        if "name" in data:
+                            self._handle_message(data)
+                        else:
+                            self.local_cache.clear(data["namespace"], data["key"])
+                            self._outdate_recomputations(data["namespace"], data["key"])
+            except Exception:
+                logger.exception("Cache invalidation listener failed, reconnecting")
+                self.local_cache.clear_all()
+                await asyncio.sleep(reconnect_interval)
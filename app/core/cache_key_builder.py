@@ -21,9 +21,13 @@ def key_builder_phrase_search_by_text(
     prefix = f"{FastAPICache.get_prefix()}:{namespace}:"
     search_text = kwargs.get("search_text", "").strip()  # type: ignore
     page = kwargs.get("page")  # type: ignore
+    mode = kwargs.get("mode")  # type: ignore
+    cursor = kwargs.get("cursor")  # type: ignore
+    count = kwargs.get("count")  # type: ignore
+    filters = kwargs.get("filters")  # type: ignore
 
     cache_key = hashlib.blake2b(
-        f"{func.__module__}:{func.__name__}:{args}:{search_text}:{page}".encode(),
+        f"{func.__module__}:{func.__name__}:{args}:{search_text}:{page}:{mode}:{cursor}:{count}:{filters!r}".encode(),
     ).hexdigest()
 
     return f"{prefix}:{cache_key}"
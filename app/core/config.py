@@ -1,6 +1,6 @@
 from functools import lru_cache
 
-from pydantic import PostgresDsn, RedisDsn
+from pydantic import PostgresDsn, RedisDsn, model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -11,6 +11,35 @@ class Settings(BaseSettings):
     secret: str
     scenes_tmp_path: str
     phrases_page_size: int = 3
+    phrases_search_index_enabled: bool = False
+    phrases_search_index_refresh_interval: int = 300  # seconds
+    phrases_search_count_cap: int = 1000
+    phrases_search_cache_ttl: int = 3 * 3600  # seconds
+    # Clients reuse the search results for this long, then revalidate them with the ETag
+    phrases_search_client_cache_ttl: int = 1800  # seconds
+    phrases_search_batch_max_size: int = 50
+    # Searches of one batch request that run at the same time, every one takes a DB connection
+    phrases_search_batch_concurrency: int = 4
+    # Minimum `word_similarity` of the search text and the phrase for `mode=fuzzy`, from 0 to 1
+    phrases_search_fuzzy_threshold: float = 0.5
+    # Searches that compute the next page in the background at the same time, per worker. 0 disables prefetch.
+    phrases_search_prefetch_concurrency: int = 4
+    # Serialized search results items kept per worker, see `PhrasesSearchFragments`
+    phrases_search_fragments_cache_size: int = 10000
+    # The index takes memory and startup time of every worker
+    phrases_suggest_index_enabled: bool = False
+    phrases_suggest_index_refresh_interval: int = 300  # seconds
+    phrases_suggest_max_ngram_size: int = 3
+    phrases_suggest_max_limit: int = 20
+    # Origin of the API in the scene URLs of the responses, e.g. https://api.example.com. Relative URLs if empty.
+    scenes_base_url: str = ""
+    # New scene tokens are signed with the key of this version, it's bumped to rotate the key.
+    # Tokens of the older versions keep working down to `scene_token_min_key_version`, it's raised
+    # after the responses with them expire (`phrases_search_cache_ttl`).
+    scene_token_key_version: int = 1
+    scene_token_min_key_version: int = 1
+    # Responses smaller than this aren't compressed
+    gzip_minimum_size: int = 1024  # bytes
 
     # Database
     database_url: PostgresDsn
@@ -23,9 +52,29 @@ class Settings(BaseSettings):
     s3_secret_key: str
     s3_region_name: str
     movies_s3_path: str
+    s3_presigned_url_expiration: int = 24 * 3600  # seconds
+    # The URL the scene is redirected to is still valid for this long, the video is loaded with it
+    s3_presigned_url_min_remaining: int = 3600  # seconds
+    # Clients reuse the scene redirects for this long
+    s3_scene_redirect_cache_ttl: int = 300  # seconds
+    s3_presigned_url_cache_max_size: int = 10000
+    # Connections of the S3 client shared by the requests of a worker
+    s3_max_pool_connections: int = 50
+    s3_keepalive_timeout: int = 60  # seconds
+    # Files larger than this are uploaded in parts of `s3_multipart_chunksize`, 5 GB movies take 320 parts
+    s3_multipart_threshold: int = 16 * 1024**2  # 16 MB
+    s3_multipart_chunksize: int = 16 * 1024**2  # 16 MB
+    # Parts of one file uploaded at the same time
+    s3_multipart_concurrency: int = 10
+    # Scenes of a movie uploaded at the same time
+    s3_scenes_upload_concurrency: int = 20
 
     # Redis
     redis_api_cache_url: RedisDsn
+    cache_local_max_size: int = 1024
+    cache_local_ttl: int = 30  # seconds
+    cache_stale_ttl: int = 60  # seconds
+    cache_lock_timeout: int = 10  # seconds
 
     # Logfire
     logfire_token: str
@@ -38,6 +87,30 @@ class Settings(BaseSettings):
     # Admin
     admin_panel_path: str
 
+    @property
+    def s3_presigned_url_reuse_time(self) -> int:
+        """
+        How long a presigned URL is reused after it's generated: the scene redirects to it
+        can be reused by the clients for `s3_scene_redirect_cache_ttl` after that
+        """
+        return (
+            self.s3_presigned_url_expiration - self.s3_scene_redirect_cache_ttl - self.s3_presigned_url_min_remaining
+        )
+
+    @model_validator(mode="after")
+    def validate_s3_presigned_url_expiration(self) -> "Settings":
+        if self.s3_presigned_url_reuse_time <= 0:
+            raise ValueError("Presigned URLs must stay valid for longer than the scene redirects to them are cached")
+
+        return self
+
+    @model_validator(mode="after")
+    def validate_scene_token_key_version(self) -> "Settings":
+        if not 1 <= self.scene_token_min_key_version <= self.scene_token_key_version:
+            raise ValueError("Scene token key versions must be 1 <= min version <= current version")
+
+        return self
+
 
 @lru_cache
 def get_settings() -> Settings:
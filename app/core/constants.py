@@ -12,5 +12,20 @@ class Languages(str, enum.Enum):
     EN = "en"
 
 
+class PhraseSearchMode(str, enum.Enum):
+    SUBSTRING = "substring"
+    FULL_TEXT = "full_text"
+    FUZZY = "fuzzy"
+
+
+class PhraseSearchCount(str, enum.Enum):
+    EXACT = "exact"
+    ESTIMATE = "estimate"
+    NONE = "none"
+
+
 SUPPORTED_VIDEO_EXTENSIONS = ["mp4", "mkv", "avi", "mov", "mpeg", "mpg", "webm"]
 SUPPORTED_SUBTITLES_EXTENSIONS = ["srt", "vtt"]
+
+# Text search configuration used by the phrases full-text search (see `PhraseModel.search_vector`)
+PHRASES_TEXT_SEARCH_CONFIG = "english"
@@ -1,10 +1,32 @@
 from typing import AsyncIterator
 
+from fastapi_cache import FastAPICache
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api.phrases.search_index import PhrasesSearchIndex, phrases_search_index
+from app.api.phrases.suggest_index import PhrasesSuggestIndex, phrases_suggest_index
+from app.core.cache import TwoTierCacheBackend
+from app.core.config import settings
 from app.core.database import sessionmanager
 
 
 async def get_db_session() -> AsyncIterator[AsyncSession]:
     async with sessionmanager.session() as session:
         yield session
+
+
+async def get_cache_backend() -> TwoTierCacheBackend | None:
+    """
+    Returns None if the cache backend doesn't support invalidation, e.g. in the tests
+    """
+    cache_backend = FastAPICache.get_backend()
+
+    return cache_backend if isinstance(cache_backend, TwoTierCacheBackend) else None
+
+
+async def get_phrases_search_index() -> PhrasesSearchIndex | None:
+    return phrases_search_index if settings.phrases_search_index_enabled else None
+
+
+async def get_phrases_suggest_index() -> PhrasesSuggestIndex | None:
+    return phrases_suggest_index if settings.phrases_suggest_index_enabled else None
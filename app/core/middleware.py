@@ -0,0 +1,81 @@
+import hashlib
+from typing import Collection
+
+from fastapi import status
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class ETagMiddleware:
+    """
+    Conditional requests for the `GET` endpoints named in `route_names`: successful responses get the ETag
+    derived from the body hash, and the request with the matching `If-None-Match` gets 304 without the body.
+
+    The ETag is weak, because compression (see `GZipMiddleware`) changes the bytes, but not the content.
+    It replaces the one set by `@cache`, which is based on `hash()` and so differs between the workers.
+    """
+
+    def __init__(self, app: ASGIApp, route_names: Collection[str]) -> None:
+        self.app = app
+        self.route_names = frozenset(route_names)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message | None = None
+        body = bytearray()
+
+        async def send_with_etag(message: Message) -> None:
+            nonlocal start_message
+
+            if message["type"] == "http.response.start" and self._should_add_etag(scope, message):
+                # The headers are sent with the body, when the hash is known
+                start_message = message
+                return
+
+            if message["type"] == "http.response.body" and start_message is not None:
+                body.extend(message.get("body", b""))
+
+                if not message.get("more_body", False):
+                    await self._send_response(scope, send, start_message, bytes(body))
+
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_with_etag)
+
+    def _should_add_etag(self, scope: Scope, message: Message) -> bool:
+        # The router puts the matched route into the scope
+        route = scope.get("route")
+
+        return message["status"] == status.HTTP_200_OK and getattr(route, "name", None) in self.route_names
+
+    async def _send_response(self, scope: Scope, send: Send, start_message: Message, body: bytes) -> None:
+        etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        headers = MutableHeaders(scope=start_message)
+        headers["ETag"] = etag
+
+        if self._is_not_modified(Headers(scope=scope).get("if-none-match"), etag):
+            del headers["Content-Length"]
+            await send({**start_message, "status": status.HTTP_304_NOT_MODIFIED})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send(start_message)
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    def _is_not_modified(if_none_match: str | None, etag: str) -> bool:
+        """
+        Weak comparison: ETags match if they are equal without the "W/" prefix
+        """
+        if not if_none_match:
+            return False
+
+        if if_none_match.strip() == "*":
+            return True
+
+        return etag.removeprefix("W/") in {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
@@ -2,6 +2,7 @@ import datetime
 import uuid
 
 import sqlalchemy
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.declarative import AbstractConcreteBase
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
@@ -10,6 +11,17 @@ class CoreModel(DeclarativeBase):
     pass
 
 
+def create_ddl(statement: str) -> DDL:
+    """
+    `DDL` constructor isn't annotated
+    """
+    return DDL(statement)  # type: ignore[no-untyped-call]
+
+
+# Extensions required by the models' indexes, e.g. `gin_trgm_ops` for phrases search
+event.listen(CoreModel.metadata, "before_create", create_ddl("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+
+
 class DateTimeModelMixin(AbstractConcreteBase):
     created_at: Mapped[datetime.datetime] = mapped_column(
         sqlalchemy.DateTime(timezone=True),
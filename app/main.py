@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
@@ -6,8 +7,9 @@ from typing import AsyncIterator
 import logfire
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi_cache import FastAPICache
-from fastapi_cache.backends.redis import RedisBackend
 from fastapi_pagination import add_pagination
 from redis import asyncio as aioredis
 from sqladmin import Admin
@@ -17,10 +19,24 @@ from app.api.movies import admin as movies_admin
 from app.api.movies.router import router as movies_router
 from app.api.phrases import admin as phrases_admin
 from app.api.phrases.router import router as phrases_router
+from app.api.phrases.search_index import (
+    PHRASES_SEARCH_INDEX_CHANGES_MESSAGE,
+    load_phrases_search_index,
+    phrases_search_index,
+    refresh_phrases_search_index,
+)
+from app.api.phrases.suggest_index import (
+    load_phrases_suggest_index,
+    phrases_suggest_index,
+    refresh_phrases_suggest_index,
+)
 from app.api.users.router import router as users_router
 from app.core.admin_auth import AdminAuth
+from app.core.cache import CACHE_PREFIX, TwoTierCacheBackend
 from app.core.config import settings
 from app.core.database import sessionmanager
+from app.core.middleware import ETagMiddleware
+from app.s3.client import s3_client_manager
 
 logging.basicConfig(
     stream=sys.stdout,
@@ -34,9 +50,47 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:  # noqa: ARG001
     Function that handles startup and shutdown events.
     """
     redis = aioredis.from_url(str(settings.redis_api_cache_url))
-    FastAPICache.init(RedisBackend(redis), prefix="fastapi-cache")
+    cache_backend = TwoTierCacheBackend(
+        redis,
+        local_max_size=settings.cache_local_max_size,
+        local_ttl=settings.cache_local_ttl,
+        stale_ttl=settings.cache_stale_ttl,
+        lock_timeout=settings.cache_lock_timeout,
+        prefix=CACHE_PREFIX,
+    )
+    FastAPICache.init(cache_backend, prefix=CACHE_PREFIX)
+    cache_invalidation_task = asyncio.create_task(cache_backend.listen_for_invalidations())
+    await s3_client_manager.open()
+
+    search_index_refresh_task = None
+
+    if settings.phrases_search_index_enabled:
+        # Changes made by the other workers while the index is loaded are applied to it
+        cache_backend.subscribe(PHRASES_SEARCH_INDEX_CHANGES_MESSAGE, phrases_search_index.apply)
+        await load_phrases_search_index(phrases_search_index)
+        search_index_refresh_task = asyncio.create_task(
+            refresh_phrases_search_index(phrases_search_index, settings.phrases_search_index_refresh_interval),
+        )
+
+    suggest_index_refresh_task = None
+
+    if settings.phrases_suggest_index_enabled:
+        await load_phrases_suggest_index(phrases_suggest_index)
+        suggest_index_refresh_task = asyncio.create_task(
+            refresh_phrases_suggest_index(phrases_suggest_index, settings.phrases_suggest_index_refresh_interval),
+        )
 
     yield
+    cache_invalidation_task.cancel()
+
+    if search_index_refresh_task is not None:
+        search_index_refresh_task.cancel()
+
+    if suggest_index_refresh_task is not None:
+        suggest_index_refresh_task.cancel()
+
+    await s3_client_manager.close()
+
     if sessionmanager._engine is not None:
         # Close the DB connection
         await sessionmanager.close()
@@ -46,7 +100,8 @@ docs_url = "/docs" if settings.environment != "prod" else None
 origins = ["http://localhost", "http://localhost:8080", "http://localhost:3000", "https://phraseqwe.space"]
 
 
-app = FastAPI(lifespan=lifespan, docs_url=docs_url)
+# orjson renders JSON several times faster than the stdlib `json`
+app = FastAPI(lifespan=lifespan, docs_url=docs_url, default_response_class=ORJSONResponse)
 
 authentication_backend = AdminAuth(secret_key=settings.secret)
 
@@ -68,6 +123,15 @@ add_pagination(app)
 logfire.configure(token=settings.logfire_token, send_to_logfire=settings.environment in ["dev", "prod"])
 logfire.instrument_fastapi(app)
 
+# Conditional requests for the public read endpoints, so repeat visitors and CDN skip the body transfer
+app.add_middleware(
+    ETagMiddleware,
+    route_names=["phrases:get-phrases-by-search-text", "phrases:get-phrase-by-id", "movies:get-all-movies"],
+)
+
+# Compression of the responses, goes after `ETagMiddleware` so the ETag is computed from the original body
+app.add_middleware(GZipMiddleware, minimum_size=settings.gzip_minimum_size)
+
 # CORS (Cross-Origin Resource Sharing)
 app.add_middleware(
     CORSMiddleware,
@@ -0,0 +1,53 @@
+import contextlib
+
+import aioboto3
+from aiobotocore.config import AioConfig
+from types_aiobotocore_s3 import S3Client
+
+from app.core.config import settings
+
+
+class S3ClientManager:
+    """
+    Keeps one S3 client per worker, opened and closed in the app lifespan.
+    Requests share its connection pool, so they don't pay for the client construction and TLS handshakes.
+    """
+
+    def __init__(self) -> None:
+        self._exit_stack: contextlib.AsyncExitStack | None = None
+        self._client: S3Client | None = None
+
+    async def open(self) -> None:
+        session = aioboto3.Session(
+            region_name=settings.s3_region_name,
+            aws_access_key_id=settings.s3_access_key,
+            aws_secret_access_key=settings.s3_secret_key,
+        )
+        config = AioConfig(
+            max_pool_connections=settings.s3_max_pool_connections,
+            connector_args={"keepalive_timeout": settings.s3_keepalive_timeout},
+        )
+
+        self._exit_stack = contextlib.AsyncExitStack()
+        self._client = await self._exit_stack.enter_async_context(
+            session.client("s3", endpoint_url=settings.s3_endpoint_url, config=config),
+        )
+
+    async def close(self) -> None:
+        if self._exit_stack is None:
+            raise Exception("S3ClientManager is not initialized")
+
+        await self._exit_stack.aclose()
+
+        self._exit_stack = None
+        self._client = None
+
+    @property
+    def client(self) -> S3Client:
+        if self._client is None:
+            raise Exception("S3ClientManager is not initialized")
+
+        return self._client
+
+
+s3_client_manager = S3ClientManager()
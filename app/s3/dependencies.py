@@ -1,26 +1,25 @@
-import aioboto3
 from fastapi import Depends
+from types_aiobotocore_s3 import S3Client
 
-from app.core.config import settings
-from app.s3.presigned_url_service import PresignedURLService
+from app.core.cache import TwoTierCacheBackend
+from app.core.dependencies import get_cache_backend
+from app.s3.client import s3_client_manager
+from app.s3.presigned_url_service import PresignedURLService, presigned_urls_local_cache
 from app.s3.s3_service import S3Service
 
 
-async def get_s3_session() -> aioboto3.Session:
-    return aioboto3.Session(
-        region_name=settings.s3_region_name,
-        aws_access_key_id=settings.s3_access_key,
-        aws_secret_access_key=settings.s3_secret_key,
-    )
+async def get_s3_client() -> S3Client:
+    return s3_client_manager.client
 
 
 async def get_s3_service(
-    s3_session: aioboto3.Session = Depends(get_s3_session),
+    s3_client: S3Client = Depends(get_s3_client),
 ) -> S3Service:
-    return S3Service(s3_session=s3_session)
+    return S3Service(s3_client=s3_client)
 
 
 async def get_presigned_url_service(
     s3_service: S3Service = Depends(get_s3_service),
+    cache_backend: TwoTierCacheBackend | None = Depends(get_cache_backend),
 ) -> PresignedURLService:
-    return PresignedURLService(s3_service)
+    return PresignedURLService(s3_service, cache_backend=cache_backend, local_cache=presigned_urls_local_cache)
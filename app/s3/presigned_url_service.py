@@ -1,32 +1,100 @@
-import typing
+import logging
 
-from pydantic import BaseModel
+from fastapi_cache import FastAPICache
 
-from app.core.models import CoreModel
+from app.core.cache import LocalCache, TwoTierCacheBackend
+from app.core.config import settings
 from app.s3.s3_service import S3Service
 
-CM = typing.TypeVar("CM", bound=CoreModel | BaseModel)
+logger = logging.getLogger(__name__)
 
 
 class PresignedURLService:
-    def __init__(self, s3_service: S3Service) -> None:
-        self.s3_service = s3_service
+    """
+    Presigned URLs are cached by S3 key in `local_cache` of the worker and in Redis shared by the workers.
+    Cached URLs are reused for `s3_presigned_url_reuse_time`, so they never get into scene redirects that
+    can be reused by the clients after the URLs expire.
+    """
 
-    async def update_s3_urls_for_models(
+    def __init__(
         self,
-        items: typing.Sequence[CM],
-        key: str,
-    ) -> typing.Sequence[CM]:
-        for item in items:
-            await self.update_s3_url_for_model(item, key)
+        s3_service: S3Service,
+        cache_backend: TwoTierCacheBackend | None = None,
+        local_cache: LocalCache | None = None,
+    ) -> None:
+        self.s3_service = s3_service
+        self.cache_backend = cache_backend
+        self.local_cache = local_cache
+
+    async def get_presigned_url(self, s3_key: str) -> str:
+        """
+        Returns the presigned URL of the S3 key, it's generated and cached if it's missing
+        """
+        cached = self.local_cache.get(s3_key) if self.local_cache is not None else None
+
+        if cached is not None:
+            return cached[1]
+
+        cached = await self._get_from_redis(s3_key)
+
+        if cached is not None:
+            ttl, presigned_url = cached
+            self._set_local(s3_key, presigned_url, ttl)
+
+            return presigned_url
+
+        presigned_url = await self.s3_service.get_presigned_url(s3_key)
+        self._set_local(s3_key, presigned_url, settings.s3_presigned_url_reuse_time)
+        await self._set_in_redis(s3_key, presigned_url)
+
+        return presigned_url
+
+    def _set_local(self, s3_key: str, presigned_url: str, ttl: int) -> None:
+        if self.local_cache is not None:
+            self.local_cache.set(s3_key, presigned_url, ttl)
+
+    async def _get_from_redis(self, s3_key: str) -> tuple[int, str] | None:
+        """
+        Returns the remaining reuse time and the URL if the key is cached
+        """
+        if self.cache_backend is None:
+            return None
+
+        redis_key = self._get_redis_key(s3_key)
+
+        try:
+            async with self.cache_backend.redis.pipeline(transaction=False) as pipe:
+                pipe.get(redis_key)
+                pipe.ttl(redis_key)
+
+                presigned_url, ttl = await pipe.execute()
+        except Exception:
+            logger.warning("Error retrieving presigned URL from Redis", exc_info=True)
+            return None
+
+        # The URL can expire between the commands
+        if presigned_url is None or ttl <= 0:
+            return None
+
+        return ttl, presigned_url.decode() if isinstance(presigned_url, bytes) else presigned_url
+
+    async def _set_in_redis(self, s3_key: str, presigned_url: str) -> None:
+        if self.cache_backend is None:
+            return
 
-        return items
+        try:
+            await self.cache_backend.redis.set(
+                self._get_redis_key(s3_key),
+                presigned_url,
+                ex=settings.s3_presigned_url_reuse_time,
+            )
+        except Exception:
+            logger.warning("Error setting presigned URL in Redis", exc_info=True)
 
-    async def update_s3_url_for_model(self, item: CM, key: str) -> CM:
-        s3_key = getattr(item, key, None)
+    @staticmethod
+    def _get_redis_key(s3_key: str) -> str:
+        return f"{FastAPICache.get_prefix()}:presigned-url:{s3_key}"
 
-        if s3_key is not None:
-            pre_signed_url = await self.s3_service.get_presigned_url(s3_key)
-            setattr(item, key, pre_signed_url)
 
-        return item
+# Presigned URLs cached in this worker
+presigned_urls_local_cache = LocalCache(settings.s3_presigned_url_cache_max_size, settings.s3_presigned_url_reuse_time)
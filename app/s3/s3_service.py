@@ -1,8 +1,9 @@
-import io
 import itertools
 import logging
+from pathlib import Path
 
-import aioboto3
+from boto3.s3.transfer import TransferConfig
+from types_aiobotocore_s3 import S3Client
 from types_aiobotocore_s3.type_defs import ObjectIdentifierTypeDef
 
 from app.core.config import settings
@@ -14,28 +15,32 @@ logging.getLogger("aiobotocore").setLevel(logging.ERROR)
 
 
 class S3Service:
-    def __init__(self, s3_session: aioboto3.Session) -> None:
+    def __init__(self, s3_client: S3Client) -> None:
+        """
+        `s3_client` is shared by the requests, see `S3ClientManager`
+        """
         self.s3_bucket = settings.s3_bucket
-        self.s3_session = s3_session
-        self.endpoint_url = settings.s3_endpoint_url
+        self.s3_client = s3_client
+        self.transfer_config = get_transfer_config()
 
     async def get_all_objects_in_folder(self, prefix: str) -> list[str]:
-        async with self.s3_session.client("s3", endpoint_url=self.endpoint_url) as s3_client:
-            paginator = s3_client.get_paginator("list_objects_v2")
+        paginator = self.s3_client.get_paginator("list_objects_v2")
 
-            all_objects = []
+        all_objects = []
 
-            async for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=prefix):
-                # Collect only the objects keys
-                if "Contents" in page:
-                    objects = [x["Key"] for x in page["Contents"]]
-                    all_objects.extend(objects)
+        async for page in paginator.paginate(Bucket=self.s3_bucket, Prefix=prefix):
+            # Collect only the objects keys
+            if "Contents" in page:
+                objects = [x["Key"] for x in page["Contents"]]
+                all_objects.extend(objects)
 
         return all_objects
 
-    async def upload_fileobj(self, fileobj: io.BytesIO, key: str) -> None:
-        async with self.s3_session.client("s3", endpoint_url=self.endpoint_url) as s3_client:
-            await s3_client.upload_fileobj(fileobj, self.s3_bucket, key)
+    async def upload_file(self, path: Path, key: str) -> None:
+        """
+        Streams the file from the disk, only the parts being uploaded are kept in memory
+        """
+        await self.s3_client.upload_file(str(path), self.s3_bucket, key, Config=self.transfer_config)
 
     async def delete_folder(self, prefix: str) -> None:
         all_objects = await self.get_all_objects_in_folder(prefix)
@@ -43,26 +48,38 @@ class S3Service:
         await self.delete_objects(all_objects)
 
     async def delete_object(self, key: str) -> None:
-        async with self.s3_session.client("s3", endpoint_url=self.endpoint_url) as s3_client:
-            await s3_client.delete_object(Bucket=self.s3_bucket, Key=key)
+        await self.s3_client.delete_object(Bucket=self.s3_bucket, Key=key)
 
     async def delete_objects(self, keys: list[str]) -> None:
-        async with self.s3_session.client("s3", endpoint_url=self.endpoint_url) as s3_client:
-            objects_list: dict[str, list[ObjectIdentifierTypeDef]] = {"Objects": []}
+        objects_list: dict[str, list[ObjectIdentifierTypeDef]] = {"Objects": []}
 
-            for key in keys:
-                objects_list["Objects"].append({"Key": key})
+        for key in keys:
+            objects_list["Objects"].append({"Key": key})
 
-            for batched_objects in itertools.batched(objects_list["Objects"], 1000):
-                await s3_client.delete_objects(
-                    Bucket=self.s3_bucket,
-                    Delete={"Objects": batched_objects},
-                )
+        for batched_objects in itertools.batched(objects_list["Objects"], 1000):
+            await self.s3_client.delete_objects(
+                Bucket=self.s3_bucket,
+                Delete={"Objects": batched_objects},
+            )
 
     async def get_presigned_url(self, key: str) -> str:
-        async with self.s3_session.client("s3", endpoint_url=self.endpoint_url) as s3_client:
-            return await s3_client.generate_presigned_url(
-                "get_object",
-                Params={"Bucket": self.s3_bucket, "Key": key},
-                HttpMethod="GET",
-            )
+        return await self.s3_client.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": self.s3_bucket, "Key": key},
+            ExpiresIn=settings.s3_presigned_url_expiration,
+            HttpMethod="GET",
+        )
+
+
+def get_transfer_config() -> TransferConfig:
+    """
+    aioboto3 uploads `max_concurrency` parts of a file at the same time and reads one part per `io_chunksize`.
+    The read parts wait in the queue of `max_io_queue` parts, it's bounded by the concurrency to bound the memory.
+    """
+    return TransferConfig(
+        multipart_threshold=settings.s3_multipart_threshold,
+        multipart_chunksize=settings.s3_multipart_chunksize,
+        max_concurrency=settings.s3_multipart_concurrency,
+        max_io_queue=settings.s3_multipart_concurrency,
+        io_chunksize=settings.s3_multipart_chunksize,
+    )
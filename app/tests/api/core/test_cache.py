@@ -0,0 +1,357 @@
+import asyncio
+import json
+from typing import Any, AsyncIterator
+from unittest import mock
+
+import pytest
+import pytest_mock
+from fastapi_cache.backends.redis import RedisBackend
+
+from app.core.cache import (
+    CACHE_INVALIDATION_CHANNEL,
+    LocalCache,
+    RawJSONCoder,
+    TwoTierCacheBackend,
+    get_json_response,
+)
+
+
+@pytest.fixture()
+def mock_redis() -> mock.MagicMock:
+    redis = mock.MagicMock()
+    redis.publish = mock.AsyncMock()
+    redis.set = mock.AsyncMock(return_value=True)
+    redis.delete = mock.AsyncMock()
+    redis.get = mock.AsyncMock(return_value=None)
+
+    return redis
+
+
+@pytest.fixture()
+def two_tier_cache_backend(mock_redis: mock.MagicMock) -> TwoTierCacheBackend:
+    return TwoTierCacheBackend(
+        mock_redis,
+        local_max_size=2,
+        local_ttl=30,
+        stale_ttl=60,
+        lock_timeout=1,
+        prefix="fastapi-cache-test",
+    )
+
+
+class TestLocalCache:
+    def test_get_and_set(self):
+        local_cache = LocalCache(max_size=2, ttl=30)
+
+        local_cache.set("key", "value", 100)
+        ttl, value = local_cache.get("key")
+
+        assert value == "value"
+        assert 0 < ttl <= 100
+        assert local_cache.get("missing") is None
+
+    def test_lru_eviction(self):
+        local_cache = LocalCache(max_size=2, ttl=30)
+
+        local_cache.set("key-1", "value-1", 100)
+        local_cache.set("key-2", "value-2", 100)
+        local_cache.get("key-1")
+        local_cache.set("key-3", "value-3", 100)
+
+        assert local_cache.get("key-1") is not None
+        assert local_cache.get("key-2") is None
+        assert local_cache.get("key-3") is not None
+
+    @pytest.mark.parametrize(
+        ("local_ttl", "redis_ttl"),
+        [
+            (0, 100),
+            (30, 0),
+        ],
+    )
+    def test_expiration(self, local_ttl: int, redis_ttl: int):
+        local_cache = LocalCache(max_size=2, ttl=local_ttl)
+
+        local_cache.set("key", "value", redis_ttl)
+
+        assert local_cache.get("key") is None
+        assert len(local_cache) == 0
+
+    def test_clear(self):
+        local_cache = LocalCache(max_size=3, ttl=30)
+
+        local_cache.set("prefix:namespace:key-1", "value-1", 100)
+        local_cache.set("prefix:namespace:key-2", "value-2", 100)
+        local_cache.set("prefix:other:key-3", "value-3", 100)
+
+        local_cache.clear(key="prefix:namespace:key-1")
+        assert local_cache.get("prefix:namespace:key-1") is None
+
+        local_cache.clear(namespace="prefix:namespace")
+        assert local_cache.get("prefix:namespace:key-2") is None
+        assert local_cache.get("prefix:other:key-3") is not None
+
+
+@pytest.mark.asyncio()
+class TestTwoTierCacheBackend:
+    async def test_get_with_ttl_from_redis_once(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+    ):
+        mock_redis_get_with_ttl = mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(160, "value"))
+
+        assert await two_tier_cache_backend.get_with_ttl("key") == (100, "value")
+        ttl, value = await two_tier_cache_backend.get_with_ttl("key")
+
+        assert value == "value"
+        assert ttl <= 100
+        mock_redis_get_with_ttl.assert_awaited_once_with("key")
+
+    async def test_get_with_ttl_missing(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(-2, None))
+
+        assert await two_tier_cache_backend.get_with_ttl("key") == (0, None)
+        assert len(two_tier_cache_backend.local_cache) == 0
+        mock_redis.set.assert_awaited_once_with("key:lock", 1, nx=True, ex=1)
+
+    async def test_get_with_ttl_stale_while_recomputed_by_other_worker(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(30, "stale-value"))
+        mock_redis.set.return_value = None
+
+        assert await two_tier_cache_backend.get_with_ttl("key") == (0, "stale-value")
+        assert len(two_tier_cache_backend.local_cache) == 0
+
+    async def test_get_with_ttl_recomputed_by_other_worker(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch("app.core.cache.RECOMPUTATION_POLL_INTERVAL", 0)
+        mocker.patch.object(RedisBackend, "get_with_ttl", side_effect=[(-2, None), (-2, None), (160, "value")])
+        mock_redis.set.return_value = None
+
+        assert await two_tier_cache_backend.get_with_ttl("key") == (100, "value")
+
+    async def test_get_with_ttl_single_flight(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(-2, None))
+        mock_redis_set = mocker.patch.object(RedisBackend, "set")
+
+        assert await two_tier_cache_backend.get_with_ttl("key") == (0, None)
+
+        waiting_requests = asyncio.gather(
+            two_tier_cache_backend.get_with_ttl("key"),
+            two_tier_cache_backend.get_with_ttl("key"),
+        )
+        await asyncio.sleep(0)
+        await two_tier_cache_backend.set("key", "value", 100)
+
+        assert await waiting_requests == [(100, "value"), (100, "value")]
+        mock_redis.set.assert_awaited_once()
+        mock_redis_set.assert_awaited_once_with("key", "value", 160)
+        mock_redis.delete.assert_awaited_once_with("key:lock")
+
+    async def test_get_with_ttl_single_flight_failed(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+    ):
+        mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(-2, None))
+
+        assert await two_tier_cache_backend.get_with_ttl("key") == (0, None)
+
+        # The first request doesn't call `set`, so the waiting one recomputes the value after the lock timeout
+        assert await two_tier_cache_backend.get_with_ttl("key") == (0, None)
+
+    async def test_release(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(-2, None))
+
+        assert await two_tier_cache_backend.get_with_ttl("key") == (0, None)
+
+        waiting_request = asyncio.ensure_future(two_tier_cache_backend.get_with_ttl("key"))
+        await asyncio.sleep(0)
+        await two_tier_cache_backend.release("key")
+
+        # The waiting request recomputes the value without waiting for the lock timeout
+        assert await asyncio.wait_for(waiting_request, 0.1) == (0, None)
+        mock_redis.delete.assert_awaited_once_with("key:lock")
+
+    async def test_set(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+    ):
+        mock_redis_set = mocker.patch.object(RedisBackend, "set")
+
+        await two_tier_cache_backend.set("key", "value", 100)
+
+        mock_redis_set.assert_awaited_once_with("key", "value", 160)
+        assert await two_tier_cache_backend.get("key") == "value"
+
+    async def test_set_cleared_while_recomputed(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(-2, None))
+        mocker.patch.object(RedisBackend, "clear")
+        mock_redis_set = mocker.patch.object(RedisBackend, "set")
+
+        assert await two_tier_cache_backend.get_with_ttl("fastapi-cache-test:namespace::key") == (0, None)
+
+        # The namespace is cleared before the recomputed value is stored
+        await two_tier_cache_backend.clear_namespace("namespace")
+        await two_tier_cache_backend.set("fastapi-cache-test:namespace::key", "value", 100)
+
+        mock_redis_set.assert_not_awaited()
+        mock_redis.delete.assert_awaited_once_with("fastapi-cache-test:namespace::key:lock")
+        assert len(two_tier_cache_backend.local_cache) == 0
+
+        # The next recomputation isn't affected
+        assert await two_tier_cache_backend.get_with_ttl("fastapi-cache-test:namespace::key") == (0, None)
+        await two_tier_cache_backend.set("fastapi-cache-test:namespace::key", "value", 100)
+
+        mock_redis_set.assert_awaited_once_with("fastapi-cache-test:namespace::key", "value", 160)
+
+    async def test_clear(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "set")
+        mock_redis_clear = mocker.patch.object(RedisBackend, "clear", return_value=1)
+        await two_tier_cache_backend.set("key", "value", 100)
+
+        assert await two_tier_cache_backend.clear(key="key") == 1
+
+        mock_redis_clear.assert_awaited_once_with(None, "key")
+        mock_redis.publish.assert_awaited_once_with(
+            CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"namespace": None, "key": "key"}),
+        )
+        assert len(two_tier_cache_backend.local_cache) == 0
+
+    async def test_clear_namespace(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "set")
+        mock_redis_clear = mocker.patch.object(RedisBackend, "clear")
+        await two_tier_cache_backend.set("fastapi-cache-test:namespace::key", "value", 100)
+        await two_tier_cache_backend.set("fastapi-cache-test:other::key", "value", 100)
+
+        await two_tier_cache_backend.clear_namespace("namespace")
+
+        mock_redis_clear.assert_awaited_once_with("fastapi-cache-test:namespace", None)
+        mock_redis.publish.assert_awaited_once_with(
+            CACHE_INVALIDATION_CHANNEL,
+            json.dumps({"namespace": "fastapi-cache-test:namespace", "key": None}),
+        )
+        assert await two_tier_cache_backend.get("fastapi-cache-test:namespace::key") is None
+        assert await two_tier_cache_backend.get("fastapi-cache-test:other::key") == "value"
+
+    async def test_listen_for_invalidations(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        mocker.patch.object(RedisBackend, "get_with_ttl", return_value=(-2, None))
+        mock_redis_set = mocker.patch.object(RedisBackend, "set")
+        local_cache = two_tier_cache_backend.local_cache
+        local_cache.max_size = 3
+
+        # The value recomputed by this worker while another one clears it
+        assert await two_tier_cache_backend.get_with_ttl("namespace:key-4") == (0, None)
+
+        async def listen() -> AsyncIterator[dict[str, Any]]:
+            local_cache.set("key-1", "value-1", 100)
+            local_cache.set("key-2", "value-2", 100)
+            local_cache.set("namespace:key-3", "value-3", 100)
+
+            yield {"type": "subscribe", "data": 1}
+            yield {"type": "message", "data": json.dumps({"namespace": None, "key": "key-1"}).encode()}
+            yield {"type": "message", "data": json.dumps({"namespace": "namespace", "key": None}).encode()}
+
+            raise asyncio.CancelledError
+
+        mock_pubsub = mock.AsyncMock()
+        mock_pubsub.listen = listen
+        mock_redis.pubsub.return_value.__aenter__.return_value = mock_pubsub
+
+        with pytest.raises(asyncio.CancelledError):
+            await two_tier_cache_backend.listen_for_invalidations()
+
+        mock_pubsub.subscribe.assert_awaited_once_with(CACHE_INVALIDATION_CHANNEL)
+        assert local_cache.get("key-1") is None
+        assert local_cache.get("key-2") is not None
+        assert local_cache.get("namespace:key-3") is None
+
+        await two_tier_cache_backend.set("namespace:key-4", "value-4", 100)
+        mock_redis_set.assert_not_awaited()
+
+    async def test_publish_and_subscribe(
+        self,
+        two_tier_cache_backend: TwoTierCacheBackend,
+        mock_redis: mock.MagicMock,
+    ):
+        other_backend = TwoTierCacheBackend(mock_redis, local_max_size=2, local_ttl=30, stale_ttl=60, lock_timeout=1)
+        handler = mock.Mock(side_effect=[None, ValueError])
+        two_tier_cache_backend.subscribe("name", handler)
+
+        await two_tier_cache_backend.publish("name", ["own-data"])
+        await other_backend.publish("name", ["data"])
+        await other_backend.publish("other-name", ["data"])
+        await other_backend.publish("name", ["invalid-data"])
+        messages = [call.args[1] for call in mock_redis.publish.await_args_list]
+
+        async def listen() -> AsyncIterator[dict[str, Any]]:
+            for message in messages:
+                yield {"type": "message", "data": message.encode()}
+
+            raise asyncio.CancelledError
+
+        mock_pubsub = mock.AsyncMock()
+        mock_pubsub.listen = listen
+        mock_redis.pubsub.return_value.__aenter__.return_value = mock_pubsub
+
+        with pytest.raises(asyncio.CancelledError):
+            await two_tier_cache_backend.listen_for_invalidations()
+
+        # The messages of this worker and the failed handlers are skipped
+        assert handler.call_args_list == [mock.call(["data"]), mock.call(["invalid-data"])]
+
+
+class TestRawJSONCoder:
+    @pytest.mark.parametrize("body", [b'{"items":[]}', b'[{"text":"\xc3\xa9"}]'])
+    def test_encode_and_decode(self, body: bytes):
+        encoded = RawJSONCoder.encode(get_json_response(body))
+        response = RawJSONCoder.decode(encoded)
+
+        assert response.body == body
+        assert response.media_type == "application/json"
@@ -0,0 +1,90 @@
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+from fastapi import FastAPI, HTTPException, status
+from fastapi.middleware.gzip import GZipMiddleware
+from httpx import ASGITransport, AsyncClient
+
+from app.core.middleware import ETagMiddleware
+
+
+@pytest.fixture()
+def etag_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items", name="items:get-items")
+    async def get_items() -> list[str]:
+        return ["item"] * 1000
+
+    @app.get("/items/{item_id}", name="items:get-item")
+    async def get_item(item_id: int) -> str:
+        if item_id != 1:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+
+        return "item"
+
+    @app.get("/other", name="other")
+    async def get_other() -> str:
+        return "other"
+
+    app.add_middleware(ETagMiddleware, route_names=["items:get-items", "items:get-item"])
+    app.add_middleware(GZipMiddleware, minimum_size=100)
+
+    return app
+
+
+@pytest_asyncio.fixture
+async def etag_client(etag_app: FastAPI) -> AsyncIterator[AsyncClient]:
+    async with AsyncClient(transport=ASGITransport(app=etag_app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.mark.asyncio()
+class TestETagMiddleware:
+    async def test_etag(self, etag_client: AsyncClient):
+        result = await etag_client.get("/items/1")
+        etag = result.headers["ETag"]
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == "item"
+        assert etag.startswith('W/"')
+        assert (await etag_client.get("/items/1")).headers["ETag"] == etag
+
+    @pytest.mark.parametrize("if_none_match", ["{etag}", "{strong_etag}", '"other", {etag}', "*"])
+    async def test_not_modified(self, etag_client: AsyncClient, if_none_match: str):
+        etag = (await etag_client.get("/items/1")).headers["ETag"]
+
+        result = await etag_client.get(
+            "/items/1",
+            headers={"If-None-Match": if_none_match.format(etag=etag, strong_etag=etag.removeprefix("W/"))},
+        )
+
+        assert result.status_code == status.HTTP_304_NOT_MODIFIED
+        assert result.content == b""
+        assert result.headers["ETag"] == etag
+        assert "Content-Length" not in result.headers
+
+    async def test_modified(self, etag_client: AsyncClient):
+        result = await etag_client.get("/items/1", headers={"If-None-Match": 'W/"other"'})
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == "item"
+
+    @pytest.mark.parametrize("path", ["/items/2", "/other"])
+    async def test_without_etag(self, etag_client: AsyncClient, path: str):
+        result = await etag_client.get(path, headers={"If-None-Match": "*"})
+
+        assert result.status_code != status.HTTP_304_NOT_MODIFIED
+        assert "ETag" not in result.headers
+
+    async def test_compressed(self, etag_client: AsyncClient):
+        result = await etag_client.get("/items", headers={"Accept-Encoding": "gzip"})
+        not_modified_result = await etag_client.get(
+            "/items",
+            headers={"Accept-Encoding": "gzip", "If-None-Match": result.headers["ETag"]},
+        )
+
+        assert result.headers["Content-Encoding"] == "gzip"
+        assert result.json() == ["item"] * 1000
+        assert not_modified_result.status_code == status.HTTP_304_NOT_MODIFIED
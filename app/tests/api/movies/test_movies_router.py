@@ -42,6 +42,22 @@ class TestGetAllMoviesRoute:
         assert result.status_code == status.HTTP_200_OK
         mock_movies_service.get_all.assert_awaited_once()
 
+    async def test_not_modified(
+        self,
+        app_with_dependency_overrides: FastAPI,
+        mock_movies_service: mock.AsyncMock,
+        movie_model_data: MovieModel,
+        async_client: AsyncClient,
+    ):
+        mock_movies_service.get_all.return_value = [movie_model_data]
+        url = app_with_dependency_overrides.url_path_for("movies:get-all-movies")
+
+        etag = (await async_client.get(url)).headers["ETag"]
+        result = await async_client.get(url, headers={"If-None-Match": etag})
+
+        assert result.status_code == status.HTTP_304_NOT_MODIFIED
+        assert result.content == b""
+
 
 @pytest.mark.asyncio()
 class TestCreateMovieRoute:
@@ -8,6 +8,10 @@ import pytest_mock
 from app.api.movies.models import MovieModel
 from app.api.movies.schemas import MovieCreateSchema, MovieUpdateSchema
 from app.api.movies.service import MoviesService
+from app.api.phrases.search_index import PhrasesSearchIndex
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
+from app.api.phrases.utils import normalize_phrase_text
+from app.core.cache import PHRASES_SEARCH_CACHE_NAMESPACE
 from app.core.config import settings
 from app.core.constants import MovieStatus
 
@@ -52,6 +56,7 @@ class TestMoviesService:
         assert result == movie_model_data
         mock_movies_repository.get_by_id.assert_awaited_once_with(random_movie_id)
 
+    @pytest.mark.parametrize("is_active", [True, False])
     async def test_update_movie(
         self,
         movies_service: MoviesService,
@@ -59,7 +64,10 @@ class TestMoviesService:
         random_movie_id: uuid.UUID,
         movie_update_schema_data: MovieUpdateSchema,
         movie_model_data: MovieModel,
+        mock_cache_backend: mock.AsyncMock,
+        is_active: bool,
     ):
+        movie_model_data.is_active = is_active
         mock_movies_repository.update.return_value = movie_model_data
         result = await movies_service.update(random_movie_id, movie_update_schema_data)
 
@@ -68,6 +76,7 @@ class TestMoviesService:
             random_movie_id,
             movie_update_schema_data,
         )
+        mock_cache_backend.clear_namespace.assert_awaited_once_with(PHRASES_SEARCH_CACHE_NAMESPACE)
 
     async def test_delete_movie(
         self,
@@ -76,6 +85,7 @@ class TestMoviesService:
         random_movie_id: uuid.UUID,
         mock_s3_service: mock.AsyncMock,
         mocker: pytest_mock.MockerFixture,
+        mock_cache_backend: mock.AsyncMock,
     ):
         background_tasks_mock = mocker.patch("fastapi.BackgroundTasks.add_task")
         mock_movies_repository.delete.return_value = None
@@ -86,6 +96,53 @@ class TestMoviesService:
         assert result is None
         mock_movies_repository.delete.assert_awaited_once_with(random_movie_id)
         background_tasks_mock.add_task.assert_called_once_with(mock_s3_service.delete_folder, expected_movie_s3_path)
+        mock_cache_backend.clear_namespace.assert_awaited_once_with(PHRASES_SEARCH_CACHE_NAMESPACE)
+
+    async def test_update_movie_updates_phrases_indexes(
+        self,
+        movies_service_with_phrases_indexes: MoviesService,
+        mock_movies_repository: mock.AsyncMock,
+        mock_phrases_repository: mock.AsyncMock,
+        phrases_search_index: PhrasesSearchIndex,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        random_movie_id: uuid.UUID,
+        movie_update_schema_data: MovieUpdateSchema,
+        movie_model_data: MovieModel,
+    ):
+        phrase_id = uuid.uuid4()
+        phrases_search_index.load([])
+        phrases_suggest_index.load([])
+        mock_movies_repository.update.return_value = movie_model_data
+        # Phrases of the movie become public when it's activated
+        mock_phrases_repository.get_all_for_search_index.side_effect = [
+            [],
+            [(phrase_id, random_movie_id, normalize_phrase_text("The bad news"))],
+        ]
+
+        await movies_service_with_phrases_indexes.update(random_movie_id, movie_update_schema_data)
+
+        mock_phrases_repository.get_all_for_search_index.assert_awaited_with(movie_id=random_movie_id)
+        assert phrases_search_index.search(normalize_phrase_text("bad news"), 1, 10) == ([phrase_id], 1)
+        assert phrases_suggest_index.suggest("bad", 10) == ["bad", "bad news"]
+
+    async def test_delete_movie_updates_phrases_indexes(
+        self,
+        movies_service_with_phrases_indexes: MoviesService,
+        mock_phrases_repository: mock.AsyncMock,
+        phrases_search_index: PhrasesSearchIndex,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        random_movie_id: uuid.UUID,
+        mocker: pytest_mock.MockerFixture,
+    ):
+        phrases = [(uuid.uuid4(), random_movie_id, normalize_phrase_text("The bad news"))]
+        phrases_search_index.load(phrases)
+        phrases_suggest_index.load(normalized_text for _, _, normalized_text in phrases)
+        mock_phrases_repository.get_all_for_search_index.return_value = phrases
+
+        await movies_service_with_phrases_indexes.delete(random_movie_id, mocker.MagicMock())
+
+        assert phrases_search_index.search(normalize_phrase_text("bad news"), 1, 10) == ([], 0)
+        assert phrases_suggest_index.suggest("bad", 10) == []
 
     async def test_exists(
         self,
@@ -0,0 +1,89 @@
+import uuid
+
+import orjson
+import pytest
+
+from app.api.phrases.fragments import PhrasesSearchFragments
+from app.api.phrases.schemas import PaginatedPhrasesBySearchTextSchema, PhraseBySearchTextSchema
+
+
+@pytest.fixture()
+def phrases_page(
+    paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+) -> PaginatedPhrasesBySearchTextSchema:
+    items = [
+        phrase_by_search_text_schema_data.model_copy(
+            update={
+                "id": uuid.uuid4(),
+                "matched_phrase": "Hello",
+                "matched_phrase_span": (0, 5),
+                "headline": '<b>Hello</b>, "there"',
+            },
+        ),
+        phrase_by_search_text_schema_data.model_copy(update={"id": uuid.uuid4(), "scene_s3_key": None}),
+    ]
+
+    return paginated_phrases_by_search_text_schema_data.model_copy(update={"items": items, "total": None})
+
+
+class TestPhrasesSearchFragments:
+    def test_render_page(
+        self,
+        phrases_search_fragments: PhrasesSearchFragments,
+        phrases_page: PaginatedPhrasesBySearchTextSchema,
+    ):
+        expected_result = orjson.dumps(phrases_page.model_dump(mode="json"))
+
+        assert phrases_search_fragments.render_page(phrases_page) == expected_result
+        # The second time the fragments are taken from the cache
+        assert phrases_search_fragments.render_page(phrases_page) == expected_result
+        assert len(phrases_search_fragments) == len(phrases_page.items)
+
+    def test_render_pages(
+        self,
+        phrases_search_fragments: PhrasesSearchFragments,
+        phrases_page: PaginatedPhrasesBySearchTextSchema,
+    ):
+        result = phrases_search_fragments.render_pages([phrases_page, phrases_page])
+
+        assert orjson.loads(result) == [phrases_page.model_dump(mode="json")] * 2
+
+    def test_render_item_with_search_fields(
+        self,
+        phrases_search_fragments: PhrasesSearchFragments,
+        phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+    ):
+        phrases_search_fragments.render_item(phrase_by_search_text_schema_data)
+        item = phrase_by_search_text_schema_data.model_copy(
+            update={"matched_phrase": "text", "matched_phrase_span": (0, 4), "headline": "<b>text</b>"},
+        )
+
+        assert phrases_search_fragments.render_item(item) == orjson.dumps(item.model_dump(mode="json"))
+        assert len(phrases_search_fragments) == 1
+
+    def test_render_item_updated(
+        self,
+        phrases_search_fragments: PhrasesSearchFragments,
+        phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+    ):
+        phrases_search_fragments.render_item(phrase_by_search_text_schema_data)
+        movie = phrase_by_search_text_schema_data.movie.model_copy(update={"title": "New title"})
+        item = phrase_by_search_text_schema_data.model_copy(
+            update={"full_text": "New text", "scene_s3_key": "movies/new/scene.mp4", "movie": movie},
+        )
+
+        assert phrases_search_fragments.render_item(item) == orjson.dumps(item.model_dump(mode="json"))
+        assert len(phrases_search_fragments) == 2
+
+    def test_max_size(
+        self,
+        phrases_search_fragments: PhrasesSearchFragments,
+        phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+    ):
+        items = [phrase_by_search_text_schema_data.model_copy(update={"id": uuid.uuid4()}) for _ in range(3)]
+
+        for item in items:
+            phrases_search_fragments.render_item(item)
+
+        assert len(phrases_search_fragments) == phrases_search_fragments.max_size
@@ -1,6 +1,8 @@
 import uuid
 
 import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.movies.models import MovieModel
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
@@ -8,11 +10,13 @@ from app.api.phrases.repository import PhrasesRepository
 from app.api.phrases.schemas import (
     PhraseCreateSchema,
     PhraseIssueCreateSchema,
+    PhraseSearchFiltersSchema,
     PhraseTransferSchema,
     PhraseUpdateSchema,
 )
 from app.api.phrases.utils import normalize_phrase_text
 from app.core.config import settings
+from app.core.constants import Languages, PhraseSearchCount
 from app.core.exceptions import RepositoryNotFoundError
 
 
@@ -77,7 +81,7 @@ class TestPhrasesRepository:
 
         result = await phrases_repository.delete(phrase_fixture.id)
 
-        assert result == scene_s3_key
+        assert result == (phrase_fixture.movie_id, scene_s3_key, phrase_fixture.normalized_text)
         exists = await phrases_repository.exists(phrase_fixture.id)
         assert exists is False
 
@@ -98,13 +102,14 @@ class TestPhrasesRepository:
         phrases_repository: PhrasesRepository,
         phrase_update_schema_data: PhraseUpdateSchema,
     ):
-        result = await phrases_repository.update(
+        result, indexed_text = await phrases_repository.update(
             phrase_fixture.id,
             phrase_update_schema_data,
         )
 
         assert result.id == phrase_fixture.id
         assert result.scene_s3_key == phrase_update_schema_data.scene_s3_key
+        assert indexed_text == phrase_fixture.normalized_text
 
     async def test_update_not_found(
         self,
@@ -261,6 +266,162 @@ class TestPhrasesRepository:
 
         assert len(result.items) == expected_count
 
+    @pytest.mark.parametrize(
+        ("search_text", "expected_count"),
+        [
+            ("apples and bananas", 1),
+            ("banana", 1),
+            ('"bananas apples"', 0),
+            ("apples -oranges", 0),
+            ("grapes", 0),
+        ],
+    )
+    async def test_get_by_full_text_search(
+        self,
+        phrases_repository: PhrasesRepository,
+        phrase_fixture: PhraseModel,
+        search_text: str,
+        expected_count: int,
+    ):
+        result = await phrases_repository.get_by_full_text_search(search_text, page=1)
+
+        assert len(result.items) == expected_count
+
+        if expected_count:
+            assert result.items[0].headline is not None
+            assert "<b>" in result.items[0].headline
+
+    @pytest.mark.parametrize(
+        ("search_text", "expected_count"),
+        [
+            ("bananas", 1),
+            ("banannas", 1),
+            ("aples and oranges", 1),
+            ("grapes", 0),
+        ],
+    )
+    async def test_get_by_fuzzy_search(
+        self,
+        phrases_repository: PhrasesRepository,
+        phrase_fixture: PhraseModel,
+        search_text: str,
+        expected_count: int,
+    ):
+        result = await phrases_repository.get_by_fuzzy_search(normalize_phrase_text(search_text).strip(), page=1)
+
+        assert len(result.items) == expected_count
+
+    @pytest.mark.parametrize(
+        ("count", "page", "expected_total"),
+        [
+            (PhraseSearchCount.EXACT, 1, 1),
+            (PhraseSearchCount.ESTIMATE, 1, 1),
+            (PhraseSearchCount.ESTIMATE, 2, 1),
+            (PhraseSearchCount.NONE, 1, 1),
+        ],
+    )
+    async def test_get_by_search_text_count(
+        self,
+        phrases_repository: PhrasesRepository,
+        phrase_fixture: PhraseModel,
+        count: PhraseSearchCount,
+        page: int,
+        expected_total: int,
+    ):
+        result = await phrases_repository.get_by_search_text(normalize_phrase_text("bananas"), page, count)
+
+        assert result.total == expected_total
+        assert len(result.items) == (1 if page == 1 else 0)
+
+    @pytest.mark.parametrize(
+        ("filters", "is_found"),
+        [
+            (PhraseSearchFiltersSchema(year=2000, language=Languages.EN), True),
+            (PhraseSearchFiltersSchema(year=2001), False),
+            (PhraseSearchFiltersSchema(movie_id=uuid.uuid4()), False),
+        ],
+    )
+    async def test_get_by_search_text_with_filters(
+        self,
+        phrases_repository: PhrasesRepository,
+        phrase_fixture: PhraseModel,
+        filters: PhraseSearchFiltersSchema,
+        is_found: bool,
+    ):
+        search_text = normalize_phrase_text("bananas")
+
+        result = await phrases_repository.get_by_search_text(search_text, 1, PhraseSearchCount.EXACT, filters)
+        assert [phrase.id for phrase in result.items] == ([phrase_fixture.id] if is_found else [])
+
+        result = await phrases_repository.get_by_full_text_search("bananas", 1, PhraseSearchCount.EXACT, filters)
+        assert [phrase.id for phrase in result.items] == ([phrase_fixture.id] if is_found else [])
+
+        phrases = await phrases_repository.get_by_search_text_after(search_text, None, 10, filters)
+        assert [phrase.id for phrase in phrases] == ([phrase_fixture.id] if is_found else [])
+
+    async def test_get_by_search_text_movie_id_filter(
+        self,
+        phrases_repository: PhrasesRepository,
+        phrase_fixture: PhraseModel,
+    ):
+        filters = PhraseSearchFiltersSchema(movie_id=phrase_fixture.movie_id)
+
+        result = await phrases_repository.get_by_search_text(normalize_phrase_text("bananas"), 1, filters=filters)
+
+        assert [phrase.id for phrase in result.items] == [phrase_fixture.id]
+
+    @pytest.mark.parametrize(
+        ("model", "model_id_attribute"),
+        [
+            (PhraseModel, "id"),
+            (MovieModel, "movie_id"),
+        ],
+    )
+    async def test_get_by_search_text_skips_hidden(
+        self,
+        db: AsyncSession,
+        phrases_repository: PhrasesRepository,
+        phrase_fixture: PhraseModel,
+        model: type[PhraseModel | MovieModel],
+        model_id_attribute: str,
+    ):
+        search_text = normalize_phrase_text("bananas")
+        hide_query = (
+            update(model).where(model.id == getattr(phrase_fixture, model_id_attribute)).values(is_active=False)
+        )
+
+        await db.execute(hide_query)
+        await db.commit()
+
+        assert (await phrases_repository.get_by_search_text(search_text)).items == []
+        assert (await phrases_repository.get_by_full_text_search("bananas")).items == []
+        assert await phrases_repository.get_by_search_text_after(search_text, None, 10) == []
+        assert await phrases_repository.get_by_ids([phrase_fixture.id]) == []
+        assert await phrases_repository.get_all_for_search_index() == []
+        assert await phrases_repository.get_all_for_suggest_index() == []
+        assert await phrases_repository.get_all_for_search_index(movie_id=phrase_fixture.movie_id) == []
+
+        await db.execute(hide_query.values(is_active=True))
+        await db.commit()
+
+        assert [phrase.id for phrase in await phrases_repository.get_by_ids([phrase_fixture.id])] == [
+            phrase_fixture.id,
+        ]
+
+    async def test_get_by_search_text_after(
+        self,
+        phrases_repository: PhrasesRepository,
+        phrase_fixture: PhraseModel,
+    ):
+        search_text = normalize_phrase_text("bananas")
+
+        result = await phrases_repository.get_by_search_text_after(search_text, None, 10)
+        assert [phrase.id for phrase in result] == [phrase_fixture.id]
+
+        after = (phrase_fixture.movie_id, phrase_fixture.start_in_movie, phrase_fixture.id)
+        result = await phrases_repository.get_by_search_text_after(search_text, after, 10)
+        assert result == []
+
     async def test_delete_by_movie_id(
         self,
         phrases_repository: PhrasesRepository,
@@ -270,7 +431,7 @@ class TestPhrasesRepository:
         existing_phrases = await phrases_repository.get_by_movie_id(random_movie_id)
         assert len(existing_phrases) == 1
 
-        await phrases_repository.delete_by_movie_id(phrase_fixture.movie_id)
+        assert await phrases_repository.delete_by_movie_id(phrase_fixture.movie_id) == [phrase_fixture.normalized_text]
 
         existing_phrases = await phrases_repository.get_by_movie_id(
             phrase_fixture.movie_id,
@@ -284,7 +445,11 @@ class TestPhrasesRepository:
         movie_fixture: MovieModel,
         phrase_transfer_schema_data: PhraseTransferSchema,
     ):
-        await phrases_repository.import_from_json(random_movie_id, [phrase_transfer_schema_data])
+        phrases = await phrases_repository.import_from_json(random_movie_id, [phrase_transfer_schema_data])
+
+        assert [(phrase.id, phrase.is_movie_active) for phrase in phrases] == [
+            (phrase_transfer_schema_data.id, movie_fixture.is_active),
+        ]
 
         result = await phrases_repository.get_by_movie_id(random_movie_id)
 
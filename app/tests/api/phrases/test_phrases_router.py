@@ -1,3 +1,4 @@
+import asyncio
 import json
 import uuid
 from typing import Callable
@@ -12,16 +13,23 @@ from app.api.movies.dependencies import movie_exists
 from app.api.phrases.dependencies import get_scenes_upload_service, phrase_exists, phrase_issue_exists
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
 from app.api.phrases.schemas import (
+    CursorPaginatedPhrasesBySearchTextSchema,
     PaginatedPhrasesBySearchTextSchema,
+    PhraseBySearchTextSchema,
     PhraseCreateSchema,
     PhraseIssueCreateSchema,
     PhraseIssueSchema,
     PhraseSchema,
+    PhraseSearchFiltersSchema,
+    PhrasesSearchQuerySchema,
     PhraseTransferSchema,
     PhraseUpdateSchema,
 )
+from app.api.phrases.utils import encode_scene_token, encode_search_cursor, get_scene_url
 from app.api.users.models import UserModel
 from app.api.users.permissions import current_superuser
+from app.core.config import settings
+from app.core.constants import Languages, PhraseSearchCount, PhraseSearchMode
 
 
 @pytest.mark.asyncio()
@@ -505,8 +513,155 @@ class TestGetPhrasesBySearchText:
         mock_phrases_service.get_by_search_text.assert_awaited_once_with(
             phrase_model_data.full_text,
             1,
+            PhraseSearchMode.SUBSTRING,
+            PhraseSearchCount.EXACT,
+            PhraseSearchFiltersSchema(),
         )
 
+    async def test_get_by_search_text_cached(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    ):
+        mock_phrases_service.get_by_search_text.return_value = paginated_phrases_by_search_text_schema_data
+        url = app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-text")
+        params = {"search_text": str(uuid.uuid4()), "page": 1}
+
+        result = await async_client.get(url, params=params)
+        cached_result = await async_client.get(url, params=params)
+
+        assert cached_result.status_code == status.HTTP_200_OK
+        assert cached_result.content == result.content
+        assert cached_result.json() == paginated_phrases_by_search_text_schema_data.model_dump(mode="json")
+        assert result.headers["Cache-Control"] == f"max-age={settings.phrases_search_client_cache_ttl}"
+        assert cached_result.headers["Cache-Control"] == result.headers["Cache-Control"]
+        mock_phrases_service.get_by_search_text.assert_awaited_once()
+
+    async def test_get_by_search_text_with_filters(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+        random_movie_id: uuid.UUID,
+    ):
+        search_text = str(uuid.uuid4())
+        mock_phrases_service.get_by_search_text.return_value = paginated_phrases_by_search_text_schema_data
+        url = app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-text")
+
+        await async_client.get(url, params={"search_text": search_text, "page": 1})
+        result = await async_client.get(
+            url,
+            params={
+                "search_text": search_text,
+                "page": 1,
+                "movie_id": str(random_movie_id),
+                "year": 2000,
+                "language": "en",
+            },
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        # Filtered results are cached separately
+        assert mock_phrases_service.get_by_search_text.await_count == 2
+        mock_phrases_service.get_by_search_text.assert_awaited_with(
+            search_text,
+            1,
+            PhraseSearchMode.SUBSTRING,
+            PhraseSearchCount.EXACT,
+            PhraseSearchFiltersSchema(movie_id=random_movie_id, year=2000, language=Languages.EN),
+        )
+
+    async def test_get_by_search_text_prefetches_next_page(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    ):
+        mock_sessionmanager = mocker.patch("app.api.phrases.router.sessionmanager")
+        search_text = str(uuid.uuid4())
+        first_page = paginated_phrases_by_search_text_schema_data.model_copy(update={"pages": 2, "has_more": True})
+        mock_phrases_service.get_by_search_text.side_effect = [
+            first_page,
+            paginated_phrases_by_search_text_schema_data,
+        ]
+        url = app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-text")
+
+        await async_client.get(url, params={"search_text": search_text, "page": 1})
+        result = await async_client.get(url, params={"search_text": search_text, "page": 2})
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == paginated_phrases_by_search_text_schema_data.model_dump(mode="json")
+        # The second page is computed once, in the background after the first response
+        mock_phrases_service.get_by_search_text.assert_has_awaits(
+            [
+                mock.call(
+                    search_text,
+                    1,
+                    PhraseSearchMode.SUBSTRING,
+                    PhraseSearchCount.EXACT,
+                    PhraseSearchFiltersSchema(),
+                ),
+                mock.call(
+                    search_text,
+                    2,
+                    PhraseSearchMode.SUBSTRING,
+                    PhraseSearchCount.EXACT,
+                    PhraseSearchFiltersSchema(),
+                ),
+            ],
+        )
+        assert mock_phrases_service.get_by_search_text.await_count == 2
+        # The request session is closed when the prefetch runs
+        mock_sessionmanager.session.assert_called_once_with()
+        mock_phrases_service.with_repository.assert_called_once()
+
+    async def test_get_by_search_text_prefetch_failed(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    ):
+        mocker.patch("app.api.phrases.router.sessionmanager")
+        mock_release_cached_phrases = mocker.patch("app.api.phrases.router._release_cached_phrases")
+        first_page = paginated_phrases_by_search_text_schema_data.model_copy(update={"pages": 2, "has_more": True})
+        mock_phrases_service.get_by_search_text.side_effect = [first_page, Exception]
+
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-text"),
+            params={"search_text": str(uuid.uuid4()), "page": 1},
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        # The requests waiting for the next page don't wait for the lock timeout
+        mock_release_cached_phrases.assert_awaited_once()
+
+    async def test_get_by_search_text_prefetch_skipped_at_concurrency_limit(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    ):
+        mocker.patch("app.api.phrases.router._prefetch_semaphore", asyncio.Semaphore(0))
+        first_page = paginated_phrases_by_search_text_schema_data.model_copy(update={"pages": 2, "has_more": True})
+        mock_phrases_service.get_by_search_text.return_value = first_page
+
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-text"),
+            params={"search_text": str(uuid.uuid4()), "page": 1},
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        mock_phrases_service.get_by_search_text.assert_awaited_once()
+
     @pytest.mark.parametrize(
         ("user", "expected_status_code"),
         [
@@ -540,6 +695,225 @@ class TestGetPhrasesBySearchText:
         assert result.status_code == expected_status_code
 
 
+@pytest.mark.asyncio()
+class TestGetPhrasesBySearchTexts:
+    async def test_get_by_search_texts(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    ):
+        cached_search_text = str(uuid.uuid4())
+        search_text = str(uuid.uuid4())
+        mock_phrases_service.get_by_search_text.return_value = paginated_phrases_by_search_text_schema_data
+        mock_phrases_service.get_by_search_texts.return_value = [paginated_phrases_by_search_text_schema_data]
+
+        await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-text"),
+            params={"search_text": cached_search_text, "page": 1},
+        )
+        result = await async_client.post(
+            app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-texts"),
+            json={
+                "queries": [
+                    {"search_text": cached_search_text},
+                    {"search_text": search_text, "count": "none"},
+                    {"search_text": search_text, "count": "none"},
+                ],
+            },
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == [paginated_phrases_by_search_text_schema_data.model_dump(mode="json")] * 3
+        mock_phrases_service.get_by_search_texts.assert_awaited_once_with(
+            [PhrasesSearchQuerySchema(search_text=search_text, count=PhraseSearchCount.NONE)],
+        )
+
+        # The results are cached for the single search too
+        await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-text"),
+            params={"search_text": search_text, "page": 1, "count": "none"},
+        )
+        mock_phrases_service.get_by_search_text.assert_awaited_once()
+
+    async def test_get_by_search_texts_failed(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+    ):
+        search_text = str(uuid.uuid4())
+        mock_release = mocker.patch("app.api.phrases.router._release_cached_phrases")
+        mock_phrases_service.get_by_search_texts.side_effect = RuntimeError("DB is down")
+
+        with pytest.raises(RuntimeError):
+            await async_client.post(
+                app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-texts"),
+                json={"queries": [{"search_text": search_text}]},
+            )
+
+        # The lock of the search is released, so the other requests don't wait for it
+        mock_release.assert_awaited_once()
+
+    @pytest.mark.parametrize(
+        "queries",
+        [
+            [],
+            [{"search_text": ""}],
+            [{"search_text": "text", "page": 0}],
+            [{"search_text": "text"}] * (settings.phrases_search_batch_max_size + 1),
+        ],
+    )
+    async def test_get_by_search_texts_invalid_queries(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        queries: list[dict[str, str | int]],
+    ):
+        result = await async_client.post(
+            app_with_dependency_overrides.url_path_for("phrases:get-phrases-by-search-texts"),
+            json={"queries": queries},
+        )
+
+        assert result.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_phrases_service.get_by_search_texts.assert_not_awaited()
+
+
+@pytest.mark.asyncio()
+class TestGetPhrasesBySearchTextCursor:
+    async def test_get_by_search_text_cursor(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        phrase_model_data: PhraseModel,
+        phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+    ):
+        cursor = encode_search_cursor(phrase_model_data)
+        phrases = CursorPaginatedPhrasesBySearchTextSchema(
+            items=[phrase_by_search_text_schema_data],
+            size=1,
+            next_cursor=cursor,
+        )
+        mock_phrases_service.get_by_search_text_cursor.return_value = phrases
+
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for(
+                "phrases:get-phrases-by-search-text-cursor",
+            ),
+            params={"search_text": phrase_model_data.full_text, "cursor": cursor},
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == phrases.model_dump(mode="json")
+        assert result.json()["items"][0]["scene_s3_key"] == get_scene_url(
+            phrase_by_search_text_schema_data.scene_s3_key,
+        )
+        mock_phrases_service.get_by_search_text_cursor.assert_awaited_once_with(
+            phrase_model_data.full_text,
+            cursor,
+            PhraseSearchFiltersSchema(),
+        )
+
+    async def test_invalid_cursor(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        phrase_model_data: PhraseModel,
+    ):
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for(
+                "phrases:get-phrases-by-search-text-cursor",
+            ),
+            params={"search_text": phrase_model_data.full_text, "cursor": "not-a-cursor"},
+        )
+
+        assert result.status_code == status.HTTP_400_BAD_REQUEST
+        mock_phrases_service.get_by_search_text_cursor.assert_not_awaited()
+
+
+@pytest.mark.asyncio()
+class TestSuggestPhrases:
+    async def test_suggest(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+    ):
+        mock_phrases_service.suggest.return_value = ["the bad", "the bad news"]
+
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:suggest-phrases"),
+            params={"prefix": "The b", "limit": 2},
+        )
+
+        assert result.status_code == status.HTTP_200_OK
+        assert result.json() == ["the bad", "the bad news"]
+        mock_phrases_service.suggest.assert_awaited_once_with("The b", 2)
+
+    @pytest.mark.parametrize(
+        "params",
+        [
+            {"prefix": ""},
+            {"prefix": "the", "limit": 0},
+            {"prefix": "the", "limit": settings.phrases_suggest_max_limit + 1},
+        ],
+    )
+    async def test_suggest_invalid_params(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_phrases_service: mock.AsyncMock,
+        params: dict[str, str | int],
+    ):
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:suggest-phrases"),
+            params=params,
+        )
+
+        assert result.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+        mock_phrases_service.suggest.assert_not_awaited()
+
+
+@pytest.mark.asyncio()
+class TestGetScene:
+    async def test_get_scene(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_presigned_url_service: mock.AsyncMock,
+        mock_presigned_url_value: str,
+        scene_s3_key: str,
+    ):
+        mock_presigned_url_service.get_presigned_url.return_value = mock_presigned_url_value
+
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:get-scene", token=encode_scene_token(scene_s3_key)),
+        )
+
+        assert result.status_code == status.HTTP_302_FOUND
+        assert result.headers["location"] == mock_presigned_url_value
+        assert result.headers["cache-control"] == f"private, max-age={settings.s3_scene_redirect_cache_ttl}"
+        mock_presigned_url_service.get_presigned_url.assert_awaited_once_with(scene_s3_key)
+
+    async def test_get_scene_invalid_token(
+        self,
+        async_client: AsyncClient,
+        app_with_dependency_overrides: FastAPI,
+        mock_presigned_url_service: mock.AsyncMock,
+    ):
+        result = await async_client.get(
+            app_with_dependency_overrides.url_path_for("phrases:get-scene", token="bW92aWVzL2tleS5tcDQ.forged"),
+        )
+
+        assert result.status_code == status.HTTP_404_NOT_FOUND
+        mock_presigned_url_service.get_presigned_url.assert_not_awaited()
+
+
 @pytest.mark.asyncio()
 class TestDeletePhrasesByMovieId:
     async def test_delete_by_movie_id(
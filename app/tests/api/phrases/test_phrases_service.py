@@ -4,20 +4,33 @@ from unittest import mock
 
 import pytest
 import pytest_mock
-from fastapi_pagination import Page
+from fastapi_pagination import Page, Params
 
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
 from app.api.phrases.schemas import (
+    CursorPaginatedPhrasesBySearchTextSchema,
     PaginatedPhrasesBySearchTextSchema,
     PhraseBySearchTextSchema,
     PhraseCreateSchema,
     PhraseIssueCreateSchema,
+    PhraseSearchFiltersSchema,
+    PhrasesSearchQuerySchema,
     PhraseTransferSchema,
     PhraseUpdateSchema,
 )
+from app.api.phrases.search_index import PHRASES_SEARCH_INDEX_CHANGES_MESSAGE, PhrasesSearchIndex
 from app.api.phrases.service import PhrasesService
-from app.api.phrases.utils import get_matched_phrase, normalize_phrase_text
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
+from app.api.phrases.utils import (
+    decode_search_cursor,
+    encode_search_cursor,
+    find_matched_phrase,
+    get_matched_phrase,
+    normalize_phrase_text,
+)
+from app.core.cache import PHRASES_SEARCH_CACHE_NAMESPACE
 from app.core.config import settings
+from app.core.constants import PhraseSearchCount, PhraseSearchMode
 
 
 @pytest.mark.asyncio()
@@ -28,20 +41,16 @@ class TestPhrasesService:
         mock_phrases_repository: mock.AsyncMock,
         phrase_create_schema_data: PhraseCreateSchema,
         phrase_model_data: PhraseModel,
-        mock_presigned_url_service: mock.AsyncMock,
+        mock_cache_backend: mock.AsyncMock,
     ):
         mock_phrases_repository.create.return_value = phrase_model_data
-        mock_presigned_url_service.update_s3_url_for_model.return_value = phrase_model_data
         phrase = await phrases_service.create(phrase_create_schema_data)
 
         assert phrase == phrase_model_data
         mock_phrases_repository.create.assert_awaited_once_with(
             phrase_create_schema_data,
         )
-        mock_presigned_url_service.update_s3_url_for_model.assert_awaited_once_with(
-            phrase_model_data,
-            "scene_s3_key",
-        )
+        mock_cache_backend.clear_namespace.assert_awaited_once_with(PHRASES_SEARCH_CACHE_NAMESPACE)
 
     async def test_get_by_id(
         self,
@@ -49,18 +58,12 @@ class TestPhrasesService:
         mock_phrases_repository: mock.AsyncMock,
         phrase_model_data: PhraseModel,
         mocker: pytest_mock.MockerFixture,
-        mock_presigned_url_service: mock.AsyncMock,
     ):
-        mock_presigned_url_service.update_s3_url_for_model.return_value = phrase_model_data
         mock_phrases_repository.get_by_id.return_value = phrase_model_data
         phrase = await phrases_service.get_by_id(phrase_model_data.id)
 
         assert phrase == phrase_model_data
         mock_phrases_repository.get_by_id.assert_awaited_once_with(phrase_model_data.id)
-        mock_presigned_url_service.update_s3_url_for_model.assert_awaited_once_with(
-            phrase_model_data,
-            "scene_s3_key",
-        )
 
     async def test_update(
         self,
@@ -68,10 +71,8 @@ class TestPhrasesService:
         mock_phrases_repository: mock.AsyncMock,
         phrase_model_data: PhraseModel,
         phrase_update_schema_data: PhraseUpdateSchema,
-        mock_presigned_url_service: mock.AsyncMock,
     ):
-        mock_phrases_repository.update.return_value = phrase_model_data
-        mock_presigned_url_service.update_s3_url_for_model.return_value = phrase_model_data
+        mock_phrases_repository.update.return_value = (phrase_model_data, phrase_model_data.normalized_text)
         phrase = await phrases_service.update(
             phrase_model_data.id,
             phrase_update_schema_data,
@@ -82,19 +83,44 @@ class TestPhrasesService:
             phrase_model_data.id,
             phrase_update_schema_data,
         )
-        mock_presigned_url_service.update_s3_url_for_model.assert_awaited_once_with(
-            phrase_model_data,
-            "scene_s3_key",
+
+    async def test_bulk_update(
+        self,
+        phrases_service: PhrasesService,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_model_data: PhraseModel,
+        phrase_update_schema_data: PhraseUpdateSchema,
+        mock_cache_backend: mock.AsyncMock,
+    ):
+        other_phrase_id = uuid.uuid4()
+        mock_phrases_repository.update.return_value = (phrase_model_data, phrase_model_data.normalized_text)
+
+        phrases = await phrases_service.bulk_update(
+            {phrase_model_data.id: phrase_update_schema_data, other_phrase_id: phrase_update_schema_data},
         )
 
+        assert phrases == [phrase_model_data, phrase_model_data]
+        mock_phrases_repository.update.assert_has_awaits(
+            [
+                mock.call(phrase_model_data.id, phrase_update_schema_data),
+                mock.call(other_phrase_id, phrase_update_schema_data),
+            ],
+        )
+        mock_cache_backend.clear_namespace.assert_awaited_once_with(PHRASES_SEARCH_CACHE_NAMESPACE)
+
     async def test_delete(
         self,
         phrases_service: PhrasesService,
         mock_phrases_repository: mock.AsyncMock,
         phrase_model_data: PhraseModel,
         mock_s3_service: mock.AsyncMock,
+        mock_cache_backend: mock.AsyncMock,
     ):
-        mock_phrases_repository.delete.return_value = phrase_model_data.scene_s3_key
+        mock_phrases_repository.delete.return_value = (
+            phrase_model_data.movie_id,
+            phrase_model_data.scene_s3_key,
+            phrase_model_data.normalized_text,
+        )
 
         result = await phrases_service.delete(phrase_model_data.id)
 
@@ -103,28 +129,21 @@ class TestPhrasesService:
         mock_s3_service.delete_object.assert_awaited_once_with(
             phrase_model_data.scene_s3_key,
         )
+        mock_cache_backend.clear_namespace.assert_awaited_once_with(PHRASES_SEARCH_CACHE_NAMESPACE)
 
     async def test_get_all(
         self,
         phrases_service: PhrasesService,
         mock_phrases_repository: mock.AsyncMock,
         phrase_model_data: PhraseModel,
-        mock_presigned_url_service: mock.AsyncMock,
     ):
         mock_phrases_repository.get_all.return_value = [phrase_model_data]
-        mock_presigned_url_service.update_s3_urls_for_models.return_value = [
-            phrase_model_data,
-        ]
 
         result = await phrases_service.get_all()
 
         assert len(result) == 1
         assert phrase_model_data in result
         mock_phrases_repository.get_all.assert_awaited_once()
-        mock_presigned_url_service.update_s3_urls_for_models.assert_awaited_once_with(
-            [phrase_model_data],
-            "scene_s3_key",
-        )
 
     async def test_exists(
         self,
@@ -157,12 +176,8 @@ class TestPhrasesService:
         phrases_service: PhrasesService,
         mock_phrases_repository: mock.AsyncMock,
         phrase_model_data: PhraseModel,
-        mock_presigned_url_service: mock.AsyncMock,
     ):
         mock_phrases_repository.get_by_movie_id.return_value = [phrase_model_data]
-        mock_presigned_url_service.update_s3_urls_for_models.return_value = [
-            [phrase_model_data],
-        ]
         result = await phrases_service.get_by_movie_id(phrase_model_data.movie_id)
 
         assert len(result) == 1
@@ -170,10 +185,6 @@ class TestPhrasesService:
         mock_phrases_repository.get_by_movie_id.assert_awaited_once_with(
             phrase_model_data.movie_id,
         )
-        mock_presigned_url_service.update_s3_urls_for_models.assert_awaited_once_with(
-            [phrase_model_data],
-            "scene_s3_key",
-        )
 
     async def test_bulk_create(
         self,
@@ -181,11 +192,7 @@ class TestPhrasesService:
         mock_phrases_repository: mock.AsyncMock,
         phrase_model_data: PhraseModel,
         phrase_create_schema_data: PhraseCreateSchema,
-        mock_presigned_url_service: mock.AsyncMock,
     ):
-        mock_presigned_url_service.update_s3_urls_for_models.return_value = [
-            [phrase_model_data],
-        ]
         mock_phrases_repository.bulk_create.return_value = [phrase_model_data]
 
         result = await phrases_service.bulk_create([phrase_create_schema_data])
@@ -195,10 +202,6 @@ class TestPhrasesService:
         mock_phrases_repository.bulk_create.assert_awaited_once_with(
             [phrase_create_schema_data],
         )
-        mock_presigned_url_service.update_s3_urls_for_models.assert_called_once_with(
-            [phrase_model_data],
-            "scene_s3_key",
-        )
 
     @pytest.mark.parametrize(
         "search_text",
@@ -210,7 +213,6 @@ class TestPhrasesService:
     )
     async def test_get_by_text(
         self,
-        mock_presigned_url_service: mock.AsyncMock,
         phrases_service: PhrasesService,
         mock_phrases_repository: mock.AsyncMock,
         phrase_search_by_phrase_model_data: PhraseModel,
@@ -218,10 +220,12 @@ class TestPhrasesService:
         paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
         search_text: str,
     ):
-        phrase_by_search_text_schema_data.matched_phrase = get_matched_phrase(
+        matched_phrase = find_matched_phrase(
             normalize_phrase_text(search_text),
             phrase_by_search_text_schema_data.full_text,
         )
+        phrase_by_search_text_schema_data.matched_phrase = matched_phrase.text
+        phrase_by_search_text_schema_data.matched_phrase_span = (matched_phrase.start, matched_phrase.end)
         mock_phrases_repository.get_by_search_text.return_value = Page(
             items=[phrase_search_by_phrase_model_data],
             total=1,
@@ -237,22 +241,279 @@ class TestPhrasesService:
         mock_phrases_repository.get_by_search_text.assert_awaited_once_with(
             normalize_phrase_text(search_text),
             1,
+            PhraseSearchCount.EXACT,
+            None,
         )
-        mock_presigned_url_service.update_s3_urls_for_models.assert_awaited_once_with(
-            [phrase_by_search_text_schema_data],
-            "scene_s3_key",
+
+    @pytest.mark.parametrize(
+        ("count", "total_from_db", "expected_total", "expected_has_more", "expected_is_total_exact"),
+        [
+            (PhraseSearchCount.ESTIMATE, 2, 2, False, True),
+            (PhraseSearchCount.ESTIMATE, 5001, 5000, True, False),
+            (PhraseSearchCount.NONE, 2, None, False, False),
+            (PhraseSearchCount.NONE, settings.phrases_page_size + 1, None, True, False),
+        ],
+    )
+    async def test_get_by_text_count(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        phrases_service: PhrasesService,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_search_by_phrase_model_data: PhraseModel,
+        count: PhraseSearchCount,
+        total_from_db: int,
+        expected_total: int | None,
+        expected_has_more: bool,
+        expected_is_total_exact: bool,
+    ):
+        mocker.patch.object(settings, "phrases_search_count_cap", 5000)
+        mock_phrases_repository.get_by_search_text.return_value = Page(
+            items=[phrase_search_by_phrase_model_data],
+            total=total_from_db,
+            page=1,
+            size=settings.phrases_page_size,
+            pages=None,
         )
 
-    async def test_delete_by_movie_id(
+        result = await phrases_service.get_by_search_text("bananas", 1, count=count)
+
+        assert result.total == expected_total
+        assert result.has_more == expected_has_more
+        assert result.is_total_exact == expected_is_total_exact
+        assert (result.pages is None) == (expected_total is None)
+        mock_phrases_repository.get_by_search_text.assert_awaited_once_with(
+            normalize_phrase_text("bananas"),
+            1,
+            count,
+            None,
+        )
+
+    async def test_get_by_text_full_text_mode(
         self,
         phrases_service: PhrasesService,
         mock_phrases_repository: mock.AsyncMock,
+        phrase_search_by_phrase_model_data: PhraseModel,
+        phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    ):
+        search_text = '"apples, bananas" -grapes'
+        phrase_by_search_text_schema_data.matched_phrase = get_matched_phrase(
+            normalize_phrase_text(search_text),
+            phrase_by_search_text_schema_data.full_text,
+        )
+        mock_phrases_repository.get_by_full_text_search.return_value = Page(
+            items=[phrase_search_by_phrase_model_data],
+            total=1,
+            page=1,
+            size=settings.phrases_page_size,
+            pages=1,
+        )
+
+        result = await phrases_service.get_by_search_text(search_text, 1, PhraseSearchMode.FULL_TEXT)
+
+        assert result == paginated_phrases_by_search_text_schema_data
+
+        mock_phrases_repository.get_by_full_text_search.assert_awaited_once_with(
+            search_text,
+            1,
+            PhraseSearchCount.EXACT,
+            None,
+        )
+        mock_phrases_repository.get_by_search_text.assert_not_awaited()
+
+    async def test_get_by_text_fuzzy_mode(
+        self,
+        phrases_service: PhrasesService,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_search_by_phrase_model_data: PhraseModel,
+    ):
+        search_text = "Aples, Banannas"
+        mock_phrases_repository.get_by_fuzzy_search.return_value = Page(
+            items=[phrase_search_by_phrase_model_data],
+            total=1,
+            page=1,
+            size=settings.phrases_page_size,
+            pages=1,
+        )
+
+        result = await phrases_service.get_by_search_text(search_text, 1, PhraseSearchMode.FUZZY)
+
+        assert [item.id for item in result.items] == [phrase_search_by_phrase_model_data.id]
+        mock_phrases_repository.get_by_fuzzy_search.assert_awaited_once_with(
+            "aples banannas",
+            1,
+            PhraseSearchCount.EXACT,
+            None,
+        )
+        mock_phrases_repository.get_by_search_text.assert_not_awaited()
+
+    @pytest.mark.parametrize(
+        ("phrases_count", "has_next_page"),
+        [
+            (1, False),
+            (settings.phrases_page_size + 1, True),
+        ],
+    )
+    async def test_get_by_text_cursor(
+        self,
+        phrases_service: PhrasesService,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_search_by_phrase_model_data: PhraseModel,
+        phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+        phrases_count: int,
+        has_next_page: bool,
+    ):
+        search_text = "bananas"
+        matched_phrase = find_matched_phrase(
+            normalize_phrase_text(search_text),
+            phrase_by_search_text_schema_data.full_text,
+        )
+        phrase_by_search_text_schema_data.matched_phrase = matched_phrase.text
+        phrase_by_search_text_schema_data.matched_phrase_span = (matched_phrase.start, matched_phrase.end)
+        mock_phrases_repository.get_by_search_text_after.return_value = [
+            phrase_search_by_phrase_model_data,
+        ] * phrases_count
+        cursor = encode_search_cursor(phrase_search_by_phrase_model_data)
+
+        result = await phrases_service.get_by_search_text_cursor(search_text, cursor)
+
+        assert result == CursorPaginatedPhrasesBySearchTextSchema(
+            items=[phrase_by_search_text_schema_data] * min(phrases_count, settings.phrases_page_size),
+            size=settings.phrases_page_size,
+            next_cursor=cursor if has_next_page else None,
+        )
+        mock_phrases_repository.get_by_search_text_after.assert_awaited_once_with(
+            normalize_phrase_text(search_text),
+            decode_search_cursor(cursor),
+            settings.phrases_page_size + 1,
+            None,
+        )
+
+    async def test_get_by_text_from_search_index(
+        self,
+        phrases_service_with_search_index: PhrasesService,
+        phrases_search_index: PhrasesSearchIndex,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_search_by_phrase_model_data: PhraseModel,
+        phrase_by_search_text_schema_data: PhraseBySearchTextSchema,
+        paginated_phrases_by_search_text_schema_data: PaginatedPhrasesBySearchTextSchema,
+    ):
+        search_text = "bananas"
+        matched_phrase = find_matched_phrase(
+            normalize_phrase_text(search_text),
+            phrase_by_search_text_schema_data.full_text,
+        )
+        phrase_by_search_text_schema_data.matched_phrase = matched_phrase.text
+        phrase_by_search_text_schema_data.matched_phrase_span = (matched_phrase.start, matched_phrase.end)
+        phrases_search_index.load(
+            [
+                (
+                    phrase_search_by_phrase_model_data.id,
+                    phrase_search_by_phrase_model_data.movie_id,
+                    phrase_search_by_phrase_model_data.normalized_text,
+                ),
+            ],
+        )
+        mock_phrases_repository.get_by_ids.return_value = [phrase_search_by_phrase_model_data]
+
+        result = await phrases_service_with_search_index.get_by_search_text(search_text, 1)
+
+        assert result == paginated_phrases_by_search_text_schema_data
+        mock_phrases_repository.get_by_ids.assert_awaited_once_with([phrase_search_by_phrase_model_data.id])
+        mock_phrases_repository.get_by_search_text.assert_not_awaited()
+
+    async def test_get_by_search_text_with_filters_skips_search_index(
+        self,
+        phrases_service_with_search_index: PhrasesService,
+        phrases_search_index: PhrasesSearchIndex,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_search_by_phrase_model_data: PhraseModel,
+    ):
+        phrases_search_index.load([])
+        filters = PhraseSearchFiltersSchema(year=2000)
+        mock_phrases_repository.get_by_search_text.return_value = Page.create(
+            [phrase_search_by_phrase_model_data],
+            Params(page=1, size=settings.phrases_page_size),
+            total=1,
+        )
+
+        result = await phrases_service_with_search_index.get_by_search_text("bananas", 1, filters=filters)
+
+        assert result.total == 1
+        mock_phrases_repository.get_by_search_text.assert_awaited_once_with(
+            normalize_phrase_text("bananas"),
+            1,
+            PhraseSearchCount.EXACT,
+            filters,
+        )
+
+    async def test_create_updates_search_index(
+        self,
+        phrases_service_with_search_index: PhrasesService,
+        phrases_search_index: PhrasesSearchIndex,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_create_schema_data: PhraseCreateSchema,
         phrase_model_data: PhraseModel,
-        mock_s3_service: mock.AsyncMock,
+        mock_cache_backend: mock.AsyncMock,
     ):
-        mock_phrases_repository.delete_by_movie_id.return_value = [
+        mock_phrases_repository.create.return_value = phrase_model_data
+        mock_phrases_repository.delete.return_value = (
+            phrase_model_data.movie_id,
             phrase_model_data.scene_s3_key,
+            phrase_model_data.normalized_text,
+        )
+
+        await phrases_service_with_search_index.create(phrase_create_schema_data)
+        assert phrases_search_index.search(normalize_phrase_text("apples"), 1, 10) == ([phrase_model_data.id], 1)
+
+        await phrases_service_with_search_index.delete(phrase_model_data.id)
+        assert phrases_search_index.search(normalize_phrase_text("apples"), 1, 10) == ([], 0)
+
+        # The other workers apply the same changes to their indexes before the cached results are cleared
+        assert mock_cache_backend.mock_calls == [
+            mock.call.publish(
+                PHRASES_SEARCH_INDEX_CHANGES_MESSAGE,
+                [
+                    (
+                        "add",
+                        str(phrase_model_data.id),
+                        str(phrase_model_data.movie_id),
+                        phrase_model_data.normalized_text,
+                    ),
+                ],
+            ),
+            mock.call.clear_namespace(PHRASES_SEARCH_CACHE_NAMESPACE),
+            mock.call.publish(PHRASES_SEARCH_INDEX_CHANGES_MESSAGE, [("remove", str(phrase_model_data.id))]),
+            mock.call.clear_namespace(PHRASES_SEARCH_CACHE_NAMESPACE),
         ]
+
+    async def test_update_removes_hidden_phrase_from_search_index(
+        self,
+        phrases_service_with_search_index: PhrasesService,
+        phrases_search_index: PhrasesSearchIndex,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_update_schema_data: PhraseUpdateSchema,
+        phrase_model_data: PhraseModel,
+    ):
+        phrases_search_index.load(
+            [(phrase_model_data.id, phrase_model_data.movie_id, phrase_model_data.normalized_text)],
+        )
+        phrase_model_data.is_active = False
+        mock_phrases_repository.update.return_value = (phrase_model_data, phrase_model_data.normalized_text)
+
+        await phrases_service_with_search_index.update(phrase_model_data.id, phrase_update_schema_data)
+
+        assert phrases_search_index.search(normalize_phrase_text("apples"), 1, 10) == ([], 0)
+
+    async def test_delete_by_movie_id(
+        self,
+        phrases_service: PhrasesService,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_model_data: PhraseModel,
+        mock_s3_service: mock.AsyncMock,
+        mock_cache_backend: mock.AsyncMock,
+    ):
+        mock_phrases_repository.delete_by_movie_id.return_value = [phrase_model_data.normalized_text]
         movie_s3_path = os.path.join(
             settings.movies_s3_path,
             str(phrase_model_data.movie_id),
@@ -265,6 +526,173 @@ class TestPhrasesService:
             phrase_model_data.movie_id,
         )
         mock_s3_service.delete_folder.assert_awaited_once_with(movie_s3_path)
+        mock_cache_backend.clear_namespace.assert_awaited_once_with(PHRASES_SEARCH_CACHE_NAMESPACE)
+
+    async def test_get_by_search_texts(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        phrases_service: PhrasesService,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_search_by_phrase_model_data: PhraseModel,
+    ):
+        mock_sessionmanager = mocker.patch("app.api.phrases.service.sessionmanager")
+        mocker.patch("app.api.phrases.service.PhrasesRepository", return_value=mock_phrases_repository)
+        queries = [
+            PhrasesSearchQuerySchema(search_text="apples"),
+            PhrasesSearchQuerySchema(search_text="bananas", count=PhraseSearchCount.NONE),
+            PhrasesSearchQuerySchema(search_text="apples"),
+        ]
+        mock_phrases_repository.get_by_search_text.return_value = Page.create(
+            [phrase_search_by_phrase_model_data],
+            Params(page=1, size=settings.phrases_page_size),
+            total=1,
+        )
+
+        result = await phrases_service.get_by_search_texts(queries)
+
+        assert len(result) == 3
+        assert result[0] is result[2]
+        assert result[0].total == 1
+        assert result[1].total is None
+        assert mock_phrases_repository.get_by_search_text.await_args_list == [
+            mock.call(normalize_phrase_text("apples"), 1, PhraseSearchCount.EXACT, PhraseSearchFiltersSchema()),
+            mock.call(normalize_phrase_text("bananas"), 1, PhraseSearchCount.NONE, PhraseSearchFiltersSchema()),
+        ]
+        # Every search runs in its own session
+        assert mock_sessionmanager.session.call_count == 2
+
+    async def test_get_by_search_texts_failed(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        phrases_service: PhrasesService,
+        mock_phrases_repository: mock.AsyncMock,
+    ):
+        mocker.patch("app.api.phrases.service.sessionmanager")
+        mocker.patch("app.api.phrases.service.PhrasesRepository", return_value=mock_phrases_repository)
+        mock_phrases_repository.get_by_search_text.side_effect = RuntimeError("DB is down")
+
+        with pytest.raises(ExceptionGroup) as exc_info:
+            await phrases_service.get_by_search_texts(
+                [PhrasesSearchQuerySchema(search_text="apples"), PhrasesSearchQuerySchema(search_text="bananas")],
+            )
+
+        assert exc_info.group_contains(RuntimeError)
+
+    @pytest.mark.parametrize(
+        ("prefix", "expected_suggestions"),
+        [
+            ("The B", ["the bad", "the best"]),
+            ("The  ", ["the bad", "the best"]),
+            ("Bad", ["bad"]),
+            ("bad ", []),
+        ],
+    )
+    async def test_suggest(
+        self,
+        phrases_service_with_suggest_index: PhrasesService,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        prefix: str,
+        expected_suggestions: list[str],
+    ):
+        phrases_suggest_index.load([normalize_phrase_text("The bad"), normalize_phrase_text("The best")])
+
+        assert await phrases_service_with_suggest_index.suggest(prefix, 2) == expected_suggestions
+
+    async def test_suggest_without_loaded_index(
+        self,
+        phrases_service: PhrasesService,
+        phrases_service_with_suggest_index: PhrasesService,
+    ):
+        assert await phrases_service.suggest("the", 10) == []
+        assert await phrases_service_with_suggest_index.suggest("the", 10) == []
+
+    async def test_bulk_create_updates_suggest_index(
+        self,
+        phrases_service_with_suggest_index: PhrasesService,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_create_schema_data: PhraseCreateSchema,
+        phrase_model_data: PhraseModel,
+    ):
+        phrases_suggest_index.load([])
+        mock_phrases_repository.bulk_create.return_value = [phrase_model_data]
+
+        await phrases_service_with_suggest_index.bulk_create([phrase_create_schema_data])
+
+        assert await phrases_service_with_suggest_index.suggest("apples b", 10) == [
+            "apples bananas",
+            "apples bananas and",
+        ]
+
+    async def test_update_adds_activated_phrase_to_suggest_index(
+        self,
+        phrases_service_with_suggest_index: PhrasesService,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_update_schema_data: PhraseUpdateSchema,
+        phrase_model_data: PhraseModel,
+    ):
+        phrases_suggest_index.load([])
+        # The phrase was inactive before the update
+        mock_phrases_repository.update.return_value = (phrase_model_data, None)
+
+        await phrases_service_with_suggest_index.update(phrase_model_data.id, phrase_update_schema_data)
+
+        assert await phrases_service_with_suggest_index.suggest("apples b", 10) == [
+            "apples bananas",
+            "apples bananas and",
+        ]
+
+    async def test_delete_removes_phrase_from_suggest_index(
+        self,
+        phrases_service_with_suggest_index: PhrasesService,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        mock_phrases_repository: mock.AsyncMock,
+        phrase_model_data: PhraseModel,
+    ):
+        phrases_suggest_index.load([phrase_model_data.normalized_text])
+        mock_phrases_repository.delete.return_value = (
+            phrase_model_data.movie_id,
+            phrase_model_data.scene_s3_key,
+            phrase_model_data.normalized_text,
+        )
+
+        await phrases_service_with_suggest_index.delete(phrase_model_data.id)
+
+        assert await phrases_service_with_suggest_index.suggest("apples", 10) == []
+
+    async def test_import_from_json_updates_indexes_with_public_phrases(
+        self,
+        mock_phrases_repository: mock.AsyncMock,
+        mock_s3_service: mock.AsyncMock,
+        phrases_search_index: PhrasesSearchIndex,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        phrase_transfer_schema_data: PhraseTransferSchema,
+        phrase_model_data: PhraseModel,
+        random_movie_id: uuid.UUID,
+    ):
+        phrases_service = PhrasesService(
+            mock_phrases_repository,
+            mock_s3_service,
+            search_index=phrases_search_index,
+            suggest_index=phrases_suggest_index,
+        )
+        phrases_search_index.load([])
+        phrases_suggest_index.load([])
+        hidden_phrase = PhraseModel(
+            id=uuid.uuid4(),
+            movie_id=random_movie_id,
+            normalized_text=normalize_phrase_text("Hidden apples"),
+            is_active=False,
+            is_movie_active=True,
+        )
+        mock_phrases_repository.import_from_json.return_value = [phrase_model_data, hidden_phrase]
+
+        await phrases_service.import_from_json(random_movie_id, [phrase_transfer_schema_data])
+
+        assert phrases_search_index.search(normalize_phrase_text("apples"), 1, 10) == ([phrase_model_data.id], 1)
+        assert await phrases_service.suggest("hidden", 10) == []
+        assert await phrases_service.suggest("apples", 1) == ["apples"]
 
     async def test_import_from_json(
         self,
@@ -272,6 +700,7 @@ class TestPhrasesService:
         phrases_service: PhrasesService,
         phrase_transfer_schema_data: PhraseTransferSchema,
         random_movie_id: uuid.UUID,
+        mock_cache_backend: mock.AsyncMock,
     ):
         result = await phrases_service.import_from_json(movie_id=random_movie_id, data=[phrase_transfer_schema_data])
 
@@ -280,6 +709,7 @@ class TestPhrasesService:
             random_movie_id,
             [phrase_transfer_schema_data],
         )
+        mock_cache_backend.clear_namespace.assert_awaited_once_with(PHRASES_SEARCH_CACHE_NAMESPACE)
 
     @pytest.mark.parametrize("has_issues", [True, False])
     async def test_export_to_json(
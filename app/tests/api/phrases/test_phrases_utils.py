@@ -1,16 +1,34 @@
 import datetime
+import random
 from pathlib import Path
 
 import pytest
+import pytest_mock
+import srt
 
+from app.api.phrases import utils
 from app.api.phrases.models import PhraseModel
 from app.api.phrases.utils import (
+    MatchedPhrase,
+    decode_scene_token,
+    decode_search_cursor,
+    encode_scene_token,
+    encode_search_cursor,
+    find_matched_phrase,
     format_duration,
     get_ffmpeg_trim_cmd_for_phrase,
     get_matched_phrase,
+    get_phrase_text_offsets,
+    get_scene_url,
+    normalize_many,
     normalize_phrase_text,
+    normalize_search_text,
     parse_duration,
+    tokenize_phrase_text,
 )
+from app.benchmarks.normalize_phrase_text import legacy_normalize_phrase_text
+from app.benchmarks.serialize_phrases import legacy_format_duration
+from app.core.config import settings
 
 
 @pytest.mark.parametrize(
@@ -41,6 +59,33 @@ def test_normalize_phrase_text(
     assert result == expected_output
 
 
+def test_normalize_phrase_text_is_equal_to_legacy():
+    with open("tests/data/subtitles.srt", encoding="utf-8") as f:
+        corpus = [sub.content for sub in srt.parse(f.read())]
+
+    corpus += [
+        "",
+        "...",
+        "?! Start. . .end!",
+        "Literal \\n and \\\\n. \\",
+        "Spaces\t\r\x0b\x1c\u00a0\u2003around .  dots . ",
+        "İstanbul, KELVIN K, STRASSE ß",
+    ]
+    rng = random.Random(0)  # noqa: S311
+    alphabet = [*"aZé İ?!.,-_\"#\\\t\n'", "\\n", "..."]
+    corpus += ["".join(rng.choices(alphabet, k=rng.randint(1, 20))) for _ in range(10000)]
+
+    assert normalize_many(corpus) == [legacy_normalize_phrase_text(phrase) for phrase in corpus]
+
+
+def test_normalize_search_text():
+    normalize_search_text.cache_clear()
+
+    assert normalize_search_text("Hello, there!") == normalize_phrase_text("Hello, there!")
+    assert normalize_search_text("Hello, there!") == normalize_phrase_text("Hello, there!")
+    assert normalize_search_text.cache_info().hits == 1
+
+
 def test_get_ffmpeg_trim_cmd_for_phrase(phrase_model_data: PhraseModel, tmp_path: Path):
     movie_path = Path(tmp_path, "movie.mp4")
 
@@ -82,6 +127,82 @@ def test_get_matched_phrase(
     assert result == expected_result
 
 
+@pytest.mark.parametrize(
+    ("search_text", "full_phrase", "expected_result"),
+    [
+        ("apples bananas", "Fruits: Apples, bananas and oranges", MatchedPhrase(8, 23, "Apples, bananas")),
+        ("a a b", "a a a b", MatchedPhrase(2, 7, "a a b")),
+        (
+            "professor the good",
+            "I'm afraid so, professor. The good and the bad.",
+            MatchedPhrase(15, 34, "professor. The good"),
+        ),
+        ("ban", "Fruits: Apples, bananas and oranges", None),
+        ("(a+)+$", "aaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaaa!", None),
+        ("[", "Fruits: [Apples]", None),
+        ("...", "They really are...", None),
+    ],
+)
+def test_find_matched_phrase(
+    search_text: str,
+    full_phrase: str,
+    expected_result: MatchedPhrase | None,
+):
+    result = find_matched_phrase(normalize_phrase_text(search_text), full_phrase)
+
+    assert result == expected_result
+
+
+@pytest.mark.parametrize(
+    ("normalized_offsets", "is_tokenized"),
+    [
+        ([0, 6, 8, 14, 16, 23, 24, 27, 28, 35], False),
+        # Out of date offsets are ignored
+        ([0, 6, 8, 14], True),
+        (None, True),
+    ],
+)
+def test_find_matched_phrase_with_offsets(
+    mocker: pytest_mock.MockerFixture,
+    normalized_offsets: list[int] | None,
+    is_tokenized: bool,
+):
+    full_text = "Fruits: Apples, bananas and oranges"
+    spy_tokenize_phrase_text = mocker.spy(utils, "tokenize_phrase_text")
+
+    result = find_matched_phrase(
+        normalize_phrase_text("apples bananas"),
+        full_text,
+        normalize_phrase_text(full_text),
+        normalized_offsets,
+    )
+
+    assert result == MatchedPhrase(8, 23, "Apples, bananas")
+    assert spy_tokenize_phrase_text.called == is_tokenized
+
+
+def test_get_phrase_text_offsets():
+    assert get_phrase_text_offsets("I'm afraid so, professor.") == [0, 3, 4, 10, 11, 13, 15, 24, 24, 25]
+
+
+@pytest.mark.parametrize(
+    "phrase_text",
+    [
+        'This\n\nis a    \n   test   string\n\n"',
+        "I'm afraid so, professor.\nThe good and the bad.",
+        "36?!!Last year I had 37",
+        "- They really are...\n- The only family he has.",
+        'Text+text,,Text: "text". Text.text',
+        "Кириллица, Umlaut ä, French: É",
+    ],
+)
+def test_tokenize_phrase_text(phrase_text: str):
+    tokens = tokenize_phrase_text(phrase_text)
+
+    assert [token for token, _, _ in tokens] == normalize_phrase_text(phrase_text).split()
+    assert all(phrase_text[start:end].lower() == token for token, start, end in tokens if token != ".")
+
+
 @pytest.mark.parametrize(
     ("timedelta", "expected_str"),
     [
@@ -97,6 +218,19 @@ def test_format_duration(timedelta: datetime.timedelta, expected_str: str):
     assert result == expected_str
 
 
+@pytest.mark.parametrize(
+    "timedelta",
+    [
+        datetime.timedelta(),
+        datetime.timedelta(hours=23, minutes=59, seconds=59, microseconds=999999),
+        datetime.timedelta(days=2, seconds=3725, microseconds=123456),
+        datetime.timedelta(microseconds=-1),
+    ],
+)
+def test_format_duration_is_equal_to_legacy(timedelta: datetime.timedelta):
+    assert format_duration(timedelta) == legacy_format_duration(timedelta)
+
+
 @pytest.mark.parametrize(
     ("duration_str", "expected_timedelta"),
     [
@@ -110,3 +244,72 @@ def test_parse_duration(duration_str: str, expected_timedelta: datetime.timedelt
     result = parse_duration(duration_str)
 
     assert result == expected_timedelta
+
+
+def test_search_cursor(phrase_model_data: PhraseModel):
+    cursor = encode_search_cursor(phrase_model_data)
+
+    assert decode_search_cursor(cursor) == (
+        phrase_model_data.movie_id,
+        phrase_model_data.start_in_movie,
+        phrase_model_data.id,
+    )
+
+
+@pytest.mark.parametrize("cursor", ["", "not-a-cursor", "YTpiOmM", "!!!"])
+def test_decode_search_cursor_invalid(cursor: str):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_search_cursor(cursor)
+
+
+@pytest.mark.parametrize("scene_s3_key", ["movies/harry-potter/1.mp4", "movies/Harry Potter (2001)/ü.mp4"])
+def test_scene_token(scene_s3_key: str):
+    token = encode_scene_token(scene_s3_key)
+
+    assert decode_scene_token(token) == scene_s3_key
+    assert "/" not in token
+
+
+def test_decode_scene_token_forged():
+    key_version, encoded_key, _ = encode_scene_token("movies/other.mp4").split(".")
+    signature = encode_scene_token("movies/harry-potter/1.mp4").split(".")[2]
+
+    with pytest.raises(ValueError, match="Invalid scene token"):
+        decode_scene_token(f"{key_version}.{encoded_key}.{signature}")
+
+
+@pytest.mark.parametrize("token", ["", "not-a-token", "1.bW92aWVz.", "1.!!!.!!!", "x.bW92aWVz.AAAA", "bW92aWVz.AAAA"])
+def test_decode_scene_token_invalid(token: str):
+    with pytest.raises(ValueError, match="Invalid scene token"):
+        decode_scene_token(token)
+
+
+def test_scene_token_key_rotation(mocker: pytest_mock.MockerFixture):
+    old_token = encode_scene_token("movies/harry-potter/1.mp4")
+    mocker.patch.object(settings, "scene_token_key_version", settings.scene_token_key_version + 1)
+    token = encode_scene_token("movies/harry-potter/1.mp4")
+
+    assert token.split(".")[0] == str(settings.scene_token_key_version)
+    assert token.split(".")[2] != old_token.split(".")[2]
+    assert decode_scene_token(token) == decode_scene_token(old_token) == "movies/harry-potter/1.mp4"
+
+    mocker.patch.object(settings, "scene_token_min_key_version", settings.scene_token_key_version)
+
+    assert decode_scene_token(token) == "movies/harry-potter/1.mp4"
+    with pytest.raises(ValueError, match="Invalid scene token"):
+        decode_scene_token(old_token)
+
+
+def test_decode_scene_token_future_key_version():
+    _, encoded_key, signature = encode_scene_token("movies/harry-potter/1.mp4").split(".")
+
+    with pytest.raises(ValueError, match="Invalid scene token"):
+        decode_scene_token(f"{settings.scene_token_key_version + 1}.{encoded_key}.{signature}")
+
+
+def test_get_scene_url(mocker: pytest_mock.MockerFixture):
+    mocker.patch.object(settings, "scenes_base_url", "https://api.example.com")
+    token = encode_scene_token("movies/harry-potter/1.mp4")
+
+    assert get_scene_url("movies/harry-potter/1.mp4") == f"https://api.example.com/api/phrases/scenes/{token}"
+    assert get_scene_url(None) is None
@@ -1,7 +1,8 @@
+import asyncio
 import datetime
-import io
 import os
 import uuid
+from pathlib import Path
 from unittest import mock
 
 import pytest
@@ -11,6 +12,8 @@ from fastapi import UploadFile
 from app.api.phrases.models import PhraseModel
 from app.api.phrases.scenes_upload_service import ScenesUploadService
 from app.api.phrases.schemas import PhraseCreateSchema, PhraseUpdateSchema, SubtitleItem
+from app.core.config import settings
+from app.core.exceptions import SceneUploadError
 
 
 @pytest.mark.asyncio()
@@ -23,15 +26,15 @@ class TestScenesUploadService:
         subtitles_file: UploadFile,
     ):
         expected_subtitle_items = [subtitle_item]
-        mock_normalize_phrase_text = mocker.patch(
-            "app.api.phrases.scenes_upload_service.normalize_phrase_text",
-            return_value=subtitle_item.normalized_text,
+        mock_normalize_many = mocker.patch(
+            "app.api.phrases.scenes_upload_service.normalize_many",
+            return_value=[subtitle_item.normalized_text],
         )
         result_subtitle_items = await scenes_upload_service._parse_subtitles_file(subtitles_file, 0, 0)
 
         assert result_subtitle_items == expected_subtitle_items
 
-        mock_normalize_phrase_text.assert_called_once_with(subtitle_item.text)
+        mock_normalize_many.assert_called_once_with([subtitle_item.text])
 
     async def test_parse_subtitles_file_with_time_shifts(
         self,
@@ -44,20 +47,21 @@ class TestScenesUploadService:
             SubtitleItem(
                 text=subtitle_item.text,
                 normalized_text=subtitle_item.normalized_text,
+                normalized_offsets=subtitle_item.normalized_offsets,
                 start_time=subtitle_item.start_time - datetime.timedelta(seconds=10),
                 end_time=subtitle_item.end_time - datetime.timedelta(seconds=10),
             ),
         ]
 
-        mock_normalize_phrase_text = mocker.patch(
-            "app.api.phrases.scenes_upload_service.normalize_phrase_text",
-            return_value=subtitle_item.normalized_text,
+        mock_normalize_many = mocker.patch(
+            "app.api.phrases.scenes_upload_service.normalize_many",
+            return_value=[subtitle_item.normalized_text],
         )
         result_subtitle_items = await scenes_upload_service._parse_subtitles_file(subtitles_file, -10, -10)
 
         assert result_subtitle_items == expected_subtitle_items
 
-        mock_normalize_phrase_text.assert_called_once_with(subtitle_item.text)
+        mock_normalize_many.assert_called_once_with([subtitle_item.text])
 
     async def test_create_phrases(
         self,
@@ -70,21 +74,13 @@ class TestScenesUploadService:
     ):
         mock_phrases_service.bulk_create.return_value = [phrase_model_data]
         phrase_create_schema_data.is_active = False
+        phrase_create_schema_data.normalized_offsets = subtitle_item.normalized_offsets
 
         result = await scenes_upload_service._create_phrases(random_movie_id, [subtitle_item])
 
         assert result == [phrase_model_data]
         mock_phrases_service.bulk_create.assert_awaited_once_with([phrase_create_schema_data])
 
-    async def test_get_scene_file(
-        self,
-        scenes_upload_service: ScenesUploadService,
-        scene_file_buffered_bytes: io.BytesIO,
-    ):
-        result = await scenes_upload_service._get_scene_file("tests/data", "scene.mp4")
-
-        assert result.read() == scene_file_buffered_bytes.read()
-
     async def test_process_subtitles_and_create_scenes(
         self,
         random_movie_id: uuid.UUID,
@@ -92,7 +88,6 @@ class TestScenesUploadService:
         subtitle_item: SubtitleItem,
         mock_phrases_service: mock.AsyncMock,
         phrase_model_data: PhraseModel,
-        scene_file_buffered_bytes: io.BytesIO,
         movie_file: UploadFile,
         mocker: pytest_mock.MockerFixture,
         mock_s3_service: mock.AsyncMock,
@@ -100,11 +95,6 @@ class TestScenesUploadService:
         phrases = [phrase_model_data]
         mock_create_phrases = mocker.patch.object(ScenesUploadService, "_create_phrases", return_value=phrases)
         mock_create_scenes_files = mocker.patch.object(ScenesUploadService, "_create_scenes_files")
-        mock_get_scene_file = mocker.patch.object(
-            ScenesUploadService,
-            "_get_scene_file",
-            return_value=scene_file_buffered_bytes,
-        )
         tmp_output_dir = "tests/data"
         scene_filename = f"{phrase_model_data.id}.mp4"
         scene_s3_key = os.path.join("movies", str(random_movie_id), str(scene_filename))
@@ -118,19 +108,69 @@ class TestScenesUploadService:
 
         mock_create_phrases.assert_awaited_once_with(random_movie_id, [subtitle_item])
         mock_create_scenes_files.assert_awaited_once_with(movie_file, "movie.mp4", phrases, tmp_output_dir)
-        assert mock_get_scene_file.await_count == len(phrases)
-        assert mock_s3_service.upload_fileobj.await_count == len(phrases)
-        assert mock_phrases_service.update.await_count == len(phrases)
-
-        for phrase in phrases:
-            mock_get_scene_file.assert_awaited_with(tmp_output_dir, f"{phrase.id}.mp4")
-            mock_s3_service.upload_fileobj.assert_awaited_with(scene_file_buffered_bytes, scene_s3_key)
-            expected_new_phrase_data = {
-                **phrase.__dict__,
-                "scene_s3_key": scene_s3_key,
-                "is_active": True,
-            }
-            mock_phrases_service.update.assert_awaited_with(
-                phrase.id,
-                PhraseUpdateSchema(**expected_new_phrase_data),
+        assert mock_s3_service.upload_file.await_count == len(phrases)
+        mock_s3_service.upload_file.assert_awaited_with(Path(tmp_output_dir, scene_filename), scene_s3_key)
+
+        mock_phrases_service.bulk_update.assert_awaited_once_with(
+            {
+                phrase.id: PhraseUpdateSchema(**{**phrase.__dict__, "scene_s3_key": scene_s3_key, "is_active": True})
+                for phrase in phrases
+            },
+        )
+
+    async def test_process_subtitles_and_create_scenes_upload_error(
+        self,
+        random_movie_id: uuid.UUID,
+        scenes_upload_service: ScenesUploadService,
+        subtitle_item: SubtitleItem,
+        mock_phrases_service: mock.AsyncMock,
+        phrase_model_data: PhraseModel,
+        movie_file: UploadFile,
+        mocker: pytest_mock.MockerFixture,
+        mock_s3_service: mock.AsyncMock,
+    ):
+        mocker.patch.object(ScenesUploadService, "_create_phrases", return_value=[phrase_model_data])
+        mocker.patch.object(ScenesUploadService, "_create_scenes_files")
+        mock_s3_service.upload_file.side_effect = ConnectionError
+
+        with pytest.raises(SceneUploadError):
+            await scenes_upload_service._process_subtitles_and_create_scenes(
+                random_movie_id,
+                movie_file,
+                [subtitle_item],
+                "tests/data",
             )
+
+        # Phrases without the uploaded scenes stay inactive
+        mock_phrases_service.bulk_update.assert_not_awaited()
+
+    async def test_upload_scenes_files_error_cancels_other_uploads(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        scenes_upload_service: ScenesUploadService,
+        mock_s3_service: mock.AsyncMock,
+    ):
+        mocker.patch.object(settings, "s3_scenes_upload_concurrency", 2)
+        upload_started = asyncio.Event()
+        upload_cancelled = asyncio.Event()
+
+        async def upload_file(scene_path: Path, scene_s3_key: str) -> None:
+            if scene_s3_key == "failed":
+                await upload_started.wait()
+                raise ConnectionError
+
+            upload_started.set()
+
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                upload_cancelled.set()
+                raise
+
+        mock_s3_service.upload_file.side_effect = upload_file
+
+        with pytest.raises(ExceptionGroup):
+            await scenes_upload_service._upload_scenes_files([Path("ok.mp4"), Path("failed.mp4")], ["ok", "failed"])
+
+        # The scenes files are removed after the uploads stop
+        assert upload_cancelled.is_set()
@@ -0,0 +1,194 @@
+import asyncio
+import json
+import uuid
+from unittest import mock
+
+import pytest
+import pytest_mock
+
+from app.api.phrases import search_index
+from app.api.phrases.search_index import PhrasesSearchIndex, load_phrases_search_index
+from app.api.phrases.utils import normalize_phrase_text
+
+
+@pytest.fixture()
+def indexed_phrases(phrases_search_index: PhrasesSearchIndex, random_movie_id: uuid.UUID) -> list[uuid.UUID]:
+    texts = [
+        "I'm afraid so, professor. The good and the bad.",
+        "Ah, Professor, I would trust Hagrid with my life.",
+        "The bad news is that I'm late.",
+        "That hat is so good!",
+        "Good. The bad guys are gone.",
+    ]
+    phrase_ids = [uuid.uuid4() for _ in texts]
+
+    phrases_search_index.load(
+        (phrase_id, random_movie_id, normalize_phrase_text(text)) for phrase_id, text in zip(phrase_ids, texts)
+    )
+
+    return phrase_ids
+
+
+class TestPhrasesSearchIndex:
+    @pytest.mark.parametrize(
+        ("search_text", "expected_indexes"),
+        [
+            ("professor", [0, 1]),
+            ("the bad", [0, 2, 4]),
+            ("good. the bad", [4]),
+            ("hat", [3]),
+            ("bad the", []),
+            ("unknown", []),
+        ],
+    )
+    def test_search(
+        self,
+        phrases_search_index: PhrasesSearchIndex,
+        indexed_phrases: list[uuid.UUID],
+        search_text: str,
+        expected_indexes: list[int],
+    ):
+        result = phrases_search_index.search(normalize_phrase_text(search_text), page=1, size=10)
+
+        assert result == ([indexed_phrases[i] for i in expected_indexes], len(expected_indexes))
+
+    def test_search_only_punctuation(
+        self,
+        phrases_search_index: PhrasesSearchIndex,
+        indexed_phrases: list[uuid.UUID],
+    ):
+        assert phrases_search_index.search(normalize_phrase_text("?!"), page=1, size=10) is None
+
+    def test_search_pagination(
+        self,
+        phrases_search_index: PhrasesSearchIndex,
+        indexed_phrases: list[uuid.UUID],
+    ):
+        search_text = normalize_phrase_text("the")
+
+        assert phrases_search_index.search(search_text, page=1, size=2) == (
+            [indexed_phrases[0], indexed_phrases[2]],
+            3,
+        )
+        assert phrases_search_index.search(search_text, page=2, size=2) == ([indexed_phrases[4]], 3)
+        assert phrases_search_index.search(search_text, page=3, size=2) == ([], 3)
+
+    def test_add_replaces_phrase(
+        self,
+        phrases_search_index: PhrasesSearchIndex,
+        indexed_phrases: list[uuid.UUID],
+        random_movie_id: uuid.UUID,
+    ):
+        phrases_search_index.add(indexed_phrases[3], random_movie_id, normalize_phrase_text("A new text"))
+
+        assert phrases_search_index.search(normalize_phrase_text("hat"), page=1, size=10) == ([], 0)
+        assert phrases_search_index.search(normalize_phrase_text("new text"), page=1, size=10) == (
+            [indexed_phrases[3]],
+            1,
+        )
+        assert len(phrases_search_index) == len(indexed_phrases)
+
+    def test_remove(
+        self,
+        phrases_search_index: PhrasesSearchIndex,
+        indexed_phrases: list[uuid.UUID],
+    ):
+        phrases_search_index.remove(indexed_phrases[0])
+
+        assert phrases_search_index.search(normalize_phrase_text("professor"), page=1, size=10) == (
+            [indexed_phrases[1]],
+            1,
+        )
+
+    def test_remove_by_movie_id(
+        self,
+        phrases_search_index: PhrasesSearchIndex,
+        indexed_phrases: list[uuid.UUID],
+        random_movie_id: uuid.UUID,
+    ):
+        other_phrase_id = uuid.uuid4()
+        phrases_search_index.add(other_phrase_id, uuid.uuid4(), normalize_phrase_text("The bad one"))
+
+        phrases_search_index.remove_by_movie_id(random_movie_id)
+
+        assert len(phrases_search_index) == 1
+        assert phrases_search_index.search(normalize_phrase_text("the bad"), page=1, size=10) == ([other_phrase_id], 1)
+
+    def test_record_changes_and_apply(
+        self,
+        phrases_search_index: PhrasesSearchIndex,
+        indexed_phrases: list[uuid.UUID],
+        random_movie_id: uuid.UUID,
+    ):
+        other_index = PhrasesSearchIndex()
+        new_phrase_id = uuid.uuid4()
+
+        with phrases_search_index.record_changes() as changes:
+            phrases_search_index.add(new_phrase_id, random_movie_id, normalize_phrase_text("A new text"))
+            phrases_search_index.remove(indexed_phrases[0])
+
+        phrases_search_index.remove(indexed_phrases[1])
+
+        assert changes == [
+            ("add", str(new_phrase_id), str(random_movie_id), normalize_phrase_text("A new text")),
+            ("remove", str(indexed_phrases[0])),
+        ]
+
+        # The changes are sent to the other workers as JSON
+        other_index.apply(json.loads(json.dumps(changes)))
+
+        assert other_index.search(normalize_phrase_text("new text"), page=1, size=10) == ([new_phrase_id], 1)
+
+        other_index.apply([("remove_by_movie_id", str(random_movie_id))])
+
+        assert len(other_index) == 0
+
+    def test_apply_unknown_change(self, phrases_search_index: PhrasesSearchIndex):
+        with pytest.raises(ValueError, match="Unknown phrases search index change"):
+            phrases_search_index.apply([("rename", "text")])
+
+
+@pytest.mark.asyncio()
+async def test_load_phrases_search_index(
+    mocker: pytest_mock.MockerFixture,
+    phrases_search_index: PhrasesSearchIndex,
+    random_movie_id: uuid.UUID,
+):
+    phrase_id = uuid.uuid4()
+    mocker.patch.object(search_index, "sessionmanager")
+    mock_phrases_repository = mocker.patch.object(search_index, "PhrasesRepository").return_value
+    mock_phrases_repository.get_all_for_search_index = mock.AsyncMock(
+        return_value=[(phrase_id, random_movie_id, normalize_phrase_text("The bad news"))],
+    )
+    spy_to_thread = mocker.spy(asyncio, "to_thread")
+
+    await load_phrases_search_index(phrases_search_index)
+
+    spy_to_thread.assert_called_once_with(PhrasesSearchIndex.build, mock.ANY)
+    assert phrases_search_index.is_loaded
+    assert phrases_search_index.search(normalize_phrase_text("the bad"), page=1, size=10) == ([phrase_id], 1)
+
+
+@pytest.mark.asyncio()
+async def test_load_phrases_search_index_keeps_changes_made_while_loaded(
+    mocker: pytest_mock.MockerFixture,
+    phrases_search_index: PhrasesSearchIndex,
+    random_movie_id: uuid.UUID,
+):
+    loaded_phrase_id = uuid.uuid4()
+    new_phrase_id = uuid.uuid4()
+    mocker.patch.object(search_index, "sessionmanager")
+    mock_phrases_repository = mocker.patch.object(search_index, "PhrasesRepository").return_value
+
+    async def get_all_for_search_index() -> list[tuple[uuid.UUID, uuid.UUID, str]]:
+        # The phrases are changed after the rows are read
+        phrases_search_index.add(new_phrase_id, random_movie_id, normalize_phrase_text("The bad guys"))
+        phrases_search_index.remove(loaded_phrase_id)
+
+        return [(loaded_phrase_id, random_movie_id, normalize_phrase_text("The bad news"))]
+
+    mock_phrases_repository.get_all_for_search_index = get_all_for_search_index
+
+    await load_phrases_search_index(phrases_search_index)
+
+    assert phrases_search_index.search(normalize_phrase_text("the bad"), page=1, size=10) == ([new_phrase_id], 1)
@@ -0,0 +1,164 @@
+import pytest
+import pytest_mock
+
+from app.api.phrases import suggest_index
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
+from app.api.phrases.utils import normalize_phrase_text
+
+
+@pytest.fixture()
+def indexed_texts(phrases_suggest_index: PhrasesSuggestIndex) -> list[str]:
+    texts = [
+        "I'm afraid so, professor. The good and the bad.",
+        "The bad news is that I'm late.",
+        "That hat is so good!",
+        "Good. The bad guys are gone.",
+    ]
+
+    phrases_suggest_index.load(normalize_phrase_text(text) for text in texts)
+
+    return texts
+
+
+class TestPhrasesSuggestIndex:
+    @pytest.mark.parametrize(
+        ("prefix", "limit", "expected_suggestions"),
+        [
+            ("the b", 10, ["the bad", "the bad guys", "the bad news"]),
+            ("th", 3, ["the", "the bad", "that"]),
+            ("good", 10, ["good", "good and", "good and the"]),
+            ("so ", 10, ["so good", "so professor"]),
+            ("unknown", 10, []),
+            ("", 10, []),
+        ],
+    )
+    def test_suggest(
+        self,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+        prefix: str,
+        limit: int,
+        expected_suggestions: list[str],
+    ):
+        assert phrases_suggest_index.suggest(prefix, limit) == expected_suggestions
+
+    def test_ngrams_do_not_cross_sentences(
+        self,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+    ):
+        assert phrases_suggest_index.suggest("professor", 10) == ["professor"]
+
+    def test_add(
+        self,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+    ):
+        assert phrases_suggest_index.suggest("the b", 1) == ["the bad"]
+
+        phrases_suggest_index.add(
+            normalize_phrase_text(text) for text in ["The best!", "The best day", "The best", "The best one"]
+        )
+
+        assert phrases_suggest_index.suggest("the b", 1) == ["the best"]
+        assert phrases_suggest_index.suggest("the best", 10) == ["the best", "the best day", "the best one"]
+
+    def test_remove(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+    ):
+        mocker.patch.object(suggest_index, "MIN_NGRAMS_TO_STORE_TOP", 0)
+        phrases_suggest_index.load(normalize_phrase_text(text) for text in indexed_texts)
+
+        phrases_suggest_index.remove(normalize_phrase_text(text) for text in indexed_texts[:2])
+        # Texts that aren't indexed are skipped
+        phrases_suggest_index.remove([normalize_phrase_text("Unknown text")])
+
+        assert phrases_suggest_index.suggest("the b", 10) == ["the bad", "the bad guys"]
+        assert phrases_suggest_index.suggest("so", 10) == ["so", "so good"]
+        assert phrases_suggest_index.suggest("professor", 10) == []
+
+    def test_add_and_remove_keep_ngrams_sorted(
+        self,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+    ):
+        new_texts = [normalize_phrase_text(text) for text in ["A new text", "The best day"]]
+
+        phrases_suggest_index.add(new_texts)
+        phrases_suggest_index.remove(normalize_phrase_text(text) for text in indexed_texts[:2])
+
+        expected_index = phrases_suggest_index.build(
+            [*(normalize_phrase_text(text) for text in indexed_texts[2:]), *new_texts],
+        )
+        assert phrases_suggest_index._ngrams == expected_index._ngrams
+
+    @pytest.mark.parametrize("limit", [1, 3, 10])
+    def test_suggest_stored_top(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+        limit: int,
+    ):
+        expected_suggestions = phrases_suggest_index.suggest("th", limit)
+        mocker.patch.object(suggest_index, "MIN_NGRAMS_TO_STORE_TOP", 0)
+
+        phrases_suggest_index.load(normalize_phrase_text(text) for text in indexed_texts)
+        spy_get_top_ngrams = mocker.spy(phrases_suggest_index, "_get_top_ngrams")
+
+        assert phrases_suggest_index.suggest("th", limit) == expected_suggestions
+        spy_get_top_ngrams.assert_not_called()
+
+    def test_stored_top_is_updated_on_add(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+    ):
+        mocker.patch.object(suggest_index, "MIN_NGRAMS_TO_STORE_TOP", 0)
+        phrases_suggest_index.load(normalize_phrase_text(text) for text in indexed_texts)
+
+        assert phrases_suggest_index.suggest("goo", 10) == ["good", "good and", "good and the"]
+
+        phrases_suggest_index.add([normalize_phrase_text("Goodbye. Goodbye.")])
+        phrases_suggest_index.add([normalize_phrase_text("Good and bad")])
+
+        assert phrases_suggest_index.suggest("goo", 10) == [
+            "good",
+            "good and",
+            "good and bad",
+            "good and the",
+            "goodbye",
+        ]
+        assert phrases_suggest_index.suggest("goo", 2) == ["good", "good and"]
+
+    def test_empty_add_keeps_stored_top(
+        self,
+        mocker: pytest_mock.MockerFixture,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+    ):
+        mocker.patch.object(suggest_index, "MIN_NGRAMS_TO_STORE_TOP", 0)
+        phrases_suggest_index.load(normalize_phrase_text(text) for text in indexed_texts)
+        top_ngrams = dict(phrases_suggest_index._top_ngrams)
+
+        phrases_suggest_index.add([])
+
+        assert phrases_suggest_index._top_ngrams == top_ngrams
+
+    def test_build(
+        self,
+        phrases_suggest_index: PhrasesSuggestIndex,
+        indexed_texts: list[str],
+    ):
+        index = phrases_suggest_index.build([normalize_phrase_text("Goodbye")])
+
+        # The built index doesn't change the current one until it replaces the content
+        assert phrases_suggest_index.suggest("goo", 10) == ["good", "good and", "good and the"]
+
+        phrases_suggest_index.replace(index)
+
+        assert phrases_suggest_index.suggest("goo", 10) == ["goodbye"]
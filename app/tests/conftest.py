@@ -19,6 +19,7 @@ from sqlalchemy.ext.asyncio import (
     async_sessionmaker,
     create_async_engine,
 )
+from types_aiobotocore_s3 import S3Client
 
 from app.api.movies.dependencies import get_movies_service
 from app.api.movies.models import MovieModel
@@ -26,6 +27,7 @@ from app.api.movies.repository import MoviesRepository
 from app.api.movies.schemas import MovieCreateSchema, MovieInSearchByPhraseTextSchema, MovieSchema, MovieUpdateSchema
 from app.api.movies.service import MoviesService
 from app.api.phrases.dependencies import get_phrases_service
+from app.api.phrases.fragments import PhrasesSearchFragments
 from app.api.phrases.models import PhraseIssueModel, PhraseModel
 from app.api.phrases.repository import PhrasesRepository
 from app.api.phrases.scenes_upload_service import ScenesUploadService
@@ -40,12 +42,15 @@ from app.api.phrases.schemas import (
     PhraseUpdateSchema,
     SubtitleItem,
 )
+from app.api.phrases.search_index import PhrasesSearchIndex
 from app.api.phrases.service import PhrasesService
+from app.api.phrases.suggest_index import PhrasesSuggestIndex
 from app.api.users.models import UserModel
 from app.core.config import settings
 from app.core.constants import Languages, MovieStatus
 from app.core.models import CoreModel
 from app.main import app as main_app
+from app.s3.dependencies import get_presigned_url_service, get_s3_client
 from app.s3.presigned_url_service import PresignedURLService
 from app.s3.s3_service import S3Service
 
@@ -103,10 +108,15 @@ def app_with_dependency_overrides(
     app: FastAPI,
     mock_movies_service: mock.AsyncMock,
     mock_phrases_service: mock.AsyncMock,
+    mock_s3_client: mock.AsyncMock,
+    mock_presigned_url_service: mock.AsyncMock,
 ) -> FastAPI:
     app.dependency_overrides = {}
     app.dependency_overrides[get_movies_service] = lambda: mock_movies_service
     app.dependency_overrides[get_phrases_service] = lambda: mock_phrases_service
+    # The shared S3 client is opened in the lifespan, which isn't run by the tests
+    app.dependency_overrides[get_s3_client] = lambda: mock_s3_client
+    app.dependency_overrides[get_presigned_url_service] = lambda: mock_presigned_url_service
 
     return app
 
@@ -204,12 +214,35 @@ def mock_movies_repository() -> mock.AsyncMock:
     return mock.AsyncMock()
 
 
+@pytest.fixture()
+def mock_cache_backend() -> mock.AsyncMock:
+    return mock.AsyncMock()
+
+
 @pytest.fixture()
 def movies_service(
     mock_movies_repository: mock.AsyncMock,
     mock_s3_service: mock.AsyncMock,
+    mock_cache_backend: mock.AsyncMock,
+) -> MoviesService:
+    return MoviesService(mock_movies_repository, mock_s3_service, cache_backend=mock_cache_backend)
+
+
+@pytest.fixture()
+def movies_service_with_phrases_indexes(
+    mock_movies_repository: mock.AsyncMock,
+    mock_s3_service: mock.AsyncMock,
+    mock_phrases_repository: mock.AsyncMock,
+    phrases_search_index: PhrasesSearchIndex,
+    phrases_suggest_index: PhrasesSuggestIndex,
 ) -> MoviesService:
-    return MoviesService(mock_movies_repository, mock_s3_service)
+    return MoviesService(
+        mock_movies_repository,
+        mock_s3_service,
+        phrases_repository=mock_phrases_repository,
+        search_index=phrases_search_index,
+        suggest_index=phrases_suggest_index,
+    )
 
 
 @pytest.fixture()
@@ -241,6 +274,7 @@ def movie_create_schema_data() -> MovieCreateSchema:
         year=2000,
         status=MovieStatus.PENDING,
         language=Languages.EN,
+        is_active=True,
     )
 
 
@@ -330,18 +364,64 @@ def mock_phrases_repository() -> mock.AsyncMock:
 def phrases_service(
     mock_phrases_repository: mock.AsyncMock,
     mock_s3_service: mock.AsyncMock,
-    mock_presigned_url_service: mock.AsyncMock,
+    mock_cache_backend: mock.AsyncMock,
 ) -> PhrasesService:
     return PhrasesService(
         mock_phrases_repository,
         mock_s3_service,
-        mock_presigned_url_service,
+        cache_backend=mock_cache_backend,
     )
 
 
 @pytest.fixture()
 def mock_phrases_service() -> mock.AsyncMock:
-    return mock.AsyncMock()
+    phrases_service = mock.AsyncMock()
+    phrases_service.with_repository = mock.Mock(return_value=phrases_service)
+
+    return phrases_service
+
+
+@pytest.fixture()
+def phrases_search_index() -> PhrasesSearchIndex:
+    return PhrasesSearchIndex()
+
+
+@pytest.fixture()
+def phrases_service_with_search_index(
+    mock_phrases_repository: mock.AsyncMock,
+    mock_s3_service: mock.AsyncMock,
+    phrases_search_index: PhrasesSearchIndex,
+    mock_cache_backend: mock.AsyncMock,
+) -> PhrasesService:
+    return PhrasesService(
+        mock_phrases_repository,
+        mock_s3_service,
+        search_index=phrases_search_index,
+        cache_backend=mock_cache_backend,
+    )
+
+
+@pytest.fixture()
+def phrases_suggest_index() -> PhrasesSuggestIndex:
+    return PhrasesSuggestIndex(max_ngram_size=3)
+
+
+@pytest.fixture()
+def phrases_search_fragments() -> PhrasesSearchFragments:
+    return PhrasesSearchFragments(max_size=2)
+
+
+@pytest.fixture()
+def phrases_service_with_suggest_index(
+    mock_phrases_repository: mock.AsyncMock,
+    mock_s3_service: mock.AsyncMock,
+    phrases_suggest_index: PhrasesSuggestIndex,
+) -> PhrasesService:
+    return PhrasesService(
+        mock_phrases_repository,
+        mock_s3_service,
+        suggest_index=phrases_suggest_index,
+    )
 
 
 @pytest.fixture()
@@ -396,6 +476,7 @@ def phrase_model_data(
     return PhraseModel(
         **phrase_update_schema_data.model_dump(),
         id=random_phrase_id,
+        is_movie_active=True,
         created_at=datetime.datetime.now(tz=datetime.timezone.utc),
         updated_at=datetime.datetime.now(tz=datetime.timezone.utc),
     )
@@ -452,6 +533,8 @@ def paginated_phrases_by_search_text_schema_data(
         page=1,
         size=settings.phrases_page_size,
         pages=1,
+        has_more=False,
+        is_total_exact=True,
     )
 
 
@@ -636,8 +719,14 @@ async def _setup_bucket(s3_session: aioboto3.Session, bucket_test_name: str, aws
 
 
 @pytest_asyncio.fixture()
-async def s3_service(s3_session: aioboto3.Session, _setup_bucket: None) -> S3Service:
-    return S3Service(s3_session=s3_session)
+async def s3_client(s3_session: aioboto3.Session, _setup_bucket: None) -> AsyncIterator[S3Client]:
+    async with s3_session.client("s3", endpoint_url=settings.s3_endpoint_url) as s3_client:
+        yield s3_client
+
+
+@pytest_asyncio.fixture()
+async def s3_service(s3_client: S3Client) -> S3Service:
+    return S3Service(s3_client=s3_client)
 
 
 @pytest.fixture()
@@ -645,6 +734,11 @@ def mock_s3_service() -> mock.AsyncMock:
     return mock.AsyncMock()
 
 
+@pytest.fixture()
+def mock_s3_client() -> mock.AsyncMock:
+    return mock.AsyncMock()
+
+
 @pytest.fixture()
 def movie_in_s3_prefix(
     random_movie_id: uuid.UUID,
@@ -752,6 +846,7 @@ def subtitle_item() -> SubtitleItem:
         end_time=datetime.timedelta(seconds=40),
         text="fruits: apples, bananas and oranges",
         normalized_text=" fruits apples bananas and oranges ",
+        normalized_offsets=[0, 6, 8, 14, 16, 23, 24, 27, 28, 35],
     )
 
 
@@ -0,0 +1,24 @@
+import pytest
+
+from app.s3.client import S3ClientManager
+
+
+@pytest.mark.asyncio()
+class TestS3ClientManager:
+    async def test_open_and_close(self):
+        s3_client_manager = S3ClientManager()
+
+        await s3_client_manager.open()
+        s3_client = s3_client_manager.client
+
+        assert s3_client_manager.client is s3_client
+        assert s3_client.meta.config.max_pool_connections > 0
+
+        await s3_client_manager.close()
+
+        with pytest.raises(Exception, match="not initialized"):
+            s3_client_manager.client  # noqa: B018
+
+    async def test_close_not_initialized(self):
+        with pytest.raises(Exception, match="not initialized"):
+            await S3ClientManager().close()
@@ -1,81 +1,93 @@
 from unittest import mock
 
+import pydantic
 import pytest
 
-from app.api.phrases.models import PhraseModel
+from app.core.cache import LocalCache
+from app.core.config import Settings, settings
 from app.s3.presigned_url_service import PresignedURLService
 
 
+@pytest.fixture()
+def mock_redis_pipeline() -> mock.MagicMock:
+    pipeline = mock.MagicMock()
+    pipeline.execute = mock.AsyncMock(return_value=[])
+
+    return pipeline
+
+
+@pytest.fixture()
+def cached_presigned_url_service(
+    mock_s3_service: mock.AsyncMock,
+    mock_redis_pipeline: mock.MagicMock,
+) -> PresignedURLService:
+    cache_backend = mock.MagicMock()
+    cache_backend.redis.pipeline.return_value.__aenter__.return_value = mock_redis_pipeline
+    cache_backend.redis.set = mock.AsyncMock()
+
+    return PresignedURLService(
+        mock_s3_service,
+        cache_backend=cache_backend,
+        local_cache=LocalCache(max_size=10, ttl=settings.s3_presigned_url_reuse_time),
+    )
+
+
 @pytest.mark.asyncio()
 class TestPresignedURLService:
-    async def test_update_s3_urls_for_models_key_exists(
+    async def test_get_presigned_url(
         self,
         presigned_url_service: PresignedURLService,
         mock_s3_service: mock.AsyncMock,
         mock_presigned_url_value: str,
-        phrase_model_data: PhraseModel,
         scene_s3_key: str,
     ):
         mock_s3_service.get_presigned_url.return_value = mock_presigned_url_value
 
-        result = await presigned_url_service.update_s3_urls_for_models(
-            [phrase_model_data],
-            "scene_s3_key",
-        )
+        result = await presigned_url_service.get_presigned_url(scene_s3_key)
 
-        assert result == [phrase_model_data]
+        assert result == mock_presigned_url_value
         mock_s3_service.get_presigned_url.assert_awaited_once_with(scene_s3_key)
 
-    async def test_update_s3_urls_for_models_key_is_empty(
+    async def test_get_presigned_url_cached(
         self,
-        presigned_url_service: PresignedURLService,
+        cached_presigned_url_service: PresignedURLService,
         mock_s3_service: mock.AsyncMock,
-        mock_presigned_url_value: str,
-        phrase_model_data: PhraseModel,
+        mock_redis_pipeline: mock.MagicMock,
     ):
-        mock_s3_service.get_presigned_url.return_value = mock_presigned_url_value
-        phrase_model_data.scene_s3_key = None
+        mock_s3_service.get_presigned_url.side_effect = lambda s3_key: f"https://s3/{s3_key}?signature"
+        mock_redis_pipeline.execute.side_effect = [[None, -2], [b"https://s3/cached?signature", 60]]
 
-        result = await presigned_url_service.update_s3_urls_for_models(
-            [phrase_model_data],
-            "scene_s3_key",
-        )
+        result = [await cached_presigned_url_service.get_presigned_url(s3_key) for s3_key in ["key", "cached"]]
+        cached_result = [await cached_presigned_url_service.get_presigned_url(s3_key) for s3_key in ["key", "cached"]]
 
-        assert result == [phrase_model_data]
-        mock_s3_service.get_presigned_url.assert_not_awaited()
+        assert result == cached_result == ["https://s3/key?signature", "https://s3/cached?signature"]
+        # The URLs are taken from the local cache the second time
+        mock_s3_service.get_presigned_url.assert_awaited_once_with("key")
+        assert mock_redis_pipeline.execute.await_count == 2
+        cached_presigned_url_service.cache_backend.redis.set.assert_awaited_once_with(  # type: ignore[union-attr]
+            "fastapi-cache-test:presigned-url:key",
+            "https://s3/key?signature",
+            ex=settings.s3_presigned_url_reuse_time,
+        )
 
-    async def test_update_s3_url_for_model_key_exists(
+    async def test_get_presigned_url_redis_error(
         self,
-        presigned_url_service: PresignedURLService,
+        cached_presigned_url_service: PresignedURLService,
         mock_s3_service: mock.AsyncMock,
+        mock_redis_pipeline: mock.MagicMock,
         mock_presigned_url_value: str,
-        phrase_model_data: PhraseModel,
-        scene_s3_key: str,
     ):
         mock_s3_service.get_presigned_url.return_value = mock_presigned_url_value
+        mock_redis_pipeline.execute.side_effect = ConnectionError
+        cached_presigned_url_service.cache_backend.redis.set.side_effect = ConnectionError  # type: ignore[union-attr]
 
-        result = await presigned_url_service.update_s3_url_for_model(
-            phrase_model_data,
-            "scene_s3_key",
-        )
+        result = await cached_presigned_url_service.get_presigned_url("key")
 
-        assert result == phrase_model_data
-        mock_s3_service.get_presigned_url.assert_awaited_once_with(scene_s3_key)
+        assert result == mock_presigned_url_value
 
-    async def test_update_s3_url_for_model_key_is_empty(
-        self,
-        presigned_url_service: PresignedURLService,
-        mock_s3_service: mock.AsyncMock,
-        mock_presigned_url_value: str,
-        phrase_model_data: PhraseModel,
-    ):
-        mock_s3_service.get_presigned_url.return_value = mock_presigned_url_value
-        phrase_model_data.scene_s3_key = None
 
-        result = await presigned_url_service.update_s3_url_for_model(
-            phrase_model_data,
-            "scene_s3_key",
-        )
+def test_presigned_url_expiration_is_longer_than_redirect_cache_ttl():
+    settings_data = settings.model_dump() | {"s3_presigned_url_expiration": settings.s3_presigned_url_min_remaining}
 
-        assert result == phrase_model_data
-        mock_s3_service.get_presigned_url.assert_not_awaited()
+    with pytest.raises(pydantic.ValidationError):
+        Settings.model_validate(settings_data)
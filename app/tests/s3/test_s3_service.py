@@ -1,9 +1,12 @@
-import io
+from pathlib import Path
 
 import aioboto3
 import pytest
+import pytest_mock
+from types_aiobotocore_s3 import S3Client
 
-from app.s3.s3_service import S3Service
+from app.core.config import settings
+from app.s3.s3_service import S3Service, get_transfer_config
 
 
 @pytest.mark.asyncio()
@@ -85,17 +88,43 @@ class TestS3Service:
         objects = await s3_service.get_all_objects_in_folder(movie_in_s3_prefix)
         assert len(objects) == 0
 
-    async def test_upload_fileobj(
+    async def test_upload_file_multipart(
+        self,
+        s3_client: S3Client,
+        bucket_test_name: str,
+        file_in_s3_key: str,
+        mocker: pytest_mock.MockerFixture,
+        tmp_path: Path,
+    ):
+        # 5 MB is the minimum size of the part in S3
+        mocker.patch.object(settings, "s3_multipart_threshold", 5 * 1024**2)
+        mocker.patch.object(settings, "s3_multipart_chunksize", 5 * 1024**2)
+        data = bytes(range(256)) * (11 * 1024**2 // 256)
+        path = tmp_path / "movie.mp4"
+        path.write_bytes(data)
+
+        await S3Service(s3_client).upload_file(path, file_in_s3_key)
+
+        s3_object = await s3_client.get_object(Bucket=bucket_test_name, Key=file_in_s3_key)
+        assert await s3_object["Body"].read() == data
+        # The ETag of the multipart upload ends with the number of parts
+        assert s3_object["ETag"].strip('"').endswith("-3")
+
+    async def test_upload_file(
         self,
         s3_service: S3Service,
+        s3_client: S3Client,
+        bucket_test_name: str,
         file_in_s3_key: str,
-        movie_in_s3_prefix: str,
+        tmp_path: Path,
     ):
-        fileobj = io.BytesIO(b"test")
-        await s3_service.upload_fileobj(fileobj, file_in_s3_key)
+        path = tmp_path / "scene.mp4"
+        path.write_bytes(b"test")
 
-        objects = await s3_service.get_all_objects_in_folder(movie_in_s3_prefix)
-        assert len(objects) == 1
+        await s3_service.upload_file(path, file_in_s3_key)
+
+        s3_object = await s3_client.get_object(Bucket=bucket_test_name, Key=file_in_s3_key)
+        assert await s3_object["Body"].read() == b"test"
 
     async def test_delete_folder_is_empty(
         self,
@@ -126,3 +155,12 @@ class TestS3Service:
 
         assert "http://motoserver:5000" in url
         assert file_in_s3_key in url
+
+
+def test_get_transfer_config():
+    transfer_config = get_transfer_config()
+
+    assert transfer_config.multipart_chunksize == settings.s3_multipart_chunksize
+    assert transfer_config.max_request_concurrency == settings.s3_multipart_concurrency
+    # The queue of the read parts doesn't grow past the parts being uploaded
+    assert transfer_config.max_io_queue_size == settings.s3_multipart_concurrency